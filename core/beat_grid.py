@@ -0,0 +1,86 @@
+"""Beat grid on the lesson timeline, for the synchronised metronome.
+
+A lesson's beats sit at ``offset_ms + k * 60000 / tempo`` on the media
+timeline. ``LessonSync`` turns reported playback positions into the
+monotonic time of the next beat, taking the playback speed into account,
+and only asks for a re-alignment when the position jumps (seek, A–B
+loop-back), the speed changes or the estimate drifts past a tolerance.
+Between those events the metronome free-runs on its own absolute-deadline
+scheduler, which is steadier than chasing every position report.
+"""
+import math
+from collections import namedtuple
+from typing import Optional, Tuple
+
+# Position reports further than this from the extrapolated position are
+# treated as a jump. QMediaPlayer positions jitter by a few ms.
+DRIFT_TOLERANCE_MS = 30.0
+
+Alignment = namedtuple("Alignment", ["beat", "deadline_ns", "bpm"])
+
+
+class BeatGrid:
+    """Constant-tempo beat positions of a lesson recording."""
+
+    def __init__(self, tempo_bpm: float, offset_ms: float = 0.0):
+        if not tempo_bpm or tempo_bpm <= 0:
+            raise ValueError("tempo must be positive")
+        self.tempo_bpm = float(tempo_bpm)
+        self.offset_ms = float(offset_ms or 0.0)
+
+    @property
+    def beat_ms(self) -> float:
+        return 60000.0 / self.tempo_bpm
+
+    def beat_at(self, position_ms: float) -> float:
+        """Fractional beat index at a timeline position (negative before the offset)."""
+        return (position_ms - self.offset_ms) / self.beat_ms
+
+    def beat_time(self, index: int) -> float:
+        return self.offset_ms + index * self.beat_ms
+
+    def next_beat(self, position_ms: float) -> Tuple[int, float]:
+        """Index and timeline position of the first beat at or after ``position_ms``."""
+        index = math.ceil(self.beat_at(position_ms) - 1e-9)
+        return index, self.beat_time(index)
+
+
+class LessonSync:
+    """Map playback position reports onto the monotonic clock."""
+
+    def __init__(self, grid: BeatGrid, tolerance_ms: float = DRIFT_TOLERANCE_MS):
+        self.grid = grid
+        self.tolerance_ms = tolerance_ms
+        self._anchor: Optional[Tuple[float, int, float]] = None
+        self.realignments = 0
+
+    def reset(self) -> None:
+        """Forget the anchor, e.g. when playback pauses."""
+        self._anchor = None
+
+    def expected_position(self, now_ns: int) -> Optional[float]:
+        if self._anchor is None:
+            return None
+        position_ms, anchor_ns, speed = self._anchor
+        return position_ms + (now_ns - anchor_ns) / 1e6 * speed
+
+    def update(self, position_ms: float, speed: float, now_ns: int) -> Optional[Alignment]:
+        """Feed one position report.
+
+        Returns an ``Alignment`` (next beat index, its monotonic deadline
+        and the audible BPM) when the metronome must be re-aligned, or
+        ``None`` when it is still on the recording's beat.
+        """
+        speed = float(speed) if speed and speed > 0 else 1.0
+        expected = self.expected_position(now_ns)
+        if (
+            expected is not None
+            and self._anchor[2] == speed
+            and abs(position_ms - expected) <= self.tolerance_ms
+        ):
+            return None
+        self._anchor = (float(position_ms), int(now_ns), speed)
+        self.realignments += 1
+        index, beat_ms = self.grid.next_beat(position_ms)
+        deadline_ns = int(now_ns + (beat_ms - position_ms) / speed * 1e6)
+        return Alignment(index, deadline_ns, self.grid.tempo_bpm * speed)
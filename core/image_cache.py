@@ -0,0 +1,117 @@
+"""Decoded and scaled images from ``resources/``.
+
+Resource images are decoded once per process. Scaled copies are kept in
+a small LRU keyed by name and target size; callers that scale to a
+continuously changing size (the placeholder logo follows the video area
+while a splitter is dragged) pass a ``bucket`` so nearby sizes share one
+scaled copy instead of each triggering a smooth rescale.
+
+Paths are resolved against the package's ``resources`` directory, not
+the working directory, so the app can be started from anywhere.
+"""
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QIcon, QPixmap
+
+logger = logging.getLogger(__name__)
+
+RESOURCES_DIR = Path(__file__).resolve().parents[1] / "resources"
+DEFAULT_MAX_SCALED = 32
+
+
+def resource_path(name: str) -> str:
+    """Absolute path of ``resources/<name>``."""
+    return str(RESOURCES_DIR / name)
+
+
+def bucket_size(value: int, bucket: int) -> int:
+    """Round ``value`` down to a multiple of ``bucket`` (at least ``bucket``)."""
+    value = max(1, int(value))
+    if bucket <= 1:
+        return value
+    return max(bucket, value - value % bucket)
+
+
+class ImageCache:
+    """Decode-once cache of resource pixmaps and icons with a scaled LRU."""
+
+    def __init__(self, resource_dir=RESOURCES_DIR, maxsize: int = DEFAULT_MAX_SCALED):
+        self.resource_dir = Path(resource_dir)
+        self.maxsize = maxsize
+        self._originals: Dict[str, QPixmap] = {}
+        self._icons: Dict[str, QIcon] = {}
+        self._scaled: "OrderedDict[Tuple[str, int, int], QPixmap]" = OrderedDict()
+        self.decodes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, name: str) -> str:
+        return str(self.resource_dir / name)
+
+    def original(self, name: str) -> QPixmap:
+        pixmap = self._originals.get(name)
+        if pixmap is None:
+            pixmap = QPixmap(self.path(name))
+            self.decodes += 1
+            if pixmap.isNull():
+                logger.warning("Could not load image resource %s", self.path(name))
+            self._originals[name] = pixmap
+        return pixmap
+
+    def pixmap(self, name: str, width: int = 0, height: int = 0, bucket: int = 1) -> QPixmap:
+        """``name`` scaled to fit ``width`` x ``height``, keeping its aspect ratio.
+
+        A zero dimension is unconstrained; with both zero the decoded
+        original is returned. Sizes are rounded down to ``bucket``.
+        """
+        if not width and not height:
+            return self.original(name)
+        key = (
+            name,
+            bucket_size(width, bucket) if width else 0,
+            bucket_size(height, bucket) if height else 0,
+        )
+        pixmap = self._lookup(key)
+        if pixmap is not None:
+            return pixmap
+        self.misses += 1
+        source = self.original(name)
+        _, w, h = key
+        if source.isNull():
+            pixmap = source
+        elif not w:
+            pixmap = source.scaledToHeight(h, Qt.SmoothTransformation)
+        elif not h:
+            pixmap = source.scaledToWidth(w, Qt.SmoothTransformation)
+        else:
+            pixmap = source.scaled(w, h, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self._scaled[key] = pixmap
+        while len(self._scaled) > self.maxsize:
+            self._scaled.popitem(last=False)
+        return pixmap
+
+    def _lookup(self, key: Tuple[str, int, int]) -> Optional[QPixmap]:
+        pixmap = self._scaled.get(key)
+        if pixmap is not None:
+            self._scaled.move_to_end(key)
+            self.hits += 1
+        return pixmap
+
+    def icon(self, name: str) -> QIcon:
+        icon = self._icons.get(name)
+        if icon is None:
+            icon = QIcon(self.original(name))
+            self._icons[name] = icon
+        return icon
+
+    def clear(self) -> None:
+        self._originals.clear()
+        self._icons.clear()
+        self._scaled.clear()
+
+
+IMAGE_CACHE = ImageCache()
@@ -0,0 +1,203 @@
+"""Asynchronous, structured application logging.
+
+``start_logging`` puts a ``QueueHandler`` on the root logger; a
+``QueueListener`` thread formats records as JSON lines and writes them
+to a rotating file. A log call from the scanner thread, a metronome
+thread or a VLC callback therefore only enqueues the record.
+
+Correlation IDs are kept in a ``contextvars`` context and copied into
+each record on the calling thread::
+
+    with log_context(scan_id=new_correlation_id()):
+        ...  # every record logged here carries "scan_id"
+
+    bind_log_context(playback_id=new_correlation_id())  # until rebound
+
+Context variables are per thread: a worker thread starts with an empty
+context and binds its own IDs. Callbacks that libvlc runs on its own
+threads never see the GUI thread's ``playback_id``; the id is kept on the
+player (``player.playback_id``) and dispatch is wrapped with
+``player_callback(player, func)``, which logs under the id current when
+the callback runs.
+
+Log levels can be set per logger with a spec such as
+``"WARNING,ui=DEBUG,metronome.engine=INFO"`` (a bare level is the root
+level), from the ``log_levels`` setting or ``--log-level=SPEC``.
+"""
+import atexit
+import contextvars
+import copy
+import datetime
+import functools
+import json
+import logging
+import queue
+import uuid
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Callable, Dict, Optional, Sequence
+
+LOG_LEVEL_FLAG = "--log-level"
+SETTINGS_KEY = "log_levels"
+DEFAULT_ROOT_LEVEL = "ERROR"
+
+_context: contextvars.ContextVar = contextvars.ContextVar("log_context", default={})
+_listener: Optional[QueueListener] = None
+_queue: Optional[queue.Queue] = None
+
+
+def new_correlation_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+@contextmanager
+def log_context(**ids):
+    """Add ``ids`` to records logged inside the ``with`` block."""
+    token = _context.set({**_context.get(), **ids})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def bind_log_context(**ids) -> None:
+    """Add ``ids`` to records logged from now on in this context."""
+    _context.set({**_context.get(), **ids})
+
+
+def current_log_context() -> dict:
+    return dict(_context.get())
+
+
+def player_callback(player, func: Callable) -> Callable:
+    """Wrap ``func`` to log under ``player.playback_id`` as of each call."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        playback_id = getattr(player, "playback_id", None)
+        if playback_id is None:
+            return func(*args, **kwargs)
+        with log_context(playback_id=playback_id):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+class ContextFilter(logging.Filter):
+    """Copy the correlation IDs of the calling context onto the record."""
+
+    def filter(self, record):
+        record.context = _context.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc)
+            .isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "thread": record.threadName,
+        }
+        entry.update(getattr(record, "context", None) or {})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _ContextQueueHandler(QueueHandler):
+    def prepare(self, record):
+        # Like QueueHandler.prepare, but keep the traceback out of the
+        # message so the JSON formatter can store it as "exc".
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """``"WARNING,ui=DEBUG"`` -> ``{"": WARNING, "ui": DEBUG}``; bad entries are skipped."""
+    levels = {}
+    for part in (spec or "").split(","):
+        name, sep, level = part.strip().rpartition("=")
+        if not level:
+            continue
+        value = logging.getLevelName(level.strip().upper())
+        if isinstance(value, int):
+            levels[name.strip() if sep else ""] = value
+    return levels
+
+
+def levels_from(settings=None, argv: Sequence[str] = ()) -> Dict[str, int]:
+    """Levels from the ``log_levels`` setting, overridden by ``--log-level``."""
+    levels = {}
+    if settings is not None:
+        levels.update(parse_levels(str(settings.value(SETTINGS_KEY, "") or "")))
+    for arg in argv:
+        if arg.startswith(LOG_LEVEL_FLAG + "="):
+            levels.update(parse_levels(arg.partition("=")[2]))
+    return levels
+
+
+def apply_levels(levels: Dict[str, int]) -> None:
+    logging.getLogger().setLevel(levels.get("", logging.getLevelName(DEFAULT_ROOT_LEVEL)))
+    for name, level in levels.items():
+        if name:
+            logging.getLogger(name).setLevel(level)
+
+
+def start_logging(
+    log_file: str,
+    max_bytes: int,
+    backup_count: int,
+    levels: Optional[Dict[str, int]] = None,
+) -> QueueListener:
+    """Route the root logger through a queue to a rotating JSON-lines file."""
+    global _listener, _queue
+    stop_logging()
+
+    file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    file_handler.setFormatter(JsonFormatter())
+
+    _queue = queue.Queue(-1)
+    queue_handler = _ContextQueueHandler(_queue)
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    # Replace any existing handlers to avoid duplicate logging
+    root.handlers = [queue_handler]
+    apply_levels(levels or {})
+
+    _listener = QueueListener(_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def flush_logging() -> None:
+    """Block until every record logged so far has been written."""
+    if _listener is None or _queue is None:
+        return
+    _queue.join()
+    for handler in _listener.handlers:
+        handler.flush()
+
+
+def stop_logging() -> None:
+    """Write pending records and stop the listener thread."""
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+atexit.register(stop_logging)
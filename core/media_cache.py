@@ -0,0 +1,51 @@
+"""On-disk cache locations and media file fingerprints.
+
+Derived data (thumbnail sprite sheets, waveform peaks, ...) is stored
+under a per-user cache directory and keyed by a fingerprint of the media
+file contents rather than its path, so renamed or re-linked lessons keep
+their cached data.
+"""
+import hashlib
+import os
+import sys
+from pathlib import Path
+
+APP_CACHE_NAME = "bouzouki-lesson-player"
+_FINGERPRINT_BLOCK = 64 * 1024
+
+
+def cache_root() -> Path:
+    """Return the root cache directory, honouring ``BOUZOUKI_CACHE_DIR``."""
+    override = os.environ.get("BOUZOUKI_CACHE_DIR")
+    if override:
+        return Path(override)
+    if sys.platform.startswith("win"):
+        base = os.environ.get("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+    elif sys.platform == "darwin":
+        base = str(Path.home() / "Library" / "Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / APP_CACHE_NAME
+
+
+def cache_dir(kind: str) -> Path:
+    """Return (and create) the cache sub-directory for ``kind``."""
+    path = cache_root() / kind
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def file_fingerprint(file_path: str) -> str:
+    """Cheap content fingerprint: size plus the first and last 64 KiB.
+
+    Hashing whole lesson videos would take seconds; the head/tail blocks
+    together with the size are enough to tell media files apart.
+    """
+    size = os.path.getsize(file_path)
+    digest = hashlib.sha1(str(size).encode("ascii"))
+    with open(file_path, "rb") as f:
+        digest.update(f.read(_FINGERPRINT_BLOCK))
+        if size > 2 * _FINGERPRINT_BLOCK:
+            f.seek(-_FINGERPRINT_BLOCK, os.SEEK_END)
+            digest.update(f.read(_FINGERPRINT_BLOCK))
+    return digest.hexdigest()
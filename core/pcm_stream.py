@@ -0,0 +1,85 @@
+"""Stream decoded PCM audio from media files through ffmpeg.
+
+Audio analysis (waveform peaks, tempo detection) works on mono 16-bit
+PCM. ffmpeg decodes and resamples the lesson file and the samples are
+yielded in fixed-size NumPy chunks, so memory use does not grow with
+the length of the recording.
+"""
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Iterator, Optional
+
+import numpy as np
+
+DEFAULT_CHUNK_FRAMES = 1 << 16
+
+
+class PcmDecodeError(Exception):
+    """Raised when ffmpeg is missing or fails to decode a file."""
+
+
+def iter_pcm_chunks(
+    media_path: str,
+    sample_rate: int,
+    chunk_frames: int = DEFAULT_CHUNK_FRAMES,
+    ffmpeg: Optional[str] = None,
+    low_priority: bool = False,
+) -> Iterator[np.ndarray]:
+    """Yield mono ``int16`` chunks of ``media_path`` at ``sample_rate``.
+
+    With ``low_priority`` the ffmpeg process runs at a lower OS priority,
+    for batch jobs that must not compete with playback.
+    """
+    ffmpeg = ffmpeg or shutil.which("ffmpeg")
+    if not ffmpeg:
+        raise PcmDecodeError("ffmpeg not found in PATH")
+
+    cmd = [
+        ffmpeg, "-v", "error", "-nostdin",
+        "-i", media_path,
+        "-vn", "-ac", "1", "-ar", str(sample_rate),
+        "-f", "s16le", "-acodec", "pcm_s16le", "-",
+    ]
+    popen_kwargs = {}
+    if low_priority:
+        if sys.platform.startswith("win"):
+            popen_kwargs["creationflags"] = subprocess.BELOW_NORMAL_PRIORITY_CLASS
+        else:
+            # preexec_fn is unsafe with threads running (this is called
+            # from worker threads); lower the priority through nice(1).
+            nice = shutil.which("nice")
+            if nice:
+                cmd = [nice, "-n", "10"] + cmd
+    # stderr goes to a file: a full stderr pipe would block ffmpeg while
+    # stdout is still being read.
+    stderr_file = tempfile.TemporaryFile()
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, **popen_kwargs)
+    except BaseException:
+        stderr_file.close()
+        raise
+    chunk_bytes = chunk_frames * 2
+    pending = b""
+    try:
+        while True:
+            data = proc.stdout.read(chunk_bytes)
+            if not data:
+                break
+            data = pending + data
+            usable = len(data) - (len(data) % 2)
+            pending = data[usable:]
+            if usable:
+                yield np.frombuffer(data[:usable], dtype="<i2")
+        if proc.wait() != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode("utf-8", "replace")
+            raise PcmDecodeError(f"ffmpeg failed for {media_path}: {stderr.strip()}")
+    finally:
+        # Also reached when the consumer stops early: stop ffmpeg too.
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+        stderr_file.close()
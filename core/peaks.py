@@ -0,0 +1,261 @@
+"""Multi-resolution min/max peak pyramid for the waveform overview.
+
+Level 0 stores the min/max of every ``BASE_SAMPLES_PER_PEAK`` samples of
+the decoded mono signal; each further level halves the resolution. The
+pyramid is computed once per file in a background process and saved as
+a compact ``.peaks`` file in the media cache. Views read a single level
+through ``mmap``, so zooming into an A–B region never re-decodes audio.
+
+File layout: header (``_HEADER``), one ``_LEVEL`` entry per level
+(byte offset, peak count), then each level as ``int16`` ``(min, max)``
+pairs.
+"""
+import functools
+import logging
+import mmap
+import os
+import struct
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from core.media_cache import cache_dir, file_fingerprint
+from core.pcm_stream import iter_pcm_chunks
+
+logger = logging.getLogger(__name__)
+
+PEAK_SAMPLE_RATE = 8000
+BASE_SAMPLES_PER_PEAK = 64  # 8 ms per peak at 8 kHz
+MIN_LEVEL_PEAKS = 256
+
+_MAGIC = b"BZPK"
+_VERSION = 1
+# magic, version, sample rate, base samples per peak, level count
+_HEADER = struct.Struct("<4sHIIH")
+# byte offset, peak count
+_LEVEL = struct.Struct("<QI")
+
+
+class PeakFileError(Exception):
+    """Raised when a ``.peaks`` file is missing or malformed."""
+
+
+class PeakPyramidBuilder:
+    """Accumulate PCM chunks into level-0 peaks, then build the pyramid."""
+
+    def __init__(self, samples_per_peak: int = BASE_SAMPLES_PER_PEAK):
+        self.samples_per_peak = samples_per_peak
+        self._tail = np.empty(0, dtype=np.int16)
+        self._blocks: List[np.ndarray] = []
+
+    def feed(self, samples: np.ndarray) -> None:
+        data = np.concatenate((self._tail, samples.astype(np.int16, copy=False)))
+        usable = len(data) - (len(data) % self.samples_per_peak)
+        if usable:
+            frames = data[:usable].reshape(-1, self.samples_per_peak)
+            self._blocks.append(np.stack((frames.min(axis=1), frames.max(axis=1)), axis=1))
+        self._tail = data[usable:]
+
+    def finish(self) -> List[np.ndarray]:
+        """Return all levels, finest first, each of shape ``(n, 2)``."""
+        if len(self._tail):
+            self._blocks.append(np.array([[self._tail.min(), self._tail.max()]], dtype=np.int16))
+            self._tail = np.empty(0, dtype=np.int16)
+        base = np.concatenate(self._blocks) if self._blocks else np.zeros((0, 2), dtype=np.int16)
+        levels = [base.astype(np.int16)]
+        current = levels[0]
+        while len(current) > MIN_LEVEL_PEAKS:
+            if len(current) % 2:
+                current = np.concatenate((current, current[-1:]))
+            pairs = current.reshape(-1, 2, 2)
+            current = np.stack((pairs[:, :, 0].min(axis=1), pairs[:, :, 1].max(axis=1)), axis=1)
+            levels.append(current)
+        return levels
+
+
+def write_peaks(
+    path: str,
+    levels: Iterable[np.ndarray],
+    sample_rate: int = PEAK_SAMPLE_RATE,
+    samples_per_peak: int = BASE_SAMPLES_PER_PEAK,
+) -> None:
+    """Write a pyramid atomically (temp file + rename)."""
+    levels = [np.ascontiguousarray(level, dtype="<i2") for level in levels]
+    offset = _HEADER.size + _LEVEL.size * len(levels)
+    table = []
+    for level in levels:
+        table.append(_LEVEL.pack(offset, len(level)))
+        offset += level.nbytes
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, sample_rate, samples_per_peak, len(levels)))
+            f.write(b"".join(table))
+            for level in levels:
+                f.write(level.tobytes())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class PeakFile:
+    """Memory-mapped reader for ``.peaks`` files."""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, sample_rate, spp, n_levels = _HEADER.unpack_from(self._map, 0)
+        except (ValueError, struct.error) as exc:
+            self._file.close()
+            raise PeakFileError(f"Not a peaks file: {self.path}") from exc
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise PeakFileError(f"Not a peaks file: {self.path}")
+        self.sample_rate = sample_rate
+        self.base_samples_per_peak = spp
+        self._levels = [
+            _LEVEL.unpack_from(self._map, _HEADER.size + i * _LEVEL.size) for i in range(n_levels)
+        ]
+
+    @property
+    def level_count(self) -> int:
+        return len(self._levels)
+
+    def ms_per_peak(self, level: int) -> float:
+        return 1000.0 * self.base_samples_per_peak * (2 ** level) / self.sample_rate
+
+    def level(self, index: int) -> np.ndarray:
+        """Zero-copy ``(n, 2)`` view of one level."""
+        offset, count = self._levels[index]
+        return np.frombuffer(self._map, dtype="<i2", count=count * 2, offset=offset).reshape(count, 2)
+
+    def best_level(self, span_ms: float, columns: int) -> int:
+        """Coarsest level that still gives at least one peak per column."""
+        best = 0
+        for index in range(self.level_count):
+            if span_ms / self.ms_per_peak(index) >= columns:
+                best = index
+        return best
+
+    def columns(self, start_ms: float, end_ms: float, columns: int) -> np.ndarray:
+        """Min/max per pixel column for ``[start_ms, end_ms)``."""
+        columns = max(1, int(columns))
+        span = max(1.0, end_ms - start_ms)
+        index = self.best_level(span, columns)
+        level = self.level(index)
+        ms = self.ms_per_peak(index)
+        first = max(0, int(start_ms / ms))
+        last = min(len(level), int(np.ceil(end_ms / ms)))
+        if last <= first:
+            return np.zeros((0, 2), dtype=np.int16)
+        window = level[first:last]
+        if len(window) <= columns:
+            return np.array(window)
+        edges = np.linspace(0, len(window), columns, endpoint=False).astype(np.intp)
+        return np.stack(
+            (np.minimum.reduceat(window[:, 0], edges), np.maximum.reduceat(window[:, 1], edges)),
+            axis=1,
+        )
+
+    def close(self) -> None:
+        if getattr(self, "_map", None) is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # A caller still holds a level view; the map is released
+                # together with it.
+                pass
+            self._map = None
+        self._file.close()
+
+
+def peaks_path(media_path: str) -> Path:
+    return cache_dir("peaks") / f"{file_fingerprint(media_path)}.peaks"
+
+
+def compute_peaks_file(media_path: str, out_path: str) -> str:
+    """Decode ``media_path`` and write its pyramid (runs in a worker process)."""
+    builder = PeakPyramidBuilder()
+    for chunk in iter_pcm_chunks(media_path, PEAK_SAMPLE_RATE):
+        builder.feed(chunk)
+    write_peaks(out_path, builder.finish())
+    return out_path
+
+
+def build_peaks_file(media_path: str) -> str:
+    """Path of the cached pyramid of ``media_path``, computed if missing.
+
+    Runs in the worker process: fingerprinting reads the media file, so
+    it stays off the GUI thread too.
+    """
+    target = peaks_path(media_path)
+    if not target.exists():
+        compute_peaks_file(media_path, str(target))
+    return str(target)
+
+
+class PeakService(QObject):
+    """Compute peak files in a background process, one file at a time.
+
+    Only the latest lesson matters: a new request cancels queued jobs for
+    other files, and a file whose job is already queued or running is not
+    submitted again.
+    """
+
+    ready = pyqtSignal(str, str)
+
+    def __init__(self, parent: Optional[QObject] = None, executor_factory=None):
+        super().__init__(parent)
+        self._executor = None
+        self._executor_factory = executor_factory or functools.partial(ProcessPoolExecutor, max_workers=1)
+        # Cancelling a future runs its callback at once, on this thread.
+        self._lock = threading.RLock()
+        self._jobs: Dict[str, Future] = {}
+        # Resolved peak files by media path, so re-selecting a lesson
+        # needs no worker round trip.
+        self._known: Dict[str, str] = {}
+
+    def request(self, media_path: str) -> None:
+        known = self._known.get(media_path)
+        if known is not None and os.path.exists(known):
+            self.ready.emit(media_path, known)
+            return
+        with self._lock:
+            for other, job in list(self._jobs.items()):
+                if other != media_path and job.cancel():
+                    self._jobs.pop(other, None)
+            if media_path in self._jobs:
+                return
+            if self._executor is None:
+                self._executor = self._executor_factory()
+            future = self._executor.submit(build_peaks_file, media_path)
+            self._jobs[media_path] = future
+        future.add_done_callback(functools.partial(self._job_done, media_path))
+
+    def _job_done(self, media_path: str, future: Future) -> None:
+        with self._lock:
+            if self._jobs.get(media_path) is future:
+                del self._jobs[media_path]
+        if future.cancelled():
+            return
+        try:
+            path = future.result()
+        except Exception:
+            logger.exception("Waveform peaks failed for %s", media_path)
+            return
+        self._known[media_path] = path
+        self.ready.emit(media_path, path)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._jobs.clear()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
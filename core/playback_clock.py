@@ -0,0 +1,114 @@
+"""Playback position clock with adaptive update rates.
+
+``QMediaPlayer`` reports its position through ``positionChanged`` at a
+fixed ``notifyInterval``. The clock raises that rate while an A–B loop
+is active (so the loop end is caught promptly), lowers it while the main
+window is hidden or minimised, and coalesces progress slider/label
+updates so the GUI repaints at most once per display refresh.
+
+The normal and loop rates follow the ``position_update_interval_ms`` and
+``loop_position_update_interval_ms`` settings (``configure``).
+"""
+from typing import Optional
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+DEFAULT_INTERVAL_MS = 100
+LOOP_INTERVAL_MS = 20
+HIDDEN_INTERVAL_MS = 1000
+DEFAULT_REFRESH_HZ = 60.0
+INTERVAL_SETTINGS_KEY = "position_update_interval_ms"
+LOOP_INTERVAL_SETTINGS_KEY = "loop_position_update_interval_ms"
+
+
+def _int_setting(settings, key, default):
+    try:
+        return int(settings.value(key, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class PlaybackClock(QObject):
+    """Drive ``QMediaPlayer`` notify rate and throttle position display."""
+
+    # Emitted at most once per display frame with the latest position.
+    display_position = pyqtSignal(int)
+
+    def __init__(
+        self,
+        media_player,
+        parent: Optional[QObject] = None,
+        interval_ms: int = DEFAULT_INTERVAL_MS,
+        loop_interval_ms: int = LOOP_INTERVAL_MS,
+        hidden_interval_ms: int = HIDDEN_INTERVAL_MS,
+        refresh_hz: float = DEFAULT_REFRESH_HZ,
+    ):
+        super().__init__(parent)
+        self.media_player = media_player
+        self.interval_ms = max(1, int(interval_ms))
+        self.loop_interval_ms = max(1, int(loop_interval_ms))
+        self.hidden_interval_ms = max(1, int(hidden_interval_ms))
+        self._looping = False
+        self._visible = True
+        self._pending: Optional[int] = None
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self.flush)
+        self.set_refresh_rate(refresh_hz)
+        self._apply_interval()
+
+    def set_refresh_rate(self, refresh_hz: float) -> None:
+        """Coalesce display updates to the given screen refresh rate."""
+        if not refresh_hz or refresh_hz <= 0:
+            refresh_hz = DEFAULT_REFRESH_HZ
+        self._flush_timer.setInterval(max(1, int(round(1000.0 / refresh_hz))))
+
+    def configure(self, settings) -> None:
+        """Follow the position update interval settings."""
+        self.interval_ms = max(1, _int_setting(settings, INTERVAL_SETTINGS_KEY, DEFAULT_INTERVAL_MS))
+        self.loop_interval_ms = max(1, _int_setting(settings, LOOP_INTERVAL_SETTINGS_KEY, LOOP_INTERVAL_MS))
+        self._apply_interval()
+
+    def set_looping(self, looping: bool) -> None:
+        self._looping = bool(looping)
+        self._apply_interval()
+
+    def set_window_visible(self, visible: bool) -> None:
+        self._visible = bool(visible)
+        self._apply_interval()
+        if not self._visible:
+            # Nothing is shown, so drop any queued repaint.
+            self._flush_timer.stop()
+            self._pending = None
+
+    def current_interval(self) -> int:
+        """Return the notify interval for the current playback state."""
+        if self._looping:
+            # Loop boundaries must be checked promptly even when hidden,
+            # otherwise playback overruns B while the window is minimised.
+            return self.loop_interval_ms
+        if not self._visible:
+            return self.hidden_interval_ms
+        return self.interval_ms
+
+    def _apply_interval(self) -> None:
+        if hasattr(self.media_player, "setNotifyInterval"):
+            self.media_player.setNotifyInterval(self.current_interval())
+
+    def schedule_display(self, pos: int) -> None:
+        """Queue a position for display; only the latest one is painted."""
+        if not self._visible:
+            return
+        self._pending = int(pos)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self) -> None:
+        """Emit the pending position immediately, if any."""
+        self._flush_timer.stop()
+        if self._pending is None:
+            return
+        pos = self._pending
+        self._pending = None
+        self.display_position.emit(pos)
@@ -0,0 +1,71 @@
+"""Coalescing seek scheduler for the progress slider.
+
+Dragging the slider emits ``sliderMoved`` for every pixel. Forwarding
+each one to the decoders queues dozens of expensive seeks on long MKV
+lessons. The scheduler throttles drag seeks instead: the first request
+is sent straight away, later ones inside the cooldown window collapse
+into a single trailing seek to the latest position. A precise seek is
+issued once when the drag ends.
+
+Telemetry (``seek.dispatch.fast``/``seek.dispatch.precise``) times only
+the call into the player; the decoder finishes the seek asynchronously.
+"""
+from typing import Callable, Optional
+
+from PyQt5.QtCore import QObject, QTimer
+
+from core.telemetry import TELEMETRY
+
+DEFAULT_COOLDOWN_MS = 60
+
+
+class SeekScheduler(QObject):
+    """Throttle fast (drag) seeks and finish with one precise seek."""
+
+    def __init__(
+        self,
+        fast_seek: Callable[[int], None],
+        precise_seek: Callable[[int], None],
+        parent: Optional[QObject] = None,
+        cooldown_ms: int = DEFAULT_COOLDOWN_MS,
+    ):
+        super().__init__(parent)
+        self._fast_seek = fast_seek
+        self._precise_seek = precise_seek
+        self._pending: Optional[int] = None
+        self._last_sent: Optional[int] = None
+
+        self._cooldown = QTimer(self)
+        self._cooldown.setSingleShot(True)
+        self._cooldown.setInterval(max(0, int(cooldown_ms)))
+        self._cooldown.timeout.connect(self._on_cooldown_finished)
+
+    def request(self, pos: int) -> None:
+        """Ask for a fast seek; bursts are coalesced to the latest target."""
+        pos = int(pos)
+        if self._cooldown.isActive():
+            self._pending = pos
+            return
+        self._send_fast(pos)
+
+    def commit(self, pos: int) -> None:
+        """Drop any queued fast seek and seek precisely to ``pos``."""
+        self._cooldown.stop()
+        self._pending = None
+        self._last_sent = None
+        with TELEMETRY.timer("seek.dispatch.precise"):
+            self._precise_seek(int(pos))
+
+    def _send_fast(self, pos: int) -> None:
+        if pos != self._last_sent:
+            with TELEMETRY.timer("seek.dispatch.fast"):
+                self._fast_seek(pos)
+            self._last_sent = pos
+        self._cooldown.start()
+
+    def _on_cooldown_finished(self) -> None:
+        if self._pending is None:
+            return
+        pos = self._pending
+        self._pending = None
+        self._send_fast(pos)
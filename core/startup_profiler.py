@@ -0,0 +1,233 @@
+"""Startup profiling for ``main.py --profile-startup``.
+
+``StartupProfiler`` records two things until the main window first
+paints:
+
+- phases (``with profiler.phase("theme"):``), in the order they ran;
+- module imports, timed by a ``sys.meta_path`` finder that wraps each
+  loader's ``exec_module``. Like ``python -X importtime`` it reports the
+  cumulative time of each import and its self time (minus nested
+  imports).
+
+Code outside ``main.py`` reaches the active profiler through
+``get_profiler()``; when profiling is off that is a disabled profiler
+whose ``phase`` costs one attribute check. The report is printed and
+written as JSON (``DEFAULT_REPORT_PATH`` unless a path is given with
+``--profile-startup=PATH``).
+"""
+from __future__ import annotations
+
+import importlib.abc
+import json
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence
+
+from PyQt5.QtCore import QEvent, QObject, QTimer
+
+logger = logging.getLogger(__name__)
+
+PROFILE_FLAG = "--profile-startup"
+DEFAULT_REPORT_PATH = "startup_profile.json"
+REPORT_TOP_IMPORTS = 25
+
+
+class _TimedLoader(importlib.abc.Loader):
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler._begin_import(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._end_import(module.__name__)
+
+    def __getattr__(self, name):
+        # get_resource_reader, get_filename, ... of the wrapped loader.
+        return getattr(self._loader, name)
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self._profiler)
+                return spec
+        return None
+
+
+class StartupProfiler:
+    """Phase and import timings from process start to first paint."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        report_path: str = DEFAULT_REPORT_PATH,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self.enabled = enabled
+        self.report_path = report_path
+        self._clock = clock
+        self._start = clock()
+        self.phases: List[Dict[str, float]] = []
+        self.marks: Dict[str, float] = {}
+        self.imports: Dict[str, Dict[str, float]] = {}
+        self._import_stack: List[list] = []
+        self._finder: Optional[_ImportTimer] = None
+
+    @classmethod
+    def from_argv(cls, argv: Sequence[str]) -> "StartupProfiler":
+        """Enabled when ``argv`` contains ``--profile-startup[=PATH]``."""
+        profiler = cls(enabled=False)
+        for arg in argv:
+            if arg == PROFILE_FLAG or arg.startswith(PROFILE_FLAG + "="):
+                profiler.enabled = True
+                profiler.report_path = arg.partition("=")[2] or DEFAULT_REPORT_PATH
+        return profiler
+
+    def elapsed_ms(self) -> float:
+        return (self._clock() - self._start) * 1000.0
+
+    # --- imports -------------------------------------------------------
+
+    def install_import_hook(self) -> None:
+        if self.enabled and self._finder is None:
+            self._finder = _ImportTimer(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def remove_import_hook(self) -> None:
+        if self._finder is not None:
+            try:
+                sys.meta_path.remove(self._finder)
+            except ValueError:
+                pass
+            self._finder = None
+
+    def _begin_import(self, name: str) -> None:
+        # [name, start, time spent in nested imports]
+        self._import_stack.append([name, self._clock(), 0.0])
+
+    def _end_import(self, name: str) -> None:
+        _, start, nested = self._import_stack.pop()
+        total = self._clock() - start
+        if self._import_stack:
+            self._import_stack[-1][2] += total
+        self.imports[name] = {
+            "cumulative_ms": round(total * 1000.0, 3),
+            "self_ms": round((total - nested) * 1000.0, 3),
+        }
+
+    # --- phases --------------------------------------------------------
+
+    @contextmanager
+    def phase(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        start = self._clock()
+        try:
+            yield
+        finally:
+            end = self._clock()
+            self.phases.append({
+                "name": name,
+                "start_ms": round((start - self._start) * 1000.0, 3),
+                "duration_ms": round((end - start) * 1000.0, 3),
+            })
+
+    def mark(self, name: str) -> None:
+        """Record a point in time (e.g. ``first_paint``) since start."""
+        if self.enabled:
+            self.marks[name] = round(self.elapsed_ms(), 3)
+
+    # --- report --------------------------------------------------------
+
+    def report(self) -> dict:
+        slowest = sorted(self.imports.items(), key=lambda item: item[1]["self_ms"], reverse=True)
+        return {
+            "total_ms": round(self.elapsed_ms(), 3),
+            "marks": dict(self.marks),
+            "phases": list(self.phases),
+            "imports": {
+                "count": len(self.imports),
+                "total_self_ms": round(sum(v["self_ms"] for v in self.imports.values()), 3),
+                "slowest": [dict(module=name, **times) for name, times in slowest[:REPORT_TOP_IMPORTS]],
+            },
+            "modules": sorted(sys.modules),
+        }
+
+    def format_report(self, report: Optional[dict] = None) -> str:
+        report = report or self.report()
+        lines = ["Startup profile", "==============="]
+        for name, at in report["marks"].items():
+            lines.append(f"{name:<24} at {at:9.1f} ms")
+        lines.append("")
+        lines.append("Phases:")
+        for phase in report["phases"]:
+            lines.append(f"  {phase['name']:<22} {phase['duration_ms']:9.1f} ms (from {phase['start_ms']:.1f} ms)")
+        imports = report["imports"]
+        lines.append("")
+        lines.append(f"Imports: {imports['count']} modules, {imports['total_self_ms']:.1f} ms self time; slowest:")
+        for row in imports["slowest"]:
+            lines.append(f"  {row['module']:<40} self {row['self_ms']:8.1f} ms  cumulative {row['cumulative_ms']:8.1f} ms")
+        return "\n".join(lines)
+
+    def finish(self, path: Optional[str] = None) -> Optional[dict]:
+        """Stop timing imports, print the report and write it as JSON."""
+        if not self.enabled:
+            return None
+        self.remove_import_hook()
+        report = self.report()
+        print(self.format_report(report))
+        path = path or self.report_path
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        except OSError as e:
+            logger.warning("Could not write startup profile to %s: %s", path, e)
+        return report
+
+
+_active = StartupProfiler(enabled=False)
+
+
+def get_profiler() -> StartupProfiler:
+    return _active
+
+
+def set_profiler(profiler: StartupProfiler) -> StartupProfiler:
+    global _active
+    _active = profiler
+    return profiler
+
+
+class _FirstPaintFilter(QObject):
+    def __init__(self, widget, callback: Callable[[], None]):
+        super().__init__(widget)
+        self._callback = callback
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            # Report once the paint has been delivered.
+            QTimer.singleShot(0, self._callback)
+        return False
+
+
+def watch_first_paint(widget, callback: Callable[[], None]) -> None:
+    """Call ``callback`` once, after ``widget`` first receives a paint event."""
+    widget.installEventFilter(_FirstPaintFilter(widget, callback))
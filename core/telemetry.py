@@ -0,0 +1,197 @@
+"""Local performance telemetry.
+
+Timings from hot paths (scan stages, database queries, lesson list
+refreshes, media opens, seek dispatch, metronome jitter) are recorded as
+``Sample(time, name, ms)`` into a fixed-size in-memory ring buffer, and
+appended periodically to an NDJSON file in the user cache directory
+(``cache_dir("telemetry")``). Nothing leaves the machine.
+
+Recording is off unless ``telemetry_enabled`` is set in the settings
+dialog; while off, ``timer``, ``timed`` and ``record`` cost one attribute
+check. Usage::
+
+    from core.telemetry import TELEMETRY
+
+    with TELEMETRY.timer("db.fetch_lessons"):
+        rows = db.fetch_lessons(query)
+
+    @TELEMETRY.timed("scan.folder")
+    def run(self): ...
+
+    TELEMETRY.record("metronome.jitter", late_ns / 1e6)
+
+``summary()`` gives per-name percentiles of the buffered samples; the
+viewer is ``ui.telemetry_dialog.TelemetryDialog``.
+"""
+import functools
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque, namedtuple
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from PyQt5.QtCore import QTimer
+
+from core.media_cache import cache_dir
+
+logger = logging.getLogger(__name__)
+
+Sample = namedtuple("Sample", ["time", "name", "ms"])
+
+SETTINGS_KEY = "telemetry_enabled"
+DEFAULT_CAPACITY = 8192
+FLUSH_INTERVAL_MS = 30_000
+LOG_FILE_NAME = "telemetry.ndjson"
+# The log is rotated to ``.1`` once it grows past this size.
+MAX_LOG_BYTES = 5_000_000
+PERCENTILES = (50, 90, 99)
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    index = min(len(ordered) - 1, int(math.ceil(pct / 100.0 * len(ordered))) - 1)
+    return ordered[max(0, index)]
+
+
+def telemetry_enabled(settings) -> bool:
+    value = settings.value(SETTINGS_KEY, False)
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ("true", "1", "yes")
+
+
+class Telemetry:
+    """Ring buffer of timing samples with an append-only NDJSON log."""
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        path: Optional[str] = None,
+        enabled: bool = False,
+        clock: Callable[[], int] = time.perf_counter_ns,
+    ):
+        self.enabled = enabled
+        self.path = path
+        self._clock = clock
+        self._samples: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._recorded = 0
+        self._flushed = 0
+
+    # --- recording -----------------------------------------------------
+
+    def record(self, name: str, ms: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._samples.append(Sample(time.time(), name, float(ms)))
+            self._recorded += 1
+
+    @contextmanager
+    def timer(self, name: str):
+        """Record the time spent in the ``with`` block as ``name``."""
+        if not self.enabled:
+            yield
+            return
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.record(name, (self._clock() - start) / 1e6)
+
+    def timed(self, name: str):
+        """Decorator form of ``timer``."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.timer(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    # --- reading -------------------------------------------------------
+
+    def samples(self, name: Optional[str] = None) -> List[Sample]:
+        with self._lock:
+            samples = list(self._samples)
+        if name is not None:
+            samples = [s for s in samples if s.name == name]
+        return samples
+
+    def summary(self) -> Dict[str, dict]:
+        """Count, percentiles and max (ms) per sample name, from the buffer."""
+        by_name: Dict[str, List[float]] = {}
+        for sample in self.samples():
+            by_name.setdefault(sample.name, []).append(sample.ms)
+        summary = {}
+        for name, values in sorted(by_name.items()):
+            values.sort()
+            row = {"count": len(values)}
+            for pct in PERCENTILES:
+                row[f"p{pct}"] = round(_percentile(values, pct), 3)
+            row["max"] = round(values[-1], 3)
+            summary[name] = row
+        return summary
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._flushed = self._recorded
+
+    # --- persistence ---------------------------------------------------
+
+    def log_path(self) -> str:
+        if self.path is None:
+            self.path = str(cache_dir("telemetry") / LOG_FILE_NAME)
+        return self.path
+
+    def flush(self) -> int:
+        """Append samples recorded since the last flush; returns how many.
+
+        Samples that were overwritten in the ring buffer before a flush
+        are lost; the buffer is sized so that does not happen between
+        periodic flushes.
+        """
+        with self._lock:
+            pending = min(self._recorded - self._flushed, len(self._samples))
+            batch = list(self._samples)[len(self._samples) - pending:] if pending else []
+            self._flushed = self._recorded
+        if not batch:
+            return 0
+        path = self.log_path()
+        try:
+            if os.path.exists(path) and os.path.getsize(path) > MAX_LOG_BYTES:
+                os.replace(path, path + ".1")
+            with open(path, "a", encoding="utf-8") as f:
+                for sample in batch:
+                    f.write(json.dumps(
+                        {"t": round(sample.time, 3), "name": sample.name, "ms": round(sample.ms, 3)},
+                        separators=(",", ":"),
+                    ) + "\n")
+        except OSError as e:
+            logger.warning("Could not write telemetry to %s: %s", path, e)
+            return 0
+        return len(batch)
+
+    def start_flush_timer(self, parent, interval_ms: int = FLUSH_INTERVAL_MS):
+        """Flush every ``interval_ms`` from the Qt event loop; returns the timer."""
+        timer = QTimer(parent)
+        timer.setInterval(interval_ms)
+        timer.timeout.connect(self.flush)
+        timer.start()
+        return timer
+
+    def configure(self, settings) -> None:
+        """Follow the ``telemetry_enabled`` setting."""
+        enabled = telemetry_enabled(settings)
+        if self.enabled and not enabled:
+            self.flush()
+        self.enabled = enabled
+
+
+TELEMETRY = Telemetry()
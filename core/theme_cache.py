@@ -0,0 +1,273 @@
+"""Compiled theme cache.
+
+``core.theme_manager.load_theme`` builds the application stylesheet from
+scratch: qt-material renders its templates and writes its icon set on
+every call. ``load_theme`` here wraps it. A theme is compiled once per
+(theme, DPI, density, sources) key; the resulting QSS and the icon files
+it refers to are stored under the media cache (``cache_dir("themes")``).
+Later start-ups and theme switches only read the QSS file and point the
+``icon:`` search path at the cached icons, without importing qt-material.
+
+Compiling also changes the application beyond its stylesheet: qt-material
+registers its fonts and may set the style, font and palette. Those side
+effects are recorded while compiling (fonts by watching
+``QFontDatabase.addApplicationFont``) and replayed from the entry, so a
+cached load leaves the application in the same state as a compile.
+
+Each entry has a ``manifest.json`` with the SHA-256 of its stylesheet; an
+entry whose stylesheet no longer matches is compiled again. The key
+includes the qt-material version and the size and mtime of
+``core/theme_manager.py`` and of a ``resources/<theme>.qss`` file, so
+upgrades and edits invalidate the cache.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+from collections import namedtuple
+from contextlib import contextmanager
+from importlib import metadata
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from PyQt5.QtCore import QDir, QSettings
+from PyQt5.QtGui import QColor, QFont, QFontDatabase, QPalette
+
+from core.media_cache import cache_dir
+from core.startup_profiler import get_profiler
+
+logger = logging.getLogger(__name__)
+
+CACHE_KIND = "themes"
+CACHE_FORMAT = 2
+DEFAULT_THEME = "dark_teal"
+ICON_PREFIX = "icon"
+_RESOURCES_DIR = Path(__file__).resolve().parents[1] / "resources"
+_PALETTE_GROUPS = (QPalette.Active, QPalette.Inactive, QPalette.Disabled)
+
+CachedTheme = namedtuple("CachedTheme", ["stylesheet", "icon_dir", "font_files", "app_state"])
+
+
+def _theme_name(theme: Optional[str]) -> str:
+    if not theme:
+        theme = QSettings("bouzouki", "lessonplayer").value("theme", DEFAULT_THEME)
+    theme = str(theme)
+    return theme[:-4] if theme.endswith(".xml") else theme
+
+
+def _screen_dpi(app) -> float:
+    screen = app.primaryScreen() if app is not None and hasattr(app, "primaryScreen") else None
+    return round(screen.logicalDotsPerInch(), 1) if screen is not None else 96.0
+
+
+def _density() -> int:
+    try:
+        return int(QSettings("bouzouki", "lessonplayer").value("theme_density", 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _source_stamp(path: Path) -> str:
+    try:
+        st = path.stat()
+    except OSError:
+        return "-"
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def _sources() -> dict:
+    try:
+        material = metadata.version("qt-material")
+    except metadata.PackageNotFoundError:
+        material = "-"
+    return {
+        "qt_material": material,
+        "theme_manager": _source_stamp(Path(__file__).with_name("theme_manager.py")),
+    }
+
+
+def theme_key(theme: str, dpi: float, density: int, sources: Optional[dict] = None) -> str:
+    """Hex key of one compiled theme."""
+    fields = {
+        "format": CACHE_FORMAT,
+        "theme": theme,
+        "dpi": dpi,
+        "density": density,
+        "qss": _source_stamp(_RESOURCES_DIR / f"{theme}.qss"),
+        "sources": sources if sources is not None else _sources(),
+    }
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def capture_app_state(app) -> dict:
+    """Style name, font and palette of ``app`` in a JSON-friendly form."""
+    palette = app.palette()
+    return {
+        "style": app.style().objectName(),
+        "font": app.font().toString(),
+        "palette": [
+            [palette.color(group, role).name(QColor.HexArgb) for role in range(QPalette.NColorRoles)]
+            for group in _PALETTE_GROUPS
+        ],
+    }
+
+
+def restore_app_state(app, state: dict) -> None:
+    if state.get("style") and app.style().objectName() != state["style"]:
+        app.setStyle(state["style"])
+    if state.get("font"):
+        font = QFont()
+        if font.fromString(state["font"]):
+            app.setFont(font)
+    if state.get("palette"):
+        palette = QPalette()
+        for group, colors in zip(_PALETTE_GROUPS, state["palette"]):
+            for role, name in enumerate(colors):
+                palette.setColor(group, role, QColor(name))
+        app.setPalette(palette)
+
+
+@contextmanager
+def _recording_fonts(paths: List[str]):
+    """Collect the files passed to ``QFontDatabase.addApplicationFont``."""
+    original = QFontDatabase.addApplicationFont
+
+    def add_application_font(path):
+        paths.append(str(path))
+        return original(path)
+
+    QFontDatabase.addApplicationFont = staticmethod(add_application_font)
+    try:
+        yield paths
+    finally:
+        QFontDatabase.addApplicationFont = original
+
+
+class ThemeCache:
+    """Compiled stylesheets and icon bundles, one directory per theme key."""
+
+    def __init__(self, root=None):
+        self.root = Path(root) if root is not None else None
+
+    def _root(self) -> Path:
+        if self.root is None:
+            self.root = cache_dir(CACHE_KIND)
+        return self.root
+
+    def entry_dir(self, theme: str, key: str) -> Path:
+        return self._root() / f"{theme}-{key[:16]}"
+
+    def load(self, theme: str, key: str) -> Optional[CachedTheme]:
+        """The entry for ``key`` if it is complete and unmodified, else ``None``."""
+        entry = self.entry_dir(theme, key)
+        try:
+            manifest = json.loads((entry / "manifest.json").read_text(encoding="utf-8"))
+            stylesheet = (entry / "theme.qss").read_text(encoding="utf-8")
+        except (OSError, ValueError):
+            return None
+        if manifest.get("key") != key or manifest.get("qss_sha256") != _sha256(stylesheet):
+            logger.info("Discarding stale theme cache %s", entry)
+            return None
+        fonts = [str(entry / "fonts" / name) for name in manifest.get("fonts", [])]
+        if not all(os.path.isfile(path) for path in fonts):
+            return None
+        icons = entry / "icons"
+        return CachedTheme(stylesheet, str(icons) if icons.is_dir() else None, fonts, manifest.get("app_state", {}))
+
+    def store(
+        self,
+        theme: str,
+        key: str,
+        stylesheet: str,
+        icon_dirs,
+        font_files=(),
+        app_state: Optional[dict] = None,
+    ) -> Optional[CachedTheme]:
+        """Write an entry and drop older entries of ``theme``."""
+        entry = self.entry_dir(theme, key)
+        try:
+            for old in self._root().glob(f"{theme}-*"):
+                if old != entry:
+                    shutil.rmtree(old, ignore_errors=True)
+            entry.mkdir(parents=True, exist_ok=True)
+            icons = entry / "icons"
+            shutil.rmtree(icons, ignore_errors=True)
+            for src in icon_dirs:
+                if os.path.isdir(src):
+                    shutil.copytree(src, icons, dirs_exist_ok=True)
+            fonts_dir = entry / "fonts"
+            shutil.rmtree(fonts_dir, ignore_errors=True)
+            font_names = []
+            for src in font_files:
+                if os.path.isfile(src):
+                    fonts_dir.mkdir(exist_ok=True)
+                    name = f"{len(font_names):02d}-{os.path.basename(src)}"
+                    shutil.copyfile(src, fonts_dir / name)
+                    font_names.append(name)
+            (entry / "theme.qss").write_text(stylesheet, encoding="utf-8")
+            manifest = {
+                "key": key,
+                "theme": theme,
+                "qss_sha256": _sha256(stylesheet),
+                "fonts": font_names,
+                "app_state": app_state or {},
+            }
+            (entry / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        except OSError as e:
+            logger.warning("Could not write theme cache %s: %s", entry, e)
+            return None
+        return CachedTheme(
+            stylesheet,
+            str(icons) if icons.is_dir() else None,
+            [str(fonts_dir / name) for name in font_names],
+            app_state or {},
+        )
+
+
+def _compile_with_theme_manager(app, theme: str) -> None:
+    from core.theme_manager import load_theme as compile_theme
+
+    compile_theme(app, theme=theme)
+
+
+def load_theme(
+    app,
+    theme: Optional[str] = None,
+    cache: Optional[ThemeCache] = None,
+    compile_theme: Callable[[object, str], None] = _compile_with_theme_manager,
+) -> bool:
+    """Apply ``theme`` (the saved theme by default), from the cache when possible.
+
+    Drop-in for ``core.theme_manager.load_theme``. Returns ``True`` when
+    the compiled theme came from the cache.
+    """
+    profiler = get_profiler()
+    theme = _theme_name(theme)
+    key = theme_key(theme, _screen_dpi(app), _density())
+    cache = cache or ThemeCache()
+
+    with profiler.phase("theme_cache_read"):
+        cached = cache.load(theme, key)
+    if cached is not None:
+        for path in cached.font_files:
+            QFontDatabase.addApplicationFont(path)
+        restore_app_state(app, cached.app_state)
+        if cached.icon_dir is not None:
+            QDir.setSearchPaths(ICON_PREFIX, [cached.icon_dir])
+        app.setStyleSheet(cached.stylesheet)
+        return True
+
+    with profiler.phase("theme_compile"), _recording_fonts([]) as font_files:
+        compile_theme(app, theme)
+    stored = cache.store(
+        theme, key, app.styleSheet(), QDir.searchPaths(ICON_PREFIX),
+        font_files, capture_app_state(app),
+    )
+    if stored is not None and stored.icon_dir is not None:
+        QDir.setSearchPaths(ICON_PREFIX, [stored.icon_dir])
+    return False
@@ -0,0 +1,222 @@
+"""Thumbnail sprite sheets for hover-scrubbing the progress slider.
+
+A sprite sheet holds one small RGB frame every ``interval`` seconds of a
+lesson video. Sheets are produced by ``ffmpeg`` in a background worker
+pool, stored raw (no image codec) in the media cache, and memory-mapped
+when shown, so a preview is a slice of bytes rather than a decode on the
+GUI thread.
+
+File layout: a fixed header (see ``_HEADER``) followed by ``count``
+frames of ``width * height * 3`` bytes (RGB888).
+"""
+import logging
+import mmap
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from core.media_cache import cache_dir, file_fingerprint
+
+logger = logging.getLogger(__name__)
+
+THUMB_INTERVAL_S = 5
+THUMB_WIDTH = 160
+THUMB_HEIGHT = 90
+VIDEO_EXTENSIONS = (".mp4", ".mkv")
+
+_MAGIC = b"BZTH"
+_VERSION = 1
+# magic, version, width, height, interval_ms, frame count
+_HEADER = struct.Struct("<4sHHHII")
+
+
+class SpriteSheetError(Exception):
+    """Raised when a sprite sheet cannot be generated or read."""
+
+
+def sprite_sheet_path(
+    media_path: str,
+    interval_s: int = THUMB_INTERVAL_S,
+    width: int = THUMB_WIDTH,
+    height: int = THUMB_HEIGHT,
+) -> Path:
+    """Cache location of the sheet for ``media_path`` and the given geometry."""
+    fingerprint = file_fingerprint(media_path)
+    return cache_dir("thumbnails") / f"{fingerprint}_{interval_s}s_{width}x{height}.thumbs"
+
+
+def write_sprite_sheet(
+    out_path: str,
+    chunks: Iterable[bytes],
+    width: int,
+    height: int,
+    interval_ms: int,
+) -> int:
+    """Stream raw RGB frame data into a sprite sheet file.
+
+    ``chunks`` may split frames arbitrarily; a trailing partial frame is
+    dropped. The file is written next to ``out_path`` and renamed into
+    place so readers never see a half-written sheet. Returns the number
+    of frames written.
+    """
+    frame_size = width * height * 3
+    tmp_path = f"{out_path}.tmp{os.getpid()}"
+    total = 0
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, width, height, interval_ms, 0))
+            for chunk in chunks:
+                f.write(chunk)
+                total += len(chunk)
+            count = total // frame_size
+            f.truncate(_HEADER.size + count * frame_size)
+            f.seek(0)
+            f.write(_HEADER.pack(_MAGIC, _VERSION, width, height, interval_ms, count))
+        os.replace(tmp_path, out_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return count
+
+
+def generate_sprite_sheet(
+    media_path: str,
+    out_path: str,
+    interval_s: int = THUMB_INTERVAL_S,
+    width: int = THUMB_WIDTH,
+    height: int = THUMB_HEIGHT,
+    ffmpeg: str = "ffmpeg",
+) -> int:
+    """Decode one frame every ``interval_s`` seconds with ffmpeg.
+
+    Only keyframes are decoded (``-skip_frame nokey``), which is plenty
+    for a scrub preview and much cheaper than a full decode.
+    """
+    vf = (
+        f"fps=1/{interval_s},"
+        f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+        f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2"
+    )
+    cmd = [
+        ffmpeg, "-v", "error", "-nostdin",
+        "-skip_frame", "nokey",
+        "-i", media_path,
+        "-an", "-vf", vf,
+        "-f", "rawvideo", "-pix_fmt", "rgb24", "-",
+    ]
+    # stderr goes to a file: a full stderr pipe would block ffmpeg while
+    # stdout is still being read.
+    with tempfile.TemporaryFile() as stderr_file:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file)
+
+        def _read_stdout():
+            while True:
+                chunk = proc.stdout.read(1 << 20)
+                if not chunk:
+                    break
+                yield chunk
+
+        try:
+            count = write_sprite_sheet(out_path, _read_stdout(), width, height, interval_s * 1000)
+        finally:
+            proc.stdout.close()
+            returncode = proc.wait()
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode("utf-8", "replace")
+    if returncode != 0 or count == 0:
+        if os.path.exists(out_path):
+            os.remove(out_path)
+        raise SpriteSheetError(f"ffmpeg failed for {media_path}: {stderr.strip()}")
+    return count
+
+
+class SpriteSheet:
+    """Read-only, memory-mapped view of a sprite sheet file."""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as exc:
+            self._file.close()
+            raise SpriteSheetError(f"Empty sprite sheet: {self.path}") from exc
+        magic, version, width, height, interval_ms, count = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise SpriteSheetError(f"Not a sprite sheet: {self.path}")
+        self.width = width
+        self.height = height
+        self.interval_ms = interval_ms
+        self.count = count
+        self.frame_size = width * height * 3
+
+    def index_for_position(self, pos_ms: int) -> int:
+        if self.count == 0:
+            return 0
+        return max(0, min(self.count - 1, int(pos_ms) // self.interval_ms))
+
+    def frame_bytes(self, index: int) -> bytes:
+        """Return the raw RGB888 bytes of frame ``index``."""
+        start = _HEADER.size + index * self.frame_size
+        return self._map[start:start + self.frame_size]
+
+    def close(self) -> None:
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+class ThumbnailService(QObject):
+    """Generate sprite sheets in a small background worker pool.
+
+    ``ready`` is emitted with ``(media_path, sheet_path)`` once a sheet is
+    available, either straight from the cache or after generation.
+    """
+
+    ready = pyqtSignal(str, str)
+    failed = pyqtSignal(str, str)
+
+    def __init__(self, parent: Optional[QObject] = None, max_workers: int = 2):
+        super().__init__(parent)
+        self.ffmpeg = shutil.which("ffmpeg")
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="thumbs")
+        # Written from the GUI thread and the worker threads.
+        self._in_flight = set()
+        self._in_flight_lock = threading.Lock()
+        if not self.ffmpeg:
+            logger.warning("ffmpeg not found; scrub thumbnails are disabled")
+
+    def request(self, media_path: str) -> None:
+        if not self.ffmpeg or not media_path.lower().endswith(VIDEO_EXTENSIONS):
+            return
+        with self._in_flight_lock:
+            if media_path in self._in_flight:
+                return
+            self._in_flight.add(media_path)
+        self._executor.submit(self._build, media_path)
+
+    def _build(self, media_path: str) -> None:
+        try:
+            sheet_path = sprite_sheet_path(media_path)
+            if not sheet_path.exists():
+                generate_sprite_sheet(media_path, str(sheet_path), ffmpeg=self.ffmpeg)
+            self.ready.emit(media_path, str(sheet_path))
+        except Exception as exc:
+            logger.exception("Failed to build thumbnails for %s", media_path)
+            self.failed.emit(media_path, str(exc))
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.discard(media_path)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,34 +1,50 @@
 import logging
 import os
 import sys
-from logging.handlers import RotatingFileHandler
+from typing import Dict, Optional
 
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import QSettings, QTranslator, QLocale
+from core.log_pipeline import LOG_LEVEL_FLAG, levels_from, start_logging
+from core.startup_profiler import PROFILE_FLAG, StartupProfiler, set_profiler, watch_first_paint
 
-from ui.main_window import LessonPlayerApp
-from core.theme_manager import load_theme
+# ``--profile-startup[=PATH]``: time imports and startup phases up to the
+# first paint of the main window. The import hook must be in place before
+# the UI modules below are imported.
+PROFILER = set_profiler(StartupProfiler.from_argv(sys.argv))
+PROFILER.install_import_hook()
+
+with PROFILER.phase("imports"):
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QSettings, QTranslator, QLocale
+
+    from ui.main_window import LessonPlayerApp
+    from core.theme_cache import load_theme
+
+
+LOG_FILE = "bouzouki_player.log"
 
 
 def configure_logging(
-    log_file: str = "bouzouki_player.log",
+    log_file: str = LOG_FILE,
     max_bytes: int = 1_000_000,
     backup_count: int = 3,
+    levels: Optional[Dict[str, int]] = None,
 ) -> None:
     """Configure application logging with simple rotation.
 
-    This keeps the main log from growing without bound while preserving
-    a small number of historical files.
+    Records are queued and written as JSON lines by a background thread
+    (``core/log_pipeline.py``); ``levels`` maps logger names to levels,
+    with ``""`` for the root logger (ERROR by default). The log keeps a
+    small number of rotated files.
     """
-    logger = logging.getLogger()
-    logger.setLevel(logging.ERROR)
+    start_logging(log_file, max_bytes, backup_count, levels)
 
-    handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    handler.setFormatter(formatter)
 
-    # Replace any existing handlers to avoid duplicate logging
-    logger.handlers = [handler]
+def _on_first_paint():
+    PROFILER.mark("first_paint")
+    PROFILER.finish()
+    if os.environ.get("BOUZOUKI_PROFILE_EXIT"):
+        # Used by the startup regression test: stop after the first frame.
+        QApplication.quit()
 
 
 def main():
@@ -38,29 +54,38 @@ def main():
     # Enable high DPI scaling (optional, helps on 4K monitors)
     os.environ["QT_ENABLE_HIGHDPI_SCALING"] = "1"
 
-    # Initialize logging with rotation
-    configure_logging()
+    # Initialize logging with rotation; levels from settings or --log-level
+    configure_logging(LOG_FILE, levels=levels_from(QSettings("bouzouki", "lessonplayer"), sys.argv))
 
     try:
         # Create Qt application
-        app = QApplication(sys.argv)
+        with PROFILER.phase("qapplication"):
+            app = QApplication([
+                arg for arg in sys.argv if not arg.startswith((PROFILE_FLAG, LOG_LEVEL_FLAG))
+            ])
 
         # Load language preference and install translator if available
-        settings = QSettings("bouzouki", "lessonplayer")
-        lang_code = settings.value("language_code", "")
-        if lang_code:
-            translator = QTranslator()
-            # Attempt to load a translation file; this is infrastructure
-            # only and will quietly do nothing if no file is present.
-            if translator.load(f"bouzouki_{lang_code}", "resources/i18n"):
-                app.installTranslator(translator)
+        with PROFILER.phase("translator"):
+            settings = QSettings("bouzouki", "lessonplayer")
+            lang_code = settings.value("language_code", "")
+            if lang_code:
+                translator = QTranslator()
+                # Attempt to load a translation file; this is infrastructure
+                # only and will quietly do nothing if no file is present.
+                if translator.load(f"bouzouki_{lang_code}", "resources/i18n"):
+                    app.installTranslator(translator)
 
         # Load and apply saved theme
-        load_theme(app)
+        with PROFILER.phase("theme"):
+            load_theme(app)
 
         # Create and show main window
-        window = LessonPlayerApp(db_path="./lessons.db")
-        window.show()
+        with PROFILER.phase("main_window"):
+            window = LessonPlayerApp(db_path="./lessons.db")
+        if PROFILER.enabled:
+            watch_first_paint(window, _on_first_paint)
+        with PROFILER.phase("show"):
+            window.show()
 
         # Run event loop
         sys.exit(app.exec_())
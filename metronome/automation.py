@@ -0,0 +1,58 @@
+"""Tempo automation (tempo-trainer ramps) for the metronome.
+
+A ``TempoAutomation`` maps a bar number to a BPM. The audio schedulers
+ask it for the tempo of every new bar and apply it exactly at the bar
+line: ``RhythmThread`` re-anchors its absolute-deadline grid there and
+``BarLoopSource`` switches to the bar rendered for the new tempo. Ramps
+therefore do not depend on GUI timers or event-loop load.
+
+Curves run from ``start_bpm`` (bar 0) to ``end_bpm`` (bar ``bars``) and
+hold the end tempo afterwards:
+
+- ``linear``: equal BPM steps every bar;
+- ``stepped``: the linear ramp, changed only every ``every_bars`` bars;
+- ``exponential``: equal tempo *ratios* every bar, which sounds even
+  because tempo is perceived logarithmically.
+"""
+from __future__ import annotations
+
+import math
+
+CURVE_KINDS = ("linear", "stepped", "exponential")
+MIN_BPM = 40
+MAX_BPM = 300
+
+
+class TempoAutomation:
+    """Per-bar tempo curve."""
+
+    def __init__(
+        self,
+        start_bpm: float,
+        end_bpm: float,
+        bars: int,
+        kind: str = "linear",
+        every_bars: int = 4,
+    ):
+        if kind not in CURVE_KINDS:
+            raise ValueError(f"Unknown tempo curve {kind!r} (use one of: {', '.join(CURVE_KINDS)})")
+        if start_bpm <= 0 or end_bpm <= 0:
+            raise ValueError("Tempos must be positive")
+        self.start_bpm = float(start_bpm)
+        self.end_bpm = float(end_bpm)
+        self.bars = max(1, int(bars))
+        self.kind = kind
+        self.every_bars = max(1, int(every_bars))
+
+    def bpm_at_bar(self, bar: int) -> float:
+        """Tempo of bar ``bar`` (0-based), rounded to 0.01 BPM."""
+        bar = max(0, int(bar))
+        if self.kind == "stepped":
+            bar -= bar % self.every_bars
+        fraction = min(1.0, bar / self.bars)
+        if self.kind == "exponential":
+            bpm = self.start_bpm * math.pow(self.end_bpm / self.start_bpm, fraction)
+        else:
+            bpm = self.start_bpm + (self.end_bpm - self.start_bpm) * fraction
+        # Rounding keeps rendered bars cacheable across runs of the same ramp.
+        return round(min(MAX_BPM, max(MIN_BPM, bpm)), 2)
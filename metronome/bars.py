@@ -0,0 +1,244 @@
+"""Pre-rendered bar loops for the metronome engine.
+
+A groove is rendered once into a single bar of audio for a given
+(groove, BPM, sound) combination and then looped, so playback does no
+per-beat Python work: each output block is one slice-and-add. Rendered
+bars are kept in a small LRU cache. A tempo change renders the new bar on
+a worker thread and swaps it in at the next bar line; tempo automation
+(``metronome.automation``) picks each bar's tempo at its bar line.
+
+Bars have an integer length in frames; the resulting tempo error is
+below one sample per bar (a few parts per million).
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Hashable, Optional
+
+import numpy as np
+
+from metronome.engine import ENGINE_SAMPLE_RATE, BeatCallback, MixRing
+from metronome.scheduler import SWING_SPLIT
+
+# ``beat_index``/``layer_index`` are set for multi-layer cycles
+# (``metronome.layers``); plain bars number beats 0..pulses-1 on layer 0.
+RenderedBar = namedtuple(
+    "RenderedBar",
+    ["audio", "beat_frames", "accents", "beat_index", "layer_index"],
+    defaults=(None, None),
+)
+
+
+def beat_steps(pulses: int, swing: bool) -> np.ndarray:
+    """Length of each beat in intervals (``RhythmThread`` semantics)."""
+    steps = np.ones(pulses, dtype=np.float64)
+    if swing:
+        steps[0::2] = SWING_SPLIT
+        steps[1::2] = 1.0 - SWING_SPLIT
+    return steps
+
+
+def beat_offsets(pulses: int, swing: bool, bpm: float, sample_rate: int = ENGINE_SAMPLE_RATE) -> np.ndarray:
+    """Frame offset of every beat within one bar."""
+    interval = 60.0 * sample_rate / bpm
+    units = np.concatenate(([0.0], np.cumsum(beat_steps(pulses, swing))[:-1]))
+    return np.rint(units * interval).astype(np.int64)
+
+
+def render_bar(
+    pulses: int,
+    accents,
+    swing: bool,
+    bpm: float,
+    regular: np.ndarray,
+    accent: np.ndarray,
+    sample_rate: int = ENGINE_SAMPLE_RATE,
+) -> RenderedBar:
+    """Render one bar; click tails past the bar end wrap to its start."""
+    pulses = max(1, int(pulses))
+    length = int(round(beat_steps(pulses, swing).sum() * 60.0 * sample_rate / bpm))
+    audio = np.zeros(length, dtype=np.float32)
+    offsets = beat_offsets(pulses, swing, bpm, sample_rate)
+    accent_set = set(accents)
+    is_accent = np.array([i in accent_set for i in range(pulses)], dtype=bool)
+    for offset, acc in zip(offsets, is_accent):
+        add_wrapped(audio, int(offset), accent if acc else regular)
+    return RenderedBar(audio, offsets, is_accent)
+
+
+def add_wrapped(audio: np.ndarray, pos: int, click: np.ndarray, gain: float = 1.0) -> None:
+    """Mix ``click`` into a loop buffer at ``pos``, wrapping past the end."""
+    length = len(audio)
+    pos %= length
+    remaining = click
+    while len(remaining):
+        n = min(len(remaining), length - pos)
+        audio[pos:pos + n] += remaining[:n] * gain if gain != 1.0 else remaining[:n]
+        remaining = remaining[n:]
+        pos = 0
+
+
+class BarCache:
+    """Small LRU cache of rendered bars."""
+
+    def __init__(self, maxsize: int = 16):
+        self.maxsize = maxsize
+        self._bars: "OrderedDict[Hashable, RenderedBar]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, key: Hashable, render) -> RenderedBar:
+        with self._lock:
+            bar = self._bars.get(key)
+            if bar is not None:
+                self._bars.move_to_end(key)
+                self.hits += 1
+                return bar
+            self.misses += 1
+        bar = render()
+        with self._lock:
+            self._bars[key] = bar
+            self._bars.move_to_end(key)
+            while len(self._bars) > self.maxsize:
+                self._bars.popitem(last=False)
+        return bar
+
+
+BAR_CACHE = BarCache()
+_RENDER_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="metronome-bars")
+
+
+class BarLoopSource:
+    """Engine source that loops a pre-rendered bar.
+
+    Drop-in for ``ClickSequencer``: the engine calls ``start_at`` and
+    ``schedule``; ``on_beat`` is still reported per beat for the UI.
+    """
+
+    def __init__(
+        self,
+        pulses: int,
+        accents,
+        swing: bool,
+        bpm: float,
+        regular: np.ndarray,
+        accent: np.ndarray,
+        sound_key: Hashable,
+        sample_rate: int = ENGINE_SAMPLE_RATE,
+        gain: float = 1.0,
+        cache: Optional[BarCache] = None,
+    ):
+        self.pulses = max(1, int(pulses))
+        self.accents = tuple(sorted(set(accents)))
+        self.swing = bool(swing)
+        self.regular = regular
+        self.accent = accent
+        self.sound_key = sound_key
+        self.sample_rate = sample_rate
+        self.gain = gain
+        self.cache = cache or BAR_CACHE
+        self.on_beat: Optional[BeatCallback] = None
+        # Called as (layer, beat, is_accent, frame) for every layer.
+        self.on_layer_beat = None
+        # Called as (bar_number, bpm) at every bar line.
+        self.on_bar = None
+        self.automation = None
+        self._bars_played = 0
+        self.bpm = bpm
+        self._bar = self._render(bpm)
+        self._pending: Optional[RenderedBar] = None
+        self._pos = 0
+        self._bar_start = 0
+        self._request = 0
+
+    def _render(self, bpm: float) -> RenderedBar:
+        key = (self.pulses, self.accents, self.swing, float(bpm), self.sound_key, self.sample_rate)
+        return self.cache.get_or_render(
+            key,
+            lambda: render_bar(
+                self.pulses, self.accents, self.swing, bpm,
+                self.regular, self.accent, self.sample_rate,
+            ),
+        )
+
+    def set_bpm(self, bpm: float) -> None:
+        """Render the bar for ``bpm`` off-thread; it starts at the next bar line."""
+        self.bpm = bpm
+        self._request += 1
+        request = self._request
+
+        def _done(fut):
+            # Ignore renders superseded by a newer tempo change.
+            if request == self._request and fut.exception() is None:
+                self._pending = fut.result()
+
+        _RENDER_POOL.submit(self._render, bpm).add_done_callback(_done)
+
+    def set_automation(self, automation) -> None:
+        """Follow a ``TempoAutomation`` from bar 0; call before playback starts."""
+        self.automation = automation
+        self._bars_played = 0
+        self._pending = None
+        if automation is not None:
+            self.bpm = automation.bpm_at_bar(0)
+            self._bar = self._render(self.bpm)
+            self._prefetch(automation.bpm_at_bar(1))
+
+    def _prefetch(self, bpm: float) -> None:
+        # Warm the cache off-thread so the bar-line switch is a cache hit.
+        if bpm != self.bpm:
+            _RENDER_POOL.submit(self._render, bpm)
+
+    def _next_bar(self) -> None:
+        """Switch bars at a bar line (audio thread)."""
+        self._bars_played += 1
+        pending, self._pending = self._pending, None
+        if self.automation is not None:
+            bpm = self.automation.bpm_at_bar(self._bars_played)
+            if bpm != self.bpm:
+                # Normally prefetched; rendering here keeps the ramp exact
+                # even when the worker has not finished yet.
+                self._bar = self._render(bpm)
+                self.bpm = bpm
+            self._prefetch(self.automation.bpm_at_bar(self._bars_played + 1))
+        elif pending is not None:
+            self._bar = pending
+        if self.on_bar is not None:
+            self.on_bar(self._bars_played, self.bpm)
+
+    def start_at(self, frame: int) -> None:
+        self._bar_start = int(frame)
+        self._pos = 0
+
+    def schedule(self, ring: MixRing, start: int, frames: int) -> None:
+        done = 0
+        if start < self._bar_start:
+            # Not started yet: skip ahead to the first bar line.
+            done = min(frames, self._bar_start - start)
+        while done < frames:
+            bar = self._bar
+            length = len(bar.audio)
+            n = min(frames - done, length - self._pos)
+            ring.add(start + done, bar.audio[self._pos:self._pos + n], self.gain)
+            if self.on_beat is not None or self.on_layer_beat is not None:
+                lo, hi = np.searchsorted(bar.beat_frames, (self._pos, self._pos + n))
+                for i in range(lo, hi):
+                    self._emit_beat(bar, i, start + done + int(bar.beat_frames[i]) - self._pos)
+            self._pos += n
+            done += n
+            if self._pos >= length:
+                self._pos = 0
+                self._bar_start = start + done
+                self._next_bar()
+
+    def _emit_beat(self, bar: RenderedBar, i: int, frame: int) -> None:
+        beat = i if bar.beat_index is None else int(bar.beat_index[i])
+        layer = 0 if bar.layer_index is None else int(bar.layer_index[i])
+        is_accent = bool(bar.accents[i])
+        if layer == 0 and self.on_beat is not None:
+            self.on_beat(beat, is_accent, frame)
+        if self.on_layer_beat is not None:
+            self.on_layer_beat(layer, beat, is_accent, frame)
@@ -0,0 +1,142 @@
+"""Headless timing benchmark for the per-click ``RhythmThread``.
+
+Each case runs the real scheduler loop for a while with silent clicks
+(``NullClick``), recording when every beat was due (the scheduler
+deadline) and when its click was actually started. The report gives,
+per BPM and swing setting:
+
+- ``jitter``: lateness of each click (actual minus due), mean/p99/max;
+- ``drift_ms``: how much later clicks are at the end of the run than at
+  the start (steady lateness is fine, growth is not);
+- ``grid_error_ms``: largest distance of a deadline from the ideal grid
+  ``origin + beats * interval``; non-zero means deadlines accumulate error;
+- ``cpu_percent``: process CPU time over wall time while running.
+
+Run as a script (JSON on stdout or ``--output``)::
+
+    python -m metronome.benchmark --minutes 2 --bpm 60 120 240 --swing both
+
+or through pytest (``tests/test_metronome_benchmark.py``, which also
+reports to pytest-benchmark when it is installed).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import platform
+import sys
+import threading
+import time
+from statistics import mean
+from typing import Iterable, List, Optional, Sequence
+
+from metronome.rhythm import RhythmThread
+from metronome.scheduler import beat_units
+
+DEFAULT_BPMS = (60, 120, 240)
+DEFAULT_PULSES = 4
+# Share of beats at each end of a run compared for drift.
+DRIFT_WINDOW = 0.1
+
+
+class NullClick:
+    """Silent stand-in for a ``WaveObject`` that records when it is played."""
+
+    def __init__(self, clock=time.perf_counter_ns):
+        self._clock = clock
+        self.played: List[int] = []
+
+    def play(self) -> None:
+        self.played.append(self._clock())
+
+
+def _percentile(values: Sequence[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(math.ceil(pct / 100.0 * len(ordered))) - 1)
+    return ordered[max(0, index)]
+
+
+def summarise(intended_ns: Sequence[int], actual_ns: Sequence[int], interval_s: float, swing: bool) -> dict:
+    """Timing statistics of one run (see the module docstring)."""
+    late_ms = [(a - i) / 1e6 for i, a in zip(intended_ns, actual_ns)]
+    if not late_ms:
+        return {"beats": 0}
+    window = max(1, int(len(late_ms) * DRIFT_WINDOW))
+
+    grid_error = 0
+    units = 0.0
+    for beat, deadline in enumerate(intended_ns):
+        ideal = intended_ns[0] + int(round(units * interval_s * 1e9))
+        grid_error = max(grid_error, abs(deadline - ideal))
+        units += beat_units(beat, swing)
+
+    return {
+        "beats": len(late_ms),
+        "jitter": {
+            "mean_ms": round(mean(late_ms), 3),
+            "p99_ms": round(_percentile(late_ms, 99), 3),
+            "max_ms": round(max(late_ms), 3),
+        },
+        "drift_ms": round(mean(late_ms[-window:]) - mean(late_ms[:window]), 3),
+        "grid_error_ms": round(grid_error / 1e6, 6),
+    }
+
+
+def run_case(bpm: float, swing: bool, duration_s: float, pulses: int = DEFAULT_PULSES) -> dict:
+    """Run ``RhythmThread`` headless for ``duration_s`` and summarise it."""
+    click = NullClick()
+    thread = RhythmThread(pulses, [0], bpm, swing, click, click)
+    intended: List[int] = []
+    # run() is called on this thread, so the signal is delivered directly.
+    thread.beat_time.connect(lambda _beat, _acc, when_ns: intended.append(when_ns))
+    timer = threading.Timer(duration_s, thread._stop.set)
+
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    timer.start()
+    try:
+        thread.run()
+    finally:
+        timer.cancel()
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+
+    report = {"bpm": bpm, "swing": swing, "pulses": pulses, "duration_s": round(wall, 3)}
+    report.update(summarise(intended, click.played, 60.0 / bpm, swing))
+    report["skipped"] = thread.scheduler.skipped
+    report["cpu_percent"] = round(100.0 * cpu / wall, 2) if wall > 0 else 0.0
+    return report
+
+
+def run_suite(bpms: Iterable[float], swings: Iterable[bool], duration_s: float) -> dict:
+    cases = [run_case(bpm, swing, duration_s) for bpm in bpms for swing in swings]
+    return {
+        "benchmark": "metronome.RhythmThread",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cases": cases,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Headless metronome timing benchmark")
+    parser.add_argument("--minutes", type=float, default=1.0, help="Run time per case (default: 1)")
+    parser.add_argument("--bpm", type=float, nargs="+", default=list(DEFAULT_BPMS), help="Tempos to test")
+    parser.add_argument("--swing", choices=("off", "on", "both"), default="both", help="Swing settings to test")
+    parser.add_argument("--output", default=None, help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    swings = {"off": [False], "on": [True], "both": [False, True]}[args.swing]
+    report = run_suite(args.bpm, swings, args.minutes * 60.0)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""Output latency calibration for the metronome.
+
+Clicks, LED flashes and the lesson video each reach the player with a
+different delay. Three offsets, stored per output device, correct for
+this:
+
+- ``audio_ms``: from a click being started to it being heard. The
+  per-click ``RhythmThread`` starts each click this much early; the
+  stream engine only adds what the device does not already report.
+- ``visual_ms``: from a beat being drawn to it being seen. LED flashes
+  are drawn this much before the beat.
+- ``video_ms``: extra delay of the lesson video. The lesson-synced
+  metronome plays this much later than the reported video position.
+
+Offsets are measured by tapping along to clicks and to flashes: the
+median distance from each tap to its beat (``tap_offset``). Taps include
+the player's own input delay, which cancels out between the two tests
+(``visual_latency_ms``). Where ``sounddevice`` can record, a loopback
+test (speaker to microphone, or an output-to-input cable) measures the
+audio latency directly by cross-correlating the recording with the
+click (``loopback_latency_ms``).
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import namedtuple
+from statistics import median
+from typing import Optional, Sequence
+
+import numpy as np
+
+LatencyOffsets = namedtuple("LatencyOffsets", ["audio_ms", "visual_ms", "video_ms"])
+NO_OFFSETS = LatencyOffsets(0.0, 0.0, 0.0)
+TapResult = namedtuple("TapResult", ["offset_ms", "spread_ms", "taps"])
+
+SETTINGS_GROUP = "latency"
+MAX_OFFSET_MS = 500.0
+CALIBRATION_BPM = 100
+CALIBRATION_BEATS = 20
+# The first beats only find the pulse and are not scored.
+WARMUP_BEATS = 4
+MIN_TAPS = 8
+# Recording must contain a correlation peak at least this clear.
+MIN_LOOPBACK_CONFIDENCE = 0.3
+LOOPBACK_PREROLL_S = 0.25
+LOOPBACK_TAIL_S = 0.75
+
+
+class CalibrationUnavailableError(RuntimeError):
+    """Raised when a loopback measurement cannot be made on this system."""
+
+
+def tap_offset(beat_times_ns: Sequence[int], tap_times_ns: Sequence[int], warmup: int = WARMUP_BEATS) -> Optional[TapResult]:
+    """Median tap lateness (ms) relative to the nearest beat.
+
+    Taps further than half a beat from every scored beat are ignored.
+    Returns ``None`` with fewer than ``MIN_TAPS`` usable taps.
+    """
+    beats = sorted(beat_times_ns)
+    if len(beats) < 2:
+        return None
+    half_beat = median(b - a for a, b in zip(beats, beats[1:])) / 2
+    scored = beats[warmup:]
+    offsets = []
+    for tap in tap_times_ns:
+        i = bisect_left(scored, tap)
+        nearest = min(scored[max(0, i - 1):i + 1], key=lambda b: abs(tap - b), default=None)
+        if nearest is not None and abs(tap - nearest) < half_beat:
+            offsets.append((tap - nearest) / 1e6)
+    if len(offsets) < MIN_TAPS:
+        return None
+    centre = median(offsets)
+    spread = median(abs(o - centre) for o in offsets)
+    return TapResult(centre, spread, len(offsets))
+
+
+def visual_latency_ms(visual_tap_ms: float, audio_tap_ms: Optional[float] = None, audio_ms: Optional[float] = None) -> float:
+    """Visual latency from tap tests, without the player's input delay.
+
+    Both tap tests contain the same input delay, so the visual latency is
+    the audio latency plus the difference between the two tests. Without
+    an audio tap test the visual tap offset is used as is.
+    """
+    if audio_tap_ms is None:
+        return visual_tap_ms
+    if audio_ms is None:
+        audio_ms = audio_tap_ms
+    return audio_ms + visual_tap_ms - audio_tap_ms
+
+
+def loopback_lag(reference: np.ndarray, recorded: np.ndarray) -> Optional[int]:
+    """Frame at which ``reference`` appears in ``recorded``, or ``None``."""
+    reference = np.asarray(reference, dtype=np.float64)
+    recorded = np.asarray(recorded, dtype=np.float64).ravel()
+    if not len(reference) or len(recorded) < len(reference):
+        return None
+    n = 1 << int(np.ceil(np.log2(len(recorded) + len(reference))))
+    corr = np.fft.irfft(np.fft.rfft(recorded, n) * np.conj(np.fft.rfft(reference, n)), n)
+    corr = corr[:len(recorded) - len(reference) + 1]
+    lag = int(np.argmax(np.abs(corr)))
+    window = recorded[lag:lag + len(reference)]
+    norm = np.linalg.norm(reference) * np.linalg.norm(window)
+    if not norm or abs(corr[lag]) / norm < MIN_LOOPBACK_CONFIDENCE:
+        return None
+    return lag
+
+
+def loopback_latency_ms(click: np.ndarray, sample_rate: int, sd_module=None, device=None) -> float:
+    """Measure the output latency by recording a click through ``sounddevice``.
+
+    ``playrec`` starts input and output together, so the lag of the click
+    in the recording is the round trip. The stream is opened with
+    ``latency="low"`` so the device's ``default_low_input_latency`` is the
+    input latency that is subtracted. Raises ``CalibrationUnavailableError`` when no
+    recording can be made or the click is not found in it.
+    """
+    if sd_module is None:
+        try:
+            import sounddevice as sd_module
+        except (ImportError, OSError) as exc:
+            raise CalibrationUnavailableError(f"sounddevice is not available: {exc}") from exc
+    preroll = int(LOOPBACK_PREROLL_S * sample_rate)
+    signal = np.zeros(preroll + len(click) + int(LOOPBACK_TAIL_S * sample_rate), dtype=np.float32)
+    signal[preroll:preroll + len(click)] = click
+    try:
+        recorded = sd_module.playrec(signal, samplerate=sample_rate, channels=1, dtype="float32",
+                                     device=device, latency="low", blocking=True)
+        input_latency = sd_module.query_devices(device, kind="input")["default_low_input_latency"]
+    except Exception as exc:  # PortAudio raises its own error types
+        raise CalibrationUnavailableError(f"Cannot record loopback: {exc}") from exc
+    lag = loopback_lag(click, recorded)
+    if lag is None:
+        raise CalibrationUnavailableError("The click was not picked up; check the input and volume")
+    round_trip_ms = (lag - preroll) * 1000.0 / sample_rate
+    return clamp_offset(round_trip_ms - float(input_latency) * 1000.0)
+
+
+def output_device_name(sd_module=None) -> str:
+    """Name of the default output device (``"default"`` without sounddevice)."""
+    try:
+        if sd_module is None:
+            import sounddevice as sd_module
+        return str(sd_module.query_devices(kind="output")["name"])
+    except Exception:
+        return "default"
+
+
+def clamp_offset(ms: float) -> float:
+    return round(min(MAX_OFFSET_MS, max(0.0, float(ms))), 1)
+
+
+def _settings_key(device: str, field: str) -> str:
+    # QSettings treats slashes as groups.
+    device = device.replace("/", "_").replace("\\", "_") or "default"
+    return f"{SETTINGS_GROUP}/{device}/{field}"
+
+
+def load_offsets(settings, device: str) -> LatencyOffsets:
+    values = []
+    for field in LatencyOffsets._fields:
+        try:
+            values.append(clamp_offset(settings.value(_settings_key(device, field), 0.0)))
+        except (TypeError, ValueError):
+            values.append(0.0)
+    return LatencyOffsets(*values)
+
+
+def save_offsets(settings, device: str, offsets: LatencyOffsets) -> None:
+    for field, value in zip(LatencyOffsets._fields, offsets):
+        settings.setValue(_settings_key(device, field), clamp_offset(value))
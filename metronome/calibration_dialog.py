@@ -0,0 +1,195 @@
+"""Latency calibration dialog for the metronome window.
+
+Runs the tap-along tests and the optional loopback test from
+``metronome.calibration`` and lets the user adjust the resulting
+offsets before they are saved for the current output device.
+"""
+from __future__ import annotations
+
+import time
+from typing import Callable, List, Optional
+
+import numpy as np
+from PyQt5 import QtCore, QtWidgets
+
+from metronome.calibration import (
+    CALIBRATION_BEATS,
+    CALIBRATION_BPM,
+    MAX_OFFSET_MS,
+    CalibrationUnavailableError,
+    LatencyOffsets,
+    loopback_latency_ms,
+    tap_offset,
+    visual_latency_ms,
+)
+from metronome.engine import ENGINE_SAMPLE_RATE
+from metronome.visual import MetronomeVisual
+
+# Time to get ready before the first flash of the visual test.
+VISUAL_LEAD_IN_NS = 1_000_000_000
+
+
+class LatencyCalibrationDialog(QtWidgets.QDialog):
+    """Measure and edit the audio, visual and lesson-video offsets.
+
+    ``rhythm_factory(bpm)`` returns an unstarted per-click rhythm (with a
+    ``beat_time`` signal) for the audio tap test; ``click`` is the sample
+    played by the loopback test.
+    """
+
+    def __init__(
+        self,
+        device: str,
+        offsets: LatencyOffsets,
+        rhythm_factory: Callable[[int], object],
+        click: Optional[np.ndarray] = None,
+        sample_rate: int = ENGINE_SAMPLE_RATE,
+        parent=None,
+        clock: Callable[[], int] = time.perf_counter_ns,
+    ):
+        super().__init__(parent)
+        self.setWindowTitle("Latency Calibration")
+        self._rhythm_factory = rhythm_factory
+        self._click = click
+        self._sample_rate = sample_rate
+        self._clock = clock
+        self._rhythm = None
+        self._test: Optional[str] = None
+        self._beat_times: List[int] = []
+        self._taps: List[int] = []
+        self._audio_tap_ms: Optional[float] = None
+        self._loopback_ms: Optional[float] = None
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(QtWidgets.QLabel(f"Output device: {device}"))
+        self.instructions = QtWidgets.QLabel(
+            "Run a test, then tap (click or press Space) exactly with each click or flash."
+        )
+        self.instructions.setWordWrap(True)
+        layout.addWidget(self.instructions)
+
+        self.visual = MetronomeVisual(clock=clock)
+        self.visual.setMinimumHeight(120)
+        self.visual.set_pattern(4, [0])
+        layout.addWidget(self.visual)
+
+        self.tap_btn = QtWidgets.QPushButton("Tap")
+        self.tap_btn.setMinimumHeight(48)
+        self.tap_btn.pressed.connect(self._tap)
+        layout.addWidget(self.tap_btn)
+        self.result_label = QtWidgets.QLabel("")
+        layout.addWidget(self.result_label)
+
+        tests = QtWidgets.QHBoxLayout()
+        self.audio_test_btn = QtWidgets.QPushButton("Audio Tap Test", clicked=self._start_audio_test)
+        self.visual_test_btn = QtWidgets.QPushButton("Visual Tap Test", clicked=self._start_visual_test)
+        self.loopback_btn = QtWidgets.QPushButton("Loopback Test", clicked=self._run_loopback)
+        self.loopback_btn.setEnabled(click is not None)
+        self.loopback_btn.setToolTip("Record the click through a microphone or an output-to-input cable")
+        for btn in (self.audio_test_btn, self.visual_test_btn, self.loopback_btn):
+            tests.addWidget(btn)
+        layout.addLayout(tests)
+
+        form = QtWidgets.QFormLayout()
+        self.audio_spin = self._offset_spin(offsets.audio_ms)
+        self.visual_spin = self._offset_spin(offsets.visual_ms)
+        self.video_spin = self._offset_spin(offsets.video_ms)
+        form.addRow("Audio latency:", self.audio_spin)
+        form.addRow("Visual latency:", self.visual_spin)
+        form.addRow("Lesson video delay:", self.video_spin)
+        layout.addLayout(form)
+
+        buttons = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Save | QtWidgets.QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def _offset_spin(self, value: float) -> QtWidgets.QDoubleSpinBox:
+        spin = QtWidgets.QDoubleSpinBox()
+        spin.setRange(0.0, MAX_OFFSET_MS)
+        spin.setDecimals(1)
+        spin.setSuffix(" ms")
+        spin.setValue(value)
+        return spin
+
+    def offsets(self) -> LatencyOffsets:
+        return LatencyOffsets(self.audio_spin.value(), self.visual_spin.value(), self.video_spin.value())
+
+    def _begin(self, test: str) -> None:
+        self._stop_test()
+        self._test = test
+        self._beat_times = []
+        self._taps = []
+        self.result_label.setText("")
+        self.tap_btn.setFocus()
+
+    def _start_audio_test(self) -> None:
+        self._begin("audio")
+        self.instructions.setText("Listen and tap with every click. The LEDs stay dark during this test.")
+        self._rhythm = self._rhythm_factory(CALIBRATION_BPM)
+        self._rhythm.beat_time.connect(self._on_click)
+        self._rhythm.start()
+
+    def _on_click(self, _beat: int, _acc: bool, when_ns: int) -> None:
+        if self._test != "audio":
+            return
+        self._beat_times.append(when_ns)
+        if len(self._beat_times) >= CALIBRATION_BEATS:
+            self._finish()
+
+    def _start_visual_test(self) -> None:
+        self._begin("visual")
+        self.instructions.setText("Watch the LEDs and tap with every flash. No clicks are played.")
+        interval = int(60e9 / CALIBRATION_BPM)
+        first = self._clock() + VISUAL_LEAD_IN_NS
+        for i in range(CALIBRATION_BEATS):
+            when = first + i * interval
+            self._beat_times.append(when)
+            self.visual.beat(i % 4, i % 4 == 0, when)
+        total_ms = (VISUAL_LEAD_IN_NS + CALIBRATION_BEATS * interval) // 1_000_000
+        QtCore.QTimer.singleShot(int(total_ms), self._finish)
+
+    def _tap(self) -> None:
+        if self._test is not None:
+            self._taps.append(self._clock())
+
+    def _finish(self) -> None:
+        test = self._test
+        if test is None:
+            return
+        self._stop_test()
+        result = tap_offset(self._beat_times, self._taps)
+        if result is None:
+            self.result_label.setText("Not enough taps on the beat; please try again.")
+            return
+        self.result_label.setText(
+            f"{test.capitalize()} taps: {result.offset_ms:+.1f} ms (± {result.spread_ms:.1f} ms, {result.taps} taps)"
+        )
+        if test == "audio":
+            self._audio_tap_ms = result.offset_ms
+            if self._loopback_ms is None:
+                self.audio_spin.setValue(result.offset_ms)
+        else:
+            audio_ms = self.audio_spin.value() if self._audio_tap_ms is not None else None
+            self.visual_spin.setValue(visual_latency_ms(result.offset_ms, self._audio_tap_ms, audio_ms))
+
+    def _stop_test(self) -> None:
+        self._test = None
+        if self._rhythm is not None:
+            self._rhythm.stop()
+            self._rhythm = None
+        self.visual.stop()
+
+    def _run_loopback(self) -> None:
+        self._stop_test()
+        try:
+            self._loopback_ms = loopback_latency_ms(self._click, self._sample_rate)
+        except CalibrationUnavailableError as e:
+            QtWidgets.QMessageBox.warning(self, "Loopback Test", str(e))
+            return
+        self.audio_spin.setValue(self._loopback_ms)
+        self.result_label.setText(f"Loopback: audio latency {self._loopback_ms:.1f} ms")
+
+    def done(self, result: int) -> None:
+        self._stop_test()
+        super().done(result)
@@ -0,0 +1,319 @@
+"""Continuous, sample-accurate audio engine for the metronome.
+
+Instead of starting a new playback stream per click, the engine renders
+one endless PCM stream. Click sources schedule their sounds at exact
+frame offsets into a ``MixRing``; the output device pulls fixed-size
+blocks from the ring. Timing is therefore defined in samples, and the
+per-beat cost is a single NumPy add.
+
+The engine itself has no audio dependency. ``open_output_stream`` plays
+it through ``sounddevice`` (PortAudio) when available and raises
+``AudioEngineUnavailableError`` otherwise, so callers can fall back to
+the per-click ``RhythmThread``. ``NullSink`` drives the engine without
+a device (tests, benchmarks).
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from metronome.scheduler import BeatScheduler, beat_units
+
+ENGINE_SAMPLE_RATE = 44100
+DEFAULT_BLOCK_FRAMES = 256  # ~5.8 ms at 44.1 kHz
+
+BeatCallback = Callable[[int, bool, int], None]
+
+
+class AudioEngineUnavailableError(Exception):
+    """Raised when no continuous output stream can be opened."""
+
+
+def pcm_to_float(
+    data: bytes,
+    num_channels: int,
+    bytes_per_sample: int,
+    sample_rate: int,
+    target_rate: int = ENGINE_SAMPLE_RATE,
+) -> np.ndarray:
+    """Convert interleaved PCM bytes to mono ``float32`` at ``target_rate``."""
+    if bytes_per_sample == 1:
+        samples = (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif bytes_per_sample == 2:
+        samples = np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+    elif bytes_per_sample == 4:
+        samples = np.frombuffer(data, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported sample width: {bytes_per_sample}")
+    if num_channels > 1:
+        usable = len(samples) - len(samples) % num_channels
+        samples = samples[:usable].reshape(-1, num_channels).mean(axis=1)
+    if sample_rate != target_rate and len(samples):
+        n_out = int(round(len(samples) * target_rate / sample_rate))
+        positions = np.arange(n_out) * (sample_rate / target_rate)
+        samples = np.interp(positions, np.arange(len(samples)), samples)
+    return np.ascontiguousarray(samples, dtype=np.float32)
+
+
+class MixRing:
+    """Circular mix buffer addressed by absolute frame numbers.
+
+    Sounds may be added anywhere in ``[read_frame, read_frame + capacity)``;
+    ``read`` returns the next block and clears it for reuse.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = int(capacity)
+        self._buf = np.zeros(self.capacity, dtype=np.float32)
+        self.read_frame = 0
+
+    def add(self, frame: int, samples: np.ndarray, gain: float = 1.0) -> None:
+        offset = frame - self.read_frame
+        if offset < 0:
+            # Start already played: keep only the audible tail.
+            samples = samples[-offset:]
+            offset = 0
+        n = min(len(samples), self.capacity - offset)
+        if n <= 0:
+            return
+        start = (self.read_frame + offset) % self.capacity
+        first = min(n, self.capacity - start)
+        self._buf[start:start + first] += samples[:first] * gain
+        if first < n:
+            self._buf[:n - first] += samples[first:n] * gain
+
+    def read(self, frames: int) -> np.ndarray:
+        start = self.read_frame % self.capacity
+        first = min(frames, self.capacity - start)
+        out = np.empty(frames, dtype=np.float32)
+        out[:first] = self._buf[start:start + first]
+        self._buf[start:start + first] = 0.0
+        if first < frames:
+            rest = frames - first
+            out[first:] = self._buf[:rest]
+            self._buf[:rest] = 0.0
+        self.read_frame += frames
+        return out
+
+
+class ClickSequencer:
+    """Place a groove's clicks at sample-exact frames.
+
+    Beat ``n`` after the anchor starts at ``anchor + units * interval``
+    (in frames), mirroring ``BeatScheduler``. Tempo changes take effect
+    at the next beat.
+    """
+
+    def __init__(
+        self,
+        pulses: int,
+        accents,
+        swing: bool,
+        bpm: float,
+        regular: np.ndarray,
+        accent: np.ndarray,
+        sample_rate: int = ENGINE_SAMPLE_RATE,
+        gain: float = 1.0,
+    ):
+        self.pulses = max(1, int(pulses))
+        self.accents = set(accents)
+        self.swing = swing
+        self.regular = regular
+        self.accent = accent
+        self.sample_rate = sample_rate
+        self.gain = gain
+        self.on_beat: Optional[BeatCallback] = None
+        self._interval = 60.0 * sample_rate / bpm
+        self._pending_interval: Optional[float] = None
+        self._anchor = 0.0
+        self._units = 0.0
+        self._beat = 0
+
+    def set_bpm(self, bpm: float) -> None:
+        self._pending_interval = 60.0 * self.sample_rate / bpm
+
+    def start_at(self, frame: int) -> None:
+        self._anchor = float(frame)
+        self._units = 0.0
+        self._beat = 0
+
+    def _next_frame(self) -> int:
+        return int(round(self._anchor + self._units * self._interval))
+
+    def schedule(self, ring: MixRing, start: int, frames: int) -> None:
+        """Add every click that starts in ``[start, start + frames)``."""
+        end = start + frames
+        while True:
+            pending = self._pending_interval
+            if pending is not None:
+                self._anchor = float(self._next_frame())
+                self._units = 0.0
+                self._interval = pending
+                self._pending_interval = None
+            frame = self._next_frame()
+            if frame >= end:
+                return
+            is_accent = self._beat in self.accents
+            ring.add(frame, self.accent if is_accent else self.regular, self.gain)
+            if self.on_beat is not None:
+                self.on_beat(self._beat, is_accent, frame)
+            self._units += beat_units(self._beat, self.swing)
+            self._beat = (self._beat + 1) % self.pulses
+
+
+class MetronomeEngine:
+    """Mix click sources into one continuous stream of ``float32`` blocks."""
+
+    def __init__(
+        self,
+        sample_rate: int = ENGINE_SAMPLE_RATE,
+        block_frames: int = DEFAULT_BLOCK_FRAMES,
+        max_voice_frames: Optional[int] = None,
+    ):
+        self.sample_rate = sample_rate
+        self.block_frames = block_frames
+        voice = max_voice_frames or sample_rate  # one second of tail
+        self.ring = MixRing(voice + 4 * block_frames)
+        self.sources: List[ClickSequencer] = []
+        self._lock = threading.Lock()
+        self.underruns = 0
+        # Output clock: ``_anchor_frame`` leaves the speaker at ``_anchor_ns``
+        # (perf_counter_ns), as last reported by the sink.
+        self._anchor_frame = 0
+        self._anchor_ns = time.perf_counter_ns()
+        # Calibrated output latency the device does not report.
+        self.latency_correction_ns = 0
+
+    @property
+    def frames_rendered(self) -> int:
+        return self.ring.read_frame
+
+    def mark_output(self, frame: int, when_ns: int) -> None:
+        """Record when ``frame`` is heard (called by sinks before each render)."""
+        self._anchor_frame = frame
+        self._anchor_ns = when_ns
+
+    def frame_time_ns(self, frame: int) -> int:
+        """Estimated ``perf_counter_ns`` at which ``frame`` is heard."""
+        return (
+            self._anchor_ns + self.latency_correction_ns
+            + int((frame - self._anchor_frame) * 1e9 / self.sample_rate)
+        )
+
+    def add_source(self, source: ClickSequencer, start_frame: Optional[int] = None) -> None:
+        """Add a source; it starts at the next block unless told otherwise."""
+        with self._lock:
+            source.start_at(self.ring.read_frame if start_frame is None else start_frame)
+            self.sources.append(source)
+
+    def clear_sources(self) -> None:
+        with self._lock:
+            self.sources = []
+
+    def render(self, frames: Optional[int] = None) -> np.ndarray:
+        """Render the next ``frames`` samples (clipped to ``[-1, 1]``)."""
+        frames = frames or self.block_frames
+        if frames > self.block_frames:
+            # Keep every mixed chunk small enough for the ring to hold the
+            # chunk plus the longest click tail.
+            return np.concatenate([
+                self.render(min(self.block_frames, frames - done))
+                for done in range(0, frames, self.block_frames)
+            ])
+        start = self.ring.read_frame
+        with self._lock:
+            for source in self.sources:
+                source.schedule(self.ring, start, frames)
+        block = self.ring.read(frames)
+        np.clip(block, -1.0, 1.0, out=block)
+        return block
+
+
+class NullSink:
+    """Consume engine blocks without an audio device.
+
+    ``pump`` renders as fast as possible; ``start`` renders in real time
+    on a background thread, paced by ``BeatScheduler`` deadlines.
+    """
+
+    def __init__(self, engine: MetronomeEngine):
+        self.engine = engine
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.scheduler = BeatScheduler(engine.block_frames / float(engine.sample_rate))
+
+    def pump(self, blocks: int) -> np.ndarray:
+        return np.concatenate([self.engine.render() for _ in range(blocks)])
+
+    def _run(self) -> None:
+        self.scheduler.start()
+        while self.scheduler.wait(self._stop) is not None:
+            self.engine.mark_output(self.engine.frames_rendered, time.perf_counter_ns())
+            self.engine.render()
+            self.scheduler.advance()
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="metronome-null-sink", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class SoundDeviceSink:
+    """Play the engine through a single PortAudio output stream."""
+
+    def __init__(self, engine: MetronomeEngine, sd_module):
+        self.engine = engine
+
+        def _callback(outdata, frames, stream_time, status):
+            if status.output_underflow:
+                engine.underruns += 1
+            # The block reaches the DAC after the device's buffering delay.
+            delay = stream_time.outputBufferDacTime - stream_time.currentTime
+            delay_ns = int(min(1.0, max(0.0, delay)) * 1e9)
+            engine.mark_output(engine.frames_rendered, time.perf_counter_ns() + delay_ns)
+            outdata[:, 0] = engine.render(frames)
+
+        try:
+            self._stream = sd_module.OutputStream(
+                samplerate=engine.sample_rate,
+                blocksize=engine.block_frames,
+                channels=1,
+                dtype="float32",
+                latency="low",
+                callback=_callback,
+            )
+        except Exception as exc:  # PortAudio raises its own error types
+            raise AudioEngineUnavailableError(f"Cannot open audio output: {exc}") from exc
+
+    @property
+    def latency_s(self) -> float:
+        return float(self._stream.latency)
+
+    def start(self) -> None:
+        self._stream.start()
+
+    def stop(self) -> None:
+        self._stream.stop()
+        self._stream.close()
+
+
+def open_output_stream(engine: MetronomeEngine) -> SoundDeviceSink:
+    """Open the continuous output stream for ``engine``.
+
+    Raises ``AudioEngineUnavailableError`` when ``sounddevice`` or the
+    PortAudio library is not installed, or no output device is usable.
+    """
+    try:
+        import sounddevice as sd
+    except (ImportError, OSError) as exc:
+        raise AudioEngineUnavailableError(f"sounddevice is not available: {exc}") from exc
+    return SoundDeviceSink(engine, sd)
@@ -0,0 +1,263 @@
+"""Offline rendering of metronome click tracks to WAV or FLAC.
+
+A track is built bar by bar from the same pre-rendered bars the live
+engine loops (``metronome.bars``), so each bar is one vectorised render
+(or a cache hit) and one copy. Bars are re-chunked into fixed-size
+blocks and written as they are produced: memory use does not depend on
+the length of the track. WAV files are written with the ``wave``
+module; FLAC is encoded by piping 16-bit PCM through ffmpeg.
+
+Tempo-trainer ramps are the same ``TempoAutomation`` curves the live
+schedulers follow: the tempo of every bar is ``bpm_at_bar(bar)``, so an
+exported ramp matches the trainer in the metronome window bar for bar.
+
+Usage::
+
+    python -m metronome.metronome export practice.flac --groove 4/4 \\
+        --bpm 90 --end-bpm 120 --bars 64 --curve stepped --every 8 --duration 10:00
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import wave
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+
+from metronome.automation import CURVE_KINDS, TempoAutomation
+from metronome.bars import BarCache, render_bar
+from metronome.engine import ENGINE_SAMPLE_RATE
+from metronome.groove_store import BUILTIN_PRESETS, get_store
+from metronome.samples import DEFAULT_BANK, PROFILES
+
+GROOVE_FILE = "metronome/grooves.json"
+EXPORT_BLOCK_FRAMES = 1 << 16
+EXPORT_FORMATS = ("wav", "flac")
+
+
+class ExportError(Exception):
+    """Raised for invalid export settings or when the encoder fails."""
+
+
+def constant_tempo(bpm: float) -> TempoAutomation:
+    """An automation that holds ``bpm`` for the whole track."""
+    return TempoAutomation(bpm, bpm, 1)
+
+
+def iter_bars(
+    groove: dict,
+    automation: TempoAutomation,
+    duration_s: float,
+    regular: np.ndarray,
+    accent: np.ndarray,
+    sample_rate: int = ENGINE_SAMPLE_RATE,
+    cache: Optional[BarCache] = None,
+) -> Iterator[np.ndarray]:
+    """Yield the bars of a track at ``automation.bpm_at_bar`` of each bar."""
+    cache = cache or BarCache()
+    pulses = max(1, int(groove["pulses"]))
+    accents = tuple(sorted(set(groove["accents"])))
+    swing = bool(groove.get("swing", False))
+    total = int(round(duration_s * sample_rate))
+    done = 0
+    bar_index = 0
+    while done < total:
+        bpm = automation.bpm_at_bar(bar_index)
+        bar_index += 1
+        key = (pulses, accents, swing, float(bpm), id(regular), id(accent), sample_rate)
+        bar = cache.get_or_render(
+            key, lambda: render_bar(pulses, accents, swing, bpm, regular, accent, sample_rate)
+        ).audio
+        bar = bar[:total - done]
+        done += len(bar)
+        yield bar
+
+
+def iter_blocks(bars: Iterator[np.ndarray], block_frames: int = EXPORT_BLOCK_FRAMES) -> Iterator[np.ndarray]:
+    """Re-chunk bars into ``block_frames`` blocks (the last one may be shorter)."""
+    buf = np.empty(block_frames, dtype=np.float32)
+    fill = 0
+    for bar in bars:
+        pos = 0
+        while pos < len(bar):
+            n = min(block_frames - fill, len(bar) - pos)
+            buf[fill:fill + n] = bar[pos:pos + n]
+            fill += n
+            pos += n
+            if fill == block_frames:
+                yield buf.copy()
+                fill = 0
+    if fill:
+        yield buf[:fill].copy()
+
+
+def _pcm16(block: np.ndarray) -> bytes:
+    return (np.clip(block, -1.0, 1.0) * (2**15 - 1)).astype("<i2").tobytes()
+
+
+class WavWriter:
+    """Mono 16-bit WAV output."""
+
+    def __init__(self, path: str, sample_rate: int):
+        self._wav = wave.open(path, "wb")
+        self._wav.setnchannels(1)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(sample_rate)
+
+    def write(self, block: np.ndarray) -> None:
+        self._wav.writeframesraw(_pcm16(block))
+
+    def close(self) -> None:
+        self._wav.close()
+
+
+class FlacWriter:
+    """FLAC output encoded by an ffmpeg child process."""
+
+    def __init__(self, path: str, sample_rate: int, ffmpeg: Optional[str] = None):
+        ffmpeg = ffmpeg or shutil.which("ffmpeg")
+        if not ffmpeg:
+            raise ExportError("FLAC export needs ffmpeg in PATH")
+        cmd = [
+            ffmpeg, "-v", "error", "-nostdin", "-y",
+            "-f", "s16le", "-ar", str(sample_rate), "-ac", "1", "-i", "-",
+            "-c:a", "flac", path,
+        ]
+        self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    def write(self, block: np.ndarray) -> None:
+        try:
+            self._proc.stdin.write(_pcm16(block))
+        except BrokenPipeError as exc:
+            raise ExportError(f"ffmpeg stopped: {self._proc.stderr.read().decode('utf-8', 'replace').strip()}") from exc
+
+    def close(self) -> None:
+        try:
+            self._proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        stderr = self._proc.stderr.read().decode("utf-8", "replace")
+        self._proc.stderr.close()
+        if self._proc.wait() != 0:
+            raise ExportError(f"ffmpeg failed: {stderr.strip()}")
+
+
+def open_writer(path: str, sample_rate: int, fmt: Optional[str] = None):
+    fmt = (fmt or os.path.splitext(path)[1].lstrip(".")).lower()
+    if fmt == "wav":
+        return WavWriter(path, sample_rate)
+    if fmt == "flac":
+        return FlacWriter(path, sample_rate)
+    raise ExportError(f"Unsupported export format {fmt!r} (use one of: {', '.join(EXPORT_FORMATS)})")
+
+
+def export_click_track(
+    path: str,
+    groove: dict,
+    automation: TempoAutomation,
+    duration_s: float,
+    regular: np.ndarray,
+    accent: np.ndarray,
+    sample_rate: int = ENGINE_SAMPLE_RATE,
+    fmt: Optional[str] = None,
+    block_frames: int = EXPORT_BLOCK_FRAMES,
+) -> int:
+    """Render a click track to ``path`` and return the number of frames written."""
+    if duration_s <= 0:
+        raise ExportError("Duration must be positive")
+    writer = open_writer(path, sample_rate, fmt)
+    frames = 0
+    try:
+        for block in iter_blocks(iter_bars(groove, automation, duration_s, regular, accent, sample_rate), block_frames):
+            writer.write(block)
+            frames += len(block)
+    finally:
+        writer.close()
+    return frames
+
+
+def parse_duration(text: str) -> float:
+    """Seconds from ``"90"``, ``"1:30"`` or ``"1:02:03"``."""
+    try:
+        seconds = 0.0
+        for part in str(text).split(":"):
+            seconds = seconds * 60 + float(part)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid duration: {text!r}")
+    if seconds <= 0:
+        raise argparse.ArgumentTypeError("Duration must be positive")
+    return seconds
+
+
+def add_export_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("output", help="Output file (.wav or .flac)")
+    parser.add_argument("--groove", default="4/4", help="Groove/preset name (default: 4/4)")
+    parser.add_argument("--bpm", type=float, required=True, help="Start tempo in BPM")
+    parser.add_argument("--end-bpm", type=float, default=None, help="Tempo-trainer target BPM (optional)")
+    parser.add_argument("--bars", type=int, default=32, help="Bars to reach the target BPM (default: 32)")
+    parser.add_argument("--curve", choices=CURVE_KINDS, default="linear", help="Trainer curve (default: linear)")
+    parser.add_argument("--every", type=int, default=4, help="Bars between steps of a stepped curve (default: 4)")
+    parser.add_argument("--duration", type=parse_duration, required=True, help="Length as seconds or M:SS")
+    parser.add_argument("--sound", default="classic", choices=sorted(PROFILES), help="Click sound profile")
+    parser.add_argument("--sample", default=None, help="WAV file to use as click sound instead of --sound")
+    parser.add_argument("--format", dest="fmt", choices=EXPORT_FORMATS, default=None,
+                        help="Output format (default: from the file extension)")
+
+
+def load_presets(groove_file: str = GROOVE_FILE) -> dict:
+    presets = dict(BUILTIN_PRESETS)
+    if os.path.exists(groove_file):
+        try:
+            presets.update(get_store(groove_file).presets())
+        except Exception as e:
+            print(f"Failed to load custom grooves: {e}")
+    return presets
+
+
+def export_automation(args: argparse.Namespace) -> TempoAutomation:
+    """The tempo curve described by the export arguments."""
+    if args.end_bpm is None:
+        return constant_tempo(args.bpm)
+    return TempoAutomation(args.bpm, args.end_bpm, args.bars, kind=args.curve, every_bars=args.every)
+
+
+def run_export(args: argparse.Namespace, presets: Optional[dict] = None) -> int:
+    """Execute a parsed ``export`` command; returns the process exit code."""
+    presets = load_presets() if presets is None else presets
+    groove = presets.get(args.groove)
+    if groove is None:
+        print(f"Unknown groove: {args.groove}. Available: {', '.join(sorted(presets))}")
+        return 2
+    try:
+        automation = export_automation(args)
+    except ValueError as e:
+        print(f"Export failed: {e}")
+        return 2
+    try:
+        if args.sample:
+            regular = accent = DEFAULT_BANK.user_sample(args.sample)
+        else:
+            regular, accent = DEFAULT_BANK.profile(args.sound)
+        frames = export_click_track(
+            args.output, groove, automation,
+            args.duration, regular, accent, DEFAULT_BANK.sample_rate, args.fmt,
+        )
+    except (ExportError, OSError, wave.Error) as e:
+        print(f"Export failed: {e}")
+        return 1
+    print(f"Wrote {frames / DEFAULT_BANK.sample_rate:.1f}s of {args.groove} to {args.output}")
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Render a metronome click track")
+    add_export_arguments(parser)
+    return run_export(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""Shared access to the custom groove file (``grooves.json``).
+
+``GrooveStore`` keeps the parsed file in memory and re-reads it only
+when its modification time, size or inode change, so listing grooves is
+free after the first load. Writes are read-modify-write cycles under an
+exclusive lock file (``fcntl`` on POSIX, ``msvcrt`` on Windows) and land
+through a temporary file plus ``os.replace``. The metronome and the tap
+tool can therefore save at the same time without losing each other's
+grooves or leaving a half-written file behind.
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_KEYS = ("pulses", "accents")
+
+# Built-in presets
+BUILTIN_PRESETS = {
+    "2/4": {"pulses": 2, "accents": [0], "swing": False},
+    "3/4": {"pulses": 3, "accents": [0], "swing": False},
+    "4/4": {"pulses": 4, "accents": [0], "swing": False},
+}
+
+
+class GrooveStoreError(Exception):
+    """Raised when the groove file cannot be parsed."""
+
+
+@contextlib.contextmanager
+def _locked(lock_path: Path):
+    """Hold an exclusive, cross-process lock on ``lock_path``."""
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+b") as handle:
+        if sys.platform.startswith("win"):
+            import msvcrt
+
+            handle.seek(0)
+            # LK_LOCK retries for ~10 s before raising OSError.
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def is_valid_groove(groove) -> bool:
+    return isinstance(groove, dict) and all(key in groove for key in REQUIRED_KEYS)
+
+
+class GrooveStore:
+    """mtime-validated, lock-protected view of one groove file."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self._data: Dict[str, dict] = {}
+        self._stamp: Optional[Tuple[int, int, int]] = None
+        self._mutex = threading.Lock()
+        self.reads = 0
+
+    def _current_stamp(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _read_locked(self) -> Dict[str, dict]:
+        """Return the parsed file, re-reading only when it changed."""
+        stamp = self._current_stamp()
+        if stamp is None:
+            self._data, self._stamp = {}, None
+            return self._data
+        if stamp != self._stamp:
+            self.reads += 1
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except ValueError as exc:
+                raise GrooveStoreError(str(exc)) from exc
+            if not isinstance(data, dict):
+                raise GrooveStoreError("Groove file must contain a JSON object")
+            self._data, self._stamp = data, stamp
+        return self._data
+
+    def load(self) -> Dict[str, dict]:
+        """All entries of the file (a copy; raises ``GrooveStoreError``)."""
+        with self._mutex:
+            return dict(self._read_locked())
+
+    def presets(self) -> Dict[str, dict]:
+        """Entries usable as metronome presets (``pulses`` and ``accents`` set)."""
+        with self._mutex:
+            return {k: v for k, v in self._read_locked().items() if is_valid_groove(v)}
+
+    def update(self, change: Callable[[Dict[str, dict]], None]) -> Dict[str, dict]:
+        """Apply ``change`` to the latest file contents and write them back.
+
+        A file that cannot be parsed is replaced rather than blocking all
+        further saves, as the metronome has always done.
+        """
+        with self._mutex, _locked(self.lock_path):
+            try:
+                data = dict(self._read_locked())
+            except GrooveStoreError as exc:
+                logger.warning("Replacing unreadable groove file %s: %s", self.path, exc)
+                data = {}
+            change(data)
+            self._write_locked(data)
+            return dict(data)
+
+    def save(self, name: str, groove: dict) -> None:
+        self.update(lambda data: data.__setitem__(name, groove))
+
+    def delete(self, name: str) -> bool:
+        removed = []
+
+        def _remove(data):
+            if data.pop(name, None) is not None:
+                removed.append(name)
+
+        self.update(_remove)
+        return bool(removed)
+
+    def _write_locked(self, data: Dict[str, dict]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=self.path.name, suffix=".tmp", dir=str(self.path.parent))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._data, self._stamp = data, self._current_stamp()
+
+
+_STORES: Dict[str, GrooveStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_store(path: str) -> GrooveStore:
+    """Process-wide store for ``path`` (shared by the metronome and tap tool)."""
+    key = os.path.abspath(path)
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = _STORES[key] = GrooveStore(path)
+        return store
@@ -0,0 +1,168 @@
+"""Simultaneous polyrhythmic layers mixed from one clock.
+
+All layers of a groove stack (e.g. 3 against 2, or a 9/8 zeibekiko over
+a 4/4 pulse) are rendered together into one loop buffer covering the
+cycle after which every layer realigns. Playback is then identical to a
+single pre-rendered bar: one source, one slice-and-add per block, and
+the layers cannot drift apart because they share every sample.
+
+Layer modes:
+
+* ``"bar"`` – the layer's bar is stretched to the main bar (polyrhythm:
+  3 pulses in the time of 2).
+* ``"pulse"`` – the layer uses the main beat interval (polymeter: a
+  9-pulse bar against a 4-pulse bar realigns after 36 beats).
+"""
+from __future__ import annotations
+
+import math
+from collections import namedtuple
+from fractions import Fraction
+from typing import Hashable, List, Optional, Sequence
+
+import numpy as np
+
+from metronome.bars import (
+    SWING_SPLIT,
+    BarCache,
+    BarLoopSource,
+    RenderedBar,
+    add_wrapped,
+    beat_steps,
+)
+from metronome.engine import ENGINE_SAMPLE_RATE
+
+LAYER_MODES = ("bar", "pulse")
+# Longest cycle (in main beats) rendered into one buffer.
+MAX_CYCLE_BEATS = 64
+
+Layer = namedtuple("Layer", ["pulses", "accents", "swing", "mode", "gain"], defaults=(False, "bar", 1.0))
+
+
+class LayerCycleError(ValueError):
+    """Raised when layers do not realign within ``MAX_CYCLE_BEATS``."""
+
+
+def _bar_units(pulses: int, swing: bool) -> Fraction:
+    """Bar length in main beat intervals, as an exact fraction."""
+    if not swing:
+        return Fraction(pulses)
+    split = Fraction(str(SWING_SPLIT))
+    pairs, odd = divmod(pulses, 2)
+    return pairs + (split if odd else 0)
+
+
+def _lcm(a: Fraction, b: Fraction) -> Fraction:
+    return Fraction(
+        a.numerator * b.numerator // math.gcd(a.numerator, b.numerator),
+        math.gcd(a.denominator, b.denominator),
+    )
+
+
+def layer_scale(main: Layer, layer: Layer) -> Fraction:
+    """Length of one of ``layer``'s beat intervals in main intervals."""
+    if layer.mode == "pulse":
+        return Fraction(1)
+    return _bar_units(main.pulses, main.swing) / _bar_units(layer.pulses, layer.swing)
+
+
+def cycle_units(layers: Sequence[Layer]) -> Fraction:
+    """Main beat intervals until every layer starts a bar together."""
+    main = layers[0]
+    cycle = _bar_units(main.pulses, main.swing)
+    for layer in layers[1:]:
+        if layer.mode not in LAYER_MODES:
+            raise ValueError(f"Unknown layer mode: {layer.mode}")
+        bar = _bar_units(layer.pulses, layer.swing) * layer_scale(main, layer)
+        cycle = _lcm(cycle, bar)
+    if cycle > MAX_CYCLE_BEATS:
+        raise LayerCycleError(f"Layers only realign after {float(cycle):g} beats")
+    return cycle
+
+
+def render_layers(
+    layers: Sequence[Layer],
+    bpm: float,
+    sounds: Sequence[tuple],
+    sample_rate: int = ENGINE_SAMPLE_RATE,
+) -> RenderedBar:
+    """Render one full cycle of all ``layers`` into a single buffer.
+
+    ``sounds[i]`` is the ``(regular, accent)`` click pair of layer ``i``.
+    Layer 0 sets the tempo; beat events are tagged with their layer.
+    """
+    interval = 60.0 * sample_rate / bpm
+    cycle = cycle_units(layers)
+    length = int(round(float(cycle) * interval))
+    audio = np.zeros(length, dtype=np.float32)
+    frames: List[np.ndarray] = []
+    accents: List[np.ndarray] = []
+    beats: List[np.ndarray] = []
+    owners: List[np.ndarray] = []
+
+    main = layers[0]
+    for index, layer in enumerate(layers):
+        pulses = max(1, int(layer.pulses))
+        scale = float(layer_scale(main, layer))
+        bar = float(_bar_units(pulses, layer.swing)) * scale
+        bars = int(round(float(cycle) / bar))
+        steps = beat_steps(pulses, layer.swing) * scale
+        within = np.concatenate(([0.0], np.cumsum(steps)[:-1]))
+        units = (np.arange(bars)[:, None] * bar + within[None, :]).ravel()
+        offsets = np.rint(units * interval).astype(np.int64)
+        beat_idx = np.tile(np.arange(pulses), bars)
+        accent_set = set(layer.accents)
+        is_accent = np.array([b in accent_set for b in beat_idx], dtype=bool)
+        regular, accent = sounds[index]
+        for offset, acc in zip(offsets, is_accent):
+            add_wrapped(audio, int(offset), accent if acc else regular, layer.gain)
+        frames.append(offsets)
+        accents.append(is_accent)
+        beats.append(beat_idx)
+        owners.append(np.full(len(offsets), index))
+
+    all_frames = np.concatenate(frames)
+    order = np.argsort(all_frames, kind="stable")
+    return RenderedBar(
+        audio,
+        all_frames[order],
+        np.concatenate(accents)[order],
+        np.concatenate(beats)[order],
+        np.concatenate(owners)[order],
+    )
+
+
+class LayerLoopSource(BarLoopSource):
+    """Loop a multi-layer cycle; tempo changes swap at the cycle line."""
+
+    def __init__(
+        self,
+        layers: Sequence[Layer],
+        bpm: float,
+        sounds: Sequence[tuple],
+        sound_key: Hashable,
+        sample_rate: int = ENGINE_SAMPLE_RATE,
+        cache: Optional[BarCache] = None,
+    ):
+        self.layers = tuple(
+            Layer(
+                int(layer.pulses), tuple(sorted(set(layer.accents))), bool(layer.swing),
+                layer.mode, float(layer.gain),
+            )
+            for layer in layers
+        )
+        self.sounds = list(sounds)
+        # Validate before touching the engine.
+        cycle_units(self.layers)
+        main = self.layers[0]
+        regular, accent = self.sounds[0]
+        super().__init__(
+            main.pulses, main.accents, main.swing, bpm, regular, accent,
+            sound_key=sound_key, sample_rate=sample_rate, cache=cache,
+        )
+
+    def _render(self, bpm: float) -> RenderedBar:
+        key = ("layers", self.layers, float(bpm), self.sound_key, self.sample_rate)
+        return self.cache.get_or_render(
+            key, lambda: render_layers(self.layers, bpm, self.sounds, self.sample_rate),
+        )
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""Polyrhythmic Metronome with Visual Feedback, Swing, Presets, and Animated LEDs
+"""Polyrhythmic Metronome with Visual Feedback, Swing, Presets, and Beat LEDs
 
 This module previously attempted to auto-install dependencies (numpy,
 simpleaudio, PyQt5) at runtime. That behaviour has been removed in
@@ -9,21 +9,17 @@ are missing.
 from __future__ import annotations
 
 import argparse
-import math
+import logging
 import sys
-import threading
-import time
-import json
+import wave
 from pathlib import Path
 from typing import List, Optional, Tuple
 
 import numpy as np
 import simpleaudio as sa
-from PyQt5 import QtCore, QtWidgets, QtGui
+from PyQt5 import QtCore, QtWidgets
 from PyQt5.QtWidgets import (
-    QLabel,
     QWidget,
-    QGraphicsOpacityEffect,
     QLineEdit,
     QSpinBox,
     QCheckBox,
@@ -32,31 +28,42 @@ from PyQt5.QtWidgets import (
     QPushButton,
     QHBoxLayout,
 )
-from PyQt5.QtCore import QPropertyAnimation, QEasingCurve
+
+from metronome.engine import (
+    ENGINE_SAMPLE_RATE,
+    AudioEngineUnavailableError,
+    MetronomeEngine,
+    open_output_stream,
+    pcm_to_float,
+)
+from metronome.automation import TempoAutomation
+from metronome.bars import BarLoopSource
+from metronome.calibration import load_offsets, output_device_name, save_offsets
+from metronome.calibration_dialog import LatencyCalibrationDialog
+from metronome.export import add_export_arguments, run_export
+from metronome.groove_store import BUILTIN_PRESETS, get_store
+from metronome.layers import Layer, LayerCycleError, LayerLoopSource
+from metronome.rhythm import RhythmThread
+from metronome.samples import DEFAULT_BANK as SAMPLE_BANK, PROFILES, to_int16_bytes
+from metronome.visual import MetronomeVisual
+
+logger = logging.getLogger(__name__)
 
 # Constants
-SR = 44100
-DUR = 0.05
-REG_FREQ, ACC_FREQ = 440, 880
+SR = ENGINE_SAMPLE_RATE
+# Longest coarse sleep of a lesson-synced rhythm, so seeks re-align it quickly.
+SYNC_MAX_SLEEP_NS = 5_000_000
 COLORS = ["#FF4D4D", "#4D94FF", "#4DFF4D", "#FFC04D", "#D64DFF", "#4DFFFF"]
 
-# Built-in presets
-BUILTIN_PRESETS = {
-    "2/4": {"pulses": 2, "accents": [0], "swing": False},
-    "3/4": {"pulses": 3, "accents": [0], "swing": False},
-    "4/4": {"pulses": 4, "accents": [0], "swing": False},
-}
-
 GROOVE_FILE = "metronome/grooves.json"
 
 
 def load_custom_presets(filepath: str = GROOVE_FILE) -> dict[str, dict]:
+    """Custom grooves from ``filepath`` (cached until the file changes)."""
     if not Path(filepath).exists():
         return {}
     try:
-        with open(filepath, "r") as f:
-            data = json.load(f)
-        return {k: v for k, v in data.items() if "pulses" in v and "accents" in v}
+        return get_store(filepath).presets()
     except Exception as e:
         print(f"Failed to load custom grooves: {e}")
         return {}
@@ -65,135 +72,116 @@ def load_custom_presets(filepath: str = GROOVE_FILE) -> dict[str, dict]:
 PRESETS = {**BUILTIN_PRESETS, **load_custom_presets()}
 
 
-def _click(freq: int, volume: float = 0.5) -> sa.WaveObject:
-    """Generate a short sine click at a given frequency."""
-    t = np.linspace(0, DUR, int(SR * DUR), False)
-    buf = (volume * np.sin(2 * math.pi * freq * t) * (2**15 - 1)).astype(np.int16)
-    return sa.WaveObject(buf.tobytes(), 1, 2, SR)
+# Legacy module attributes (``CLICK``, ``SOFT_ACCENT``, ...) are built on
+# first access through ``__getattr__`` instead of at import time.
+_LEGACY_CLICKS = {
+    "CLICK": ("classic", 0), "ACCENT": ("classic", 1),
+    "SOFT_CLICK": ("soft", 0), "SOFT_ACCENT": ("soft", 1),
+    "WOOD_CLICK": ("wood", 0), "WOOD_ACCENT": ("wood", 1),
+    "CLAVE_CLICK": ("clave", 0), "CLAVE_ACCENT": ("clave", 1),
+    "METAL_CLICK": ("metal", 0), "METAL_ACCENT": ("metal", 1),
+}
+_WAVE_OBJECTS: dict = {}
+
+
+def _wave_object(samples: np.ndarray) -> sa.WaveObject:
+    return sa.WaveObject(to_int16_bytes(samples), 1, 2, SAMPLE_BANK.sample_rate)
+
+
+def profile_wave_objects(profile: str) -> Tuple[sa.WaveObject, sa.WaveObject]:
+    """``(regular, accent)`` WaveObjects of a profile, built once on demand."""
+    pair = _WAVE_OBJECTS.get(profile)
+    if pair is None:
+        regular, accent = SAMPLE_BANK.profile(profile)
+        pair = _WAVE_OBJECTS[profile] = (_wave_object(regular), _wave_object(accent))
+    return pair
 
 
-def _click_pair(reg_freq: int, acc_freq: int, volume: float = 0.5) -> Tuple[sa.WaveObject, sa.WaveObject]:
-    return _click(reg_freq, volume), _click(acc_freq, volume)
+def __getattr__(name: str):
+    if name in _LEGACY_CLICKS:
+        profile, index = _LEGACY_CLICKS[name]
+        return profile_wave_objects(profile)[index]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-# Default classic sine clicks
-CLICK, ACCENT = _click_pair(REG_FREQ, ACC_FREQ, volume=0.5)
-# Softer, mellower clicks
-SOFT_CLICK, SOFT_ACCENT = _click_pair(330, 660, volume=0.35)
-# Brighter, woodblock-style clicks
-WOOD_CLICK, WOOD_ACCENT = _click_pair(1800, 2200, volume=0.4)
-# Clave-like mid-high wooden clicks
-CLAVE_CLICK, CLAVE_ACCENT = _click_pair(1200, 1800, volume=0.45)
-# Metal/hi-hat style clicks
-METAL_CLICK, METAL_ACCENT = _click_pair(3500, 5000, volume=0.4)
+def _wave_samples(wave) -> np.ndarray:
+    """Mono float32 samples at the engine rate (from a buffer or WaveObject)."""
+    if isinstance(wave, np.ndarray):
+        return wave
+    return pcm_to_float(wave.audio_data, wave.num_channels, wave.bytes_per_sample, wave.sample_rate)
 
 
-class RhythmThread(QtCore.QThread):
+class StreamRhythm(QtCore.QObject):
+    """Groove player backed by one continuous, sample-accurate stream.
+
+    The groove is pre-rendered one bar at a time (``BarLoopSource``) and
+    looped. Extra ``layers`` are rendered into the same loop
+    (``LayerLoopSource``), so they share one clock and one mixer. Same
+    interface as ``RhythmThread``. Construction raises
+    ``AudioEngineUnavailableError`` when no output stream can be opened
+    and ``LayerCycleError`` for layers that never realign.
+    """
+
     tick = QtCore.pyqtSignal(int, bool)
+    beat_time = QtCore.pyqtSignal(int, bool, object)
+    tempo_changed = QtCore.pyqtSignal(float)
 
-    def __init__(self, pulses, accents, bpm, swing, w_r, w_a):
+    def __init__(self, pulses, accents, bpm, swing, w_r, w_a, sound_key=None, layers=None, latency_ns=0):
         super().__init__()
-        self.pulses = pulses
-        self.accents = set(accents)
-        self.w_r = w_r
-        self.w_a = w_a
-        self.swing = swing
-        self.set_bpm(bpm)
-        self._stop = threading.Event()
+        self.engine = MetronomeEngine()
+        regular, accent = _wave_samples(w_r), _wave_samples(w_a)
+        sound_key = sound_key or (id(w_r), id(w_a))
+        if layers:
+            stack = [Layer(pulses, accents, swing)] + list(layers)
+            self.sequencer = LayerLoopSource(
+                stack, bpm, [(regular, accent)] * len(stack),
+                sound_key=sound_key, sample_rate=self.engine.sample_rate,
+            )
+        else:
+            self.sequencer = BarLoopSource(
+                pulses, accents, swing, bpm, regular, accent,
+                sound_key=sound_key, sample_rate=self.engine.sample_rate,
+            )
+        self.sequencer.on_beat = self._on_beat
+        self.sequencer.on_bar = self._on_bar
+        self.engine.add_source(self.sequencer)
+        self.sink = open_output_stream(self.engine)
+        # The stream cannot start early; beat timestamps (and so the LEDs)
+        # move later by the calibrated latency the device does not report.
+        reported_ns = int(getattr(self.sink, "latency_s", 0.0) * 1e9)
+        self.engine.latency_correction_ns = max(0, int(latency_ns) - reported_ns)
+        self._beats = 0
+        self._last_bpm = bpm
+
+    def _on_beat(self, beat, is_accent, frame):
+        # Called from the audio thread while rendering ahead; Qt queues the
+        # signals to the GUI thread, which shows the beat when it is heard.
+        self._beats += 1
+        self.tick.emit(beat, is_accent)
+        self.beat_time.emit(beat, is_accent, self.engine.frame_time_ns(frame))
+
+    def _on_bar(self, _bar, bpm):
+        # Audio thread, once per bar: only report actual tempo changes.
+        if self.sequencer.automation is not None and bpm != self._last_bpm:
+            self._last_bpm = bpm
+            self.tempo_changed.emit(bpm)
 
     def set_bpm(self, bpm):
-        self.bpm = bpm
-        self.base_interval = 60.0 / bpm
-
-    def run(self):
-        beat = 0
-        while not self._stop.is_set():
-            is_accent = beat in self.accents
-            (self.w_a if is_accent else self.w_r).play()
-            self.tick.emit(beat, is_accent)
-
-            if self.swing and beat % 2 == 0:
-                interval = self.base_interval * 0.66
-            elif self.swing and beat % 2 == 1:
-                interval = self.base_interval * 0.34
-            else:
-                interval = self.base_interval
-
-            time.sleep(interval)
-            beat = (beat + 1) % self.pulses
+        self.sequencer.set_bpm(bpm)
 
-    def stop(self):
-        self._stop.set()
-        self.wait()
-
-
-class MetronomeVisual(QtWidgets.QWidget):
-    """Simple physical metronome-style visual with a swinging pendulum."""
-
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self._pulses = 4
-        self._beat = 0
-        self._is_accent = False
-        self.setMinimumHeight(160)
-
-    def set_beat(self, beat_index: int, pulses: int, is_accent: bool) -> None:
-        self._beat = beat_index
-        self._pulses = max(1, pulses)
-        self._is_accent = is_accent
-        self.update()
-
-    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
-        painter = QtGui.QPainter(self)
-        painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
-
-        w = self.width()
-        h = self.height()
-
-        # Draw metronome body (simple wooden trapezoid)
-        base_width = int(w * 0.5)
-        base_height = int(h * 0.65)
-        left = (w - base_width) // 2
-        right = left + base_width
-        top = int(h * 0.15)
-        mid = (left + right) // 2
-
-        body = QtGui.QPolygon([
-            QtCore.QPoint(mid - base_width // 4, top),
-            QtCore.QPoint(right, base_height),
-            QtCore.QPoint(left, base_height),
-        ])
-        gradient = QtGui.QLinearGradient(left, top, right, base_height)
-        gradient.setColorAt(0.0, QtGui.QColor("#5D4037"))
-        gradient.setColorAt(1.0, QtGui.QColor("#3E2723"))
-        painter.setBrush(gradient)
-        painter.setPen(QtGui.QPen(QtGui.QColor("#2D1E19"), 2))
-        painter.drawPolygon(body)
-
-        # Pendulum arm angle swings left/right across beats
-        if self._pulses <= 1:
-            phase = 0.0
-        else:
-            # Map beat index to [-1, 1] across the bar
-            phase = (2.0 * (self._beat / float(self._pulses - 1)) - 1.0) if self._pulses > 1 else 0.0
-        max_angle = 30  # degrees
-        angle = math.radians(max_angle * phase)
+    def set_automation(self, automation):
+        self.sequencer.set_automation(automation)
 
-        arm_length = int(h * 0.5)
-        pivot = QtCore.QPoint(mid, top + int(h * 0.05))
-        end_x = pivot.x() + int(math.sin(angle) * arm_length)
-        end_y = pivot.y() + int(math.cos(angle) * arm_length)
-        end = QtCore.QPoint(end_x, end_y)
+    def start(self):
+        self.sink.start()
 
-        pen_color = QtGui.QColor("#FFD447" if self._is_accent else "#B0BEC5")
-        painter.setPen(QtGui.QPen(pen_color, 4))
-        painter.drawLine(pivot, end)
+    def stop(self):
+        self.sink.stop()
 
-        # Small weight on the arm
-        weight_radius = 7
-        painter.setBrush(pen_color)
-        painter.setPen(QtCore.Qt.NoPen)
-        painter.drawEllipse(end, weight_radius, weight_radius)
+    def jitter(self) -> dict:
+        # Clicks are placed on exact sample frames; only device underruns
+        # can disturb timing.
+        return {"beats": self._beats, "underruns": self.engine.underruns}
 
 
 class MetronomeUI(QtWidgets.QWidget):
@@ -202,12 +190,16 @@ class MetronomeUI(QtWidgets.QWidget):
         self.setWindowTitle("Groove Metronome")
         self.setFixedWidth(500)
 
-        self.threads: List[RhythmThread] = []
+        self.threads: List[RhythmThread | StreamRhythm] = []
         self.wav = None
-        self.leds = []
+        self.wav_path: Optional[str] = None
+        self.wav_samples: Optional[np.ndarray] = None
         self.sound_profile = "classic"
         # Persist user preferences locally for the metronome
         self.settings = QtCore.QSettings("bouzouki", "metronome")
+        # Calibrated output latencies of the current device.
+        self.output_device = output_device_name()
+        self.latency = load_offsets(self.settings, self.output_device)
 
         layout = QtWidgets.QVBoxLayout(self)
 
@@ -256,8 +248,22 @@ class MetronomeUI(QtWidgets.QWidget):
         delete_btn = QPushButton("Delete Selected Groove", clicked=self._delete_selected_groove)
         layout.addWidget(delete_btn)
 
-        self.led_area = QtWidgets.QHBoxLayout()
-        layout.addLayout(self.led_area)
+        # Extra groove layers played against the selected rhythm.
+        layer_box = QtWidgets.QHBoxLayout()
+        self.layer_groove_combo = QtWidgets.QComboBox()
+        self.layer_groove_combo.addItems(sorted(PRESETS.keys()))
+        self.layer_mode_combo = QtWidgets.QComboBox()
+        self.layer_mode_combo.addItem("Fit to bar", userData="bar")
+        self.layer_mode_combo.addItem("Same pulse", userData="pulse")
+        layer_box.addWidget(QtWidgets.QLabel("Layer:"))
+        layer_box.addWidget(self.layer_groove_combo, 1)
+        layer_box.addWidget(self.layer_mode_combo)
+        layer_box.addWidget(QPushButton("Add Layer", clicked=self._add_layer))
+        layer_box.addWidget(QPushButton("Remove Layer", clicked=self._remove_layer))
+        layout.addLayout(layer_box)
+        self.layer_list = QListWidget()
+        self.layer_list.setMaximumHeight(70)
+        layout.addWidget(self.layer_list)
 
         # Sound profile selection
         sound_box = QtWidgets.QHBoxLayout()
@@ -292,21 +298,46 @@ class MetronomeUI(QtWidgets.QWidget):
         self.stop_btn = QPushButton("Stop", clicked=self._stop, enabled=False)
         btn_box.addWidget(self.start_btn)
         btn_box.addWidget(self.stop_btn)
+        btn_box.addWidget(QPushButton("Calibrate Latency…", clicked=self._calibrate_latency))
         layout.addLayout(btn_box)
 
-        # Tempo trainer: gradually increase BPM over time for practice.
+        # Measured scheduling jitter of the last run.
+        self.timing_label = QtWidgets.QLabel("")
+        layout.addWidget(self.timing_label)
+
+        # Tempo trainer: ramp the BPM bar by bar (applied by the audio scheduler).
         trainer_row = QtWidgets.QHBoxLayout()
-        self.tempo_trainer_check = QCheckBox("Tempo Trainer (+2 BPM every 10s)")
+        self.tempo_trainer_check = QCheckBox("Tempo Trainer")
+        self.trainer_curve_combo = QtWidgets.QComboBox()
+        self.trainer_curve_combo.addItem("Linear", userData="linear")
+        self.trainer_curve_combo.addItem("Stepped", userData="stepped")
+        self.trainer_curve_combo.addItem("Exponential", userData="exponential")
+        self.trainer_target_spin = QSpinBox()
+        self.trainer_target_spin.setRange(40, 300)
+        self.trainer_target_spin.setValue(min(300, self.bpm_slider.value() + 20))
+        self.trainer_target_spin.setPrefix("to ")
+        self.trainer_target_spin.setSuffix(" BPM")
+        self.trainer_bars_spin = QSpinBox()
+        self.trainer_bars_spin.setRange(1, 999)
+        self.trainer_bars_spin.setValue(32)
+        self.trainer_bars_spin.setPrefix("over ")
+        self.trainer_bars_spin.setSuffix(" bars")
+        self.trainer_every_spin = QSpinBox()
+        self.trainer_every_spin.setRange(1, 64)
+        self.trainer_every_spin.setValue(4)
+        self.trainer_every_spin.setPrefix("step every ")
+        self.trainer_every_spin.setSuffix(" bars")
         trainer_row.addWidget(self.tempo_trainer_check)
+        trainer_row.addWidget(self.trainer_curve_combo, 1)
+        trainer_row.addWidget(self.trainer_target_spin)
         layout.addLayout(trainer_row)
-        self.trainer_timer = QtCore.QTimer(self)
-        self.trainer_timer.timeout.connect(self._trainer_step)
+        trainer_bars_row = QtWidgets.QHBoxLayout()
+        trainer_bars_row.addWidget(self.trainer_bars_spin)
+        trainer_bars_row.addWidget(self.trainer_every_spin)
+        layout.addLayout(trainer_bars_row)
 
         # Apply initial tempo/groove if provided, otherwise use last/default
-        if initial_tempo is not None:
-            clamped = max(40, min(300, int(initial_tempo)))
-            self.bpm_slider.setValue(clamped)
-        else:
+        if initial_tempo is None:
             # Fall back to last used tempo or app-level default if present
             saved_tempo = self.settings.value("last_tempo", None)
             if saved_tempo is not None:
@@ -315,16 +346,13 @@ class MetronomeUI(QtWidgets.QWidget):
                     self.bpm_slider.setValue(clamped)
                 except (TypeError, ValueError):
                     pass
-        if initial_groove:
-            idx = self.presets.findText(initial_groove)
-            if idx != -1:
-                self.presets.setCurrentIndex(idx)
+        self.configure(initial_tempo, initial_groove)
 
         # Restore last used sound profile if present
         # Prefer app-level configured profile when available
         app_profile = QtCore.QSettings("bouzouki", "lessonplayer").value("metronome_sound_profile", None)
         saved_profile = app_profile or self.settings.value("sound_profile", "classic")
-        if saved_profile not in ("classic", "soft", "wood", "clave", "metal"):
+        if saved_profile not in PROFILES:
             saved_profile = "classic"
         self.sound_profile = saved_profile
         for i in range(self.sound_profile_combo.count()):
@@ -332,6 +360,16 @@ class MetronomeUI(QtWidgets.QWidget):
                 self.sound_profile_combo.setCurrentIndex(i)
                 break
 
+    def configure(self, tempo: Optional[int] = None, groove: Optional[str] = None) -> None:
+        """Apply a tempo and/or groove, e.g. for the lesson being practised."""
+        if groove:
+            idx = self.presets.findText(groove)
+            if idx != -1:
+                self.presets.setCurrentIndex(idx)
+        # After the groove, so an explicit tempo wins over a groove's own BPM.
+        if tempo is not None:
+            self.bpm_slider.setValue(max(40, min(300, int(tempo))))
+
     def _update_bpm(self, bpm):
         self.bpm_label.setText(f"BPM: {bpm}")
         for t in self.threads:
@@ -343,6 +381,9 @@ class MetronomeUI(QtWidgets.QWidget):
         if not preset:
             return
         self._stop()
+        if preset.get("bpm"):
+            # Tapped grooves carry the tempo they were tapped at.
+            self.bpm_slider.setValue(max(40, min(300, int(round(preset["bpm"])))))
         self._preview_rhythm(preset["pulses"], preset["accents"])
 
     def _save_groove(self):
@@ -358,21 +399,17 @@ class MetronomeUI(QtWidgets.QWidget):
         swing = self.swing_check.isChecked()
         new_groove = {"pulses": pulses, "accents": accents, "swing": swing}
         try:
-            grooves = load_custom_presets()
-            grooves[name] = new_groove
-            with open(GROOVE_FILE, "w") as f:
-                json.dump(grooves, f, indent=2)
+            get_store(GROOVE_FILE).save(name, new_groove)
             PRESETS[name] = new_groove
             self.presets.addItem(name)
+            self.layer_groove_combo.addItem(name)
             self._refresh_custom_list()
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Error", f"Failed to save groove: {e}")
 
     def _refresh_custom_list(self):
         self.custom_list.clear()
-        grooves = load_custom_presets()
-        for name in sorted(grooves):
-            self.custom_list.addItem(name)
+        self.custom_list.addItems(sorted(load_custom_presets()))
 
     def _delete_selected_groove(self):
         item = self.custom_list.currentItem()
@@ -380,13 +417,10 @@ class MetronomeUI(QtWidgets.QWidget):
             return
         name = item.text()
         try:
-            grooves = load_custom_presets()
-            if name in grooves:
-                del grooves[name]
-                with open(GROOVE_FILE, "w") as f:
-                    json.dump(grooves, f, indent=2)
+            if get_store(GROOVE_FILE).delete(name):
                 PRESETS.pop(name, None)
                 self.presets.removeItem(self.presets.findText(name))
+                self.layer_groove_combo.removeItem(self.layer_groove_combo.findText(name))
                 self._refresh_custom_list()
                 self._clear_leds()
         except Exception as e:
@@ -400,40 +434,66 @@ class MetronomeUI(QtWidgets.QWidget):
 
     def _preview_rhythm(self, pulses, accents):
         self._stop()
-        self._clear_leds()
-        color = COLORS[0]
-        for i in range(pulses):
-            led = QLabel()
-            led.setFixedSize(24, 24)
-            led.setStyleSheet(f"background:{color};border-radius:12px;")
-            effect = QGraphicsOpacityEffect()
-            opacity = 1.0 if i in accents else 0.3
-            effect.setOpacity(opacity)
-            led.setGraphicsEffect(effect)
-            self.led_area.addWidget(led)
-            self.leds.append((led, effect))
+        self.visual.set_pattern(pulses, accents)
 
     def _select_wav(self):
         p, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Select WAV", str(Path.home()), "WAV (*.wav)")
-        self.wav = sa.WaveObject.from_wave_file(p) if p else None
+        self.wav = None
+        self.wav_samples = None
+        self.wav_path = None
+        if p:
+            try:
+                # Decoded, resampled and normalised once, then cached on disk.
+                self.wav_samples = SAMPLE_BANK.user_sample(p)
+            except (OSError, EOFError, wave.Error, ValueError) as e:
+                QtWidgets.QMessageBox.warning(self, "Invalid WAV", f"Could not load {Path(p).name}:\n{e}")
+                p = ""
+            else:
+                self.wav = _wave_object(self.wav_samples)
+                self.wav_path = p
         self.file_label.setText(Path(p).name if p else "Default click")
 
+    def _current_profile(self) -> str:
+        profile = getattr(self, "sound_profile", "classic")
+        return profile if profile in PROFILES else "classic"
+
     def _resolve_wave_objects(self) -> Tuple[sa.WaveObject, sa.WaveObject]:
         """Return (regular, accent) WaveObjects based on current sound settings."""
         if self.wav:
             return self.wav, self.wav
+        return profile_wave_objects(self._current_profile())
 
-        profile = getattr(self, "sound_profile", "classic")
-        if profile == "soft":
-            return SOFT_CLICK, SOFT_ACCENT
-        if profile == "wood":
-            return WOOD_CLICK, WOOD_ACCENT
-        if profile == "clave":
-            return CLAVE_CLICK, CLAVE_ACCENT
-        if profile == "metal":
-            return METAL_CLICK, METAL_ACCENT
-        # Fallback to classic
-        return CLICK, ACCENT
+    def _resolve_samples(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (regular, accent) float buffers for the stream engine."""
+        if self.wav_samples is not None:
+            return self.wav_samples, self.wav_samples
+        return SAMPLE_BANK.profile(self._current_profile())
+
+    def _add_layer(self):
+        name = self.layer_groove_combo.currentText()
+        if name not in PRESETS:
+            return
+        mode = self.layer_mode_combo.currentData()
+        item = QListWidgetItem(f"{name} ({self.layer_mode_combo.currentText().lower()})")
+        item.setData(QtCore.Qt.UserRole, (name, mode))
+        self.layer_list.addItem(item)
+
+    def _remove_layer(self):
+        row = self.layer_list.currentRow()
+        if row >= 0:
+            self.layer_list.takeItem(row)
+
+    def _layer_stack(self) -> List[Layer]:
+        """Extra layers configured in the UI, quieter than the main groove."""
+        layers = []
+        for i in range(self.layer_list.count()):
+            name, mode = self.layer_list.item(i).data(QtCore.Qt.UserRole)
+            groove = PRESETS.get(name)
+            if groove:
+                layers.append(
+                    Layer(groove["pulses"], groove["accents"], groove.get("swing", False), mode, 0.7)
+                )
+        return layers
 
     def _start(self):
         preset = PRESETS.get(self.presets.currentText())
@@ -445,61 +505,135 @@ class MetronomeUI(QtWidgets.QWidget):
         accents = preset["accents"]
         swing = preset.get("swing", False)
         bpm = self.bpm_slider.value()
-        w_r, w_a = self._resolve_wave_objects()
-        thread = RhythmThread(pulses, accents, bpm, swing, w_r, w_a)
-        thread.tick.connect(self._flash_led)
+        layers = self._layer_stack()
+        try:
+            regular, accent = self._resolve_samples()
+            sound_key = self.wav_path if self.wav else self._current_profile()
+            thread = StreamRhythm(
+                pulses, accents, bpm, swing, regular, accent,
+                sound_key=sound_key, layers=layers, latency_ns=self._audio_lead_ns(),
+            )
+        except LayerCycleError as e:
+            QtWidgets.QMessageBox.warning(self, "Layers", f"These layers cannot be combined:\n{e}")
+            return
+        except AudioEngineUnavailableError as e:
+            # No continuous output stream: fall back to one play() per click.
+            # Layers are not started as extra threads: their timing errors
+            # would add up instead of staying phase-locked.
+            logger.warning("Continuous audio engine unavailable, using per-click playback: %s", e)
+            if layers:
+                QtWidgets.QMessageBox.warning(
+                    self, "Layers", "Layers need the continuous audio engine (sounddevice); "
+                    "playing the main groove only.",
+                )
+            w_r, w_a = self._resolve_wave_objects()
+            thread = RhythmThread(pulses, accents, bpm, swing, w_r, w_a, lead_ns=self._audio_lead_ns())
+        thread.beat_time.connect(self._show_beat)
+        automation = self._trainer_automation(bpm)
+        if automation is not None:
+            thread.set_automation(automation)
+            thread.tempo_changed.connect(self._show_automated_tempo)
         thread.start()
         self.threads.append(thread)
         self.start_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
 
-    def _flash_led(self, beat_idx: int, acc: bool):
-        if not self.leds:
-            return
-        beat_idx %= len(self.leds)
-        led, effect = self.leds[beat_idx]
-        # Update physical visual as well
-        if hasattr(self, "visual"):
-            self.visual.set_beat(beat_idx, len(self.leds), acc)
-        anim = QPropertyAnimation(effect, b"opacity")
-        anim.setDuration(250)
-        anim.setStartValue(1.0 if acc else 0.6)
-        anim.setEndValue(0.3)
-        anim.setEasingCurve(QEasingCurve.OutCubic)
-        anim.start(QtCore.QAbstractAnimation.DeleteWhenStopped)
-        if acc:
-            self._flash_window_background()
-
-    def _flash_window_background(self):
-        self.setStyleSheet("background-color: #FFE066;")
-        QtCore.QTimer.singleShot(150, lambda: self.setStyleSheet(""))
+    def _trainer_automation(self, bpm: int) -> Optional[TempoAutomation]:
+        if not self.tempo_trainer_check.isChecked():
+            return None
+        return TempoAutomation(
+            bpm,
+            self.trainer_target_spin.value(),
+            self.trainer_bars_spin.value(),
+            kind=self.trainer_curve_combo.currentData(),
+            every_bars=self.trainer_every_spin.value(),
+        )
+
+    def _show_automated_tempo(self, bpm: float) -> None:
+        """Follow the trainer's tempo in the UI without re-timing the rhythm."""
+        self.bpm_slider.blockSignals(True)
+        self.bpm_slider.setValue(int(round(bpm)))
+        self.bpm_slider.blockSignals(False)
+        self.bpm_label.setText(f"BPM: {bpm:g}")
+
+    def sync_to(self, origin_ns: int, beat: int, bpm: float) -> None:
+        """Play the selected groove locked to an external (lesson) beat grid.
+
+        ``beat`` of the groove sounds at the monotonic time ``origin_ns``
+        and the grid continues at ``bpm``. The first call starts a
+        per-click rhythm; later calls re-align it in place. The beat is
+        delayed by the calibrated lesson video delay.
+        """
+        origin_ns += int(self.latency.video_ms * 1e6)
+        synced = [t for t in self.threads if isinstance(t, RhythmThread) and t.scheduler.max_sleep_ns]
+        if synced:
+            for t in synced:
+                t.align(origin_ns, beat, bpm)
+        else:
+            preset = PRESETS.get(self.presets.currentText()) or BUILTIN_PRESETS["4/4"]
+            self._stop()
+            w_r, w_a = self._resolve_wave_objects()
+            thread = RhythmThread(
+                preset["pulses"], preset["accents"], bpm, preset.get("swing", False),
+                w_r, w_a, max_sleep_ns=SYNC_MAX_SLEEP_NS, lead_ns=self._audio_lead_ns(),
+            )
+            thread.align(origin_ns, beat, bpm)
+            thread.beat_time.connect(self._show_beat)
+            thread.start()
+            self.threads.append(thread)
+            self.start_btn.setEnabled(False)
+            self.stop_btn.setEnabled(True)
+        self.bpm_label.setText(f"BPM: {bpm:.1f} (synced to lesson)")
+
+    def _show_beat(self, beat_idx: int, acc: bool, when_ns: int):
+        # Draw early by the display latency so the flash is seen on the beat.
+        self.visual.beat(beat_idx, acc, when_ns - int(self.latency.visual_ms * 1e6))
+
+    def _audio_lead_ns(self) -> int:
+        return int(self.latency.audio_ms * 1e6)
+
+    def _calibration_rhythm(self, bpm: int) -> RhythmThread:
+        w_r, w_a = self._resolve_wave_objects()
+        return RhythmThread(4, [0], bpm, False, w_r, w_a)
+
+    def _calibrate_latency(self):
+        self._stop()
+        dialog = LatencyCalibrationDialog(
+            self.output_device, self.latency, self._calibration_rhythm,
+            click=self._resolve_samples()[1], sample_rate=SAMPLE_BANK.sample_rate, parent=self,
+        )
+        if dialog.exec_() == QtWidgets.QDialog.Accepted:
+            self.latency = dialog.offsets()
+            save_offsets(self.settings, self.output_device, self.latency)
+
+    def stop(self):
+        """Stop every playing rhythm (used by the dock and lesson sync)."""
+        self._stop()
 
     def _stop(self):
         for t in self.threads:
             t.stop()
+            stats = t.jitter()
+            if "underruns" in stats:
+                self.timing_label.setText(f"Audio stream underruns: {stats['underruns']}")
+            elif stats["beats"]:
+                self.timing_label.setText(
+                    f"Timing: mean {stats['mean_ms']:.2f} ms late, "
+                    f"p99 {stats['p99_ms']:.2f} ms, max {stats['max_ms']:.2f} ms"
+                )
         self.threads.clear()
+        self.visual.stop()
+        self.bpm_label.setText(f"BPM: {self.bpm_slider.value()}")
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
-        self.trainer_timer.stop()
 
     def _clear_leds(self):
-        while self.led_area.count():
-            item = self.led_area.takeAt(0)
-            item.widget().deleteLater()
-        self.leds.clear()
+        self.visual.set_pattern(0, ())
 
     def closeEvent(self, e):
         self._stop()
         e.accept()
 
-    def _trainer_step(self):
-        """Increment tempo periodically when Tempo Trainer is enabled."""
-        if not self.threads or not self.tempo_trainer_check.isChecked():
-            self.trainer_timer.stop()
-            return
-        new_bpm = min(300, self.bpm_slider.value() + 2)
-        self.bpm_slider.setValue(new_bpm)
-
 
 def main(tempo: Optional[int] = None, groove: Optional[str] = None) -> None:
     """Start the metronome UI with optional initial tempo/groove."""
@@ -519,6 +653,9 @@ def cli() -> None:
     Separated from the `__main__` block so it can be tested directly.
     """
     parser = argparse.ArgumentParser(description="Groove Metronome")
+    commands = parser.add_subparsers(dest="command")
+    export_parser = commands.add_parser("export", help="Render a click track to WAV/FLAC without the GUI")
+    add_export_arguments(export_parser)
     parser.add_argument(
         "--tempo",
         type=int,
@@ -533,6 +670,9 @@ def cli() -> None:
     )
     args = parser.parse_args()
 
+    if args.command == "export":
+        sys.exit(run_export(args, PRESETS))
+
     try:
         main(tempo=args.tempo, groove=args.groove)
     except ImportError as exc:
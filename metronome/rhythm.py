@@ -0,0 +1,113 @@
+"""Per-click metronome playback on a ``QThread``.
+
+``RhythmThread`` starts one sound per beat (anything with a ``play()``
+method, normally a ``simpleaudio.WaveObject``) on the absolute-deadline
+grid of a ``BeatScheduler``. It is the fallback when the continuous
+audio engine is unavailable, and the thread the lesson sync mode aligns.
+The module itself does not import ``simpleaudio``, so the headless
+benchmark (``metronome.benchmark``) runs without it.
+"""
+from __future__ import annotations
+
+import threading
+
+from PyQt5 import QtCore
+
+from core.telemetry import TELEMETRY
+from metronome.scheduler import BeatScheduler, beat_units
+
+
+class RhythmThread(QtCore.QThread):
+    tick = QtCore.pyqtSignal(int, bool)
+    # Beat, accent and the perf_counter_ns time at which it sounds.
+    beat_time = QtCore.pyqtSignal(int, bool, object)
+    # New BPM applied by tempo automation at a bar line.
+    tempo_changed = QtCore.pyqtSignal(float)
+
+    def __init__(self, pulses, accents, bpm, swing, w_r, w_a, max_sleep_ns=None, lead_ns=0):
+        super().__init__()
+        self.pulses = pulses
+        self.accents = set(accents)
+        self.w_r = w_r
+        self.w_a = w_a
+        self.swing = swing
+        # ``lead_ns``: calibrated output latency; clicks start this much
+        # early so they are heard on the deadline.
+        self.scheduler = BeatScheduler(60.0 / bpm, max_sleep_ns=max_sleep_ns, lead_ns=lead_ns)
+        self.set_bpm(bpm)
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._beat = 0
+        self._anchored = False
+        self.automation = None
+        self._bars_played = 0
+
+    def set_bpm(self, bpm):
+        self.bpm = bpm
+        self.base_interval = 60.0 / bpm
+        self.scheduler.set_interval(self.base_interval)
+
+    def set_automation(self, automation):
+        """Follow a ``TempoAutomation`` from bar 0; call before ``start()``."""
+        self.automation = automation
+        self._bars_played = 0
+        if automation is not None:
+            self.set_bpm(automation.bpm_at_bar(0))
+
+    def align(self, origin_ns, beat, bpm=None):
+        """Place ``beat`` of the groove on the monotonic time ``origin_ns``.
+
+        Used by the lesson sync mode; may be called before ``start()``
+        or from another thread while running.
+        """
+        with self._lock:
+            if bpm is not None:
+                self.bpm = bpm
+                self.base_interval = 60.0 / bpm
+            self.scheduler.realign(origin_ns, self.base_interval)
+            self._beat = beat % self.pulses
+            self._anchored = True
+
+    def run(self):
+        # Deadlines come from a fixed monotonic origin, so time spent in
+        # play()/emit() and sleep overshoot never accumulate into drift.
+        if not self._anchored:
+            self.scheduler.start()
+        while True:
+            late = self.scheduler.wait(self._stop)
+            if late is None:
+                break
+            with self._lock:
+                if not self.scheduler.is_due():
+                    # Re-aligned to a later beat while waking up.
+                    continue
+                # One sample per beat actually played.
+                TELEMETRY.record("metronome.jitter", late / 1e6)
+                beat = self._beat
+                is_accent = beat in self.accents
+                deadline = self.scheduler.next_deadline_ns()
+                (self.w_a if is_accent else self.w_r).play()
+                self.tick.emit(beat, is_accent)
+                self.beat_time.emit(beat, is_accent, deadline)
+
+                self.scheduler.advance(beat_units(beat, self.swing))
+                self._beat = (beat + 1) % self.pulses
+                if self._beat == 0 and self.automation is not None:
+                    self._next_bar()
+
+    def _next_bar(self):
+        # The upcoming deadline is the bar line: set_interval re-anchors
+        # there, so the new tempo starts exactly on beat 0.
+        self._bars_played += 1
+        bpm = self.automation.bpm_at_bar(self._bars_played)
+        if bpm != self.bpm:
+            self.set_bpm(bpm)
+            self.tempo_changed.emit(bpm)
+
+    def jitter(self) -> dict:
+        """Measured beat lateness so far (see ``JitterStats.snapshot``)."""
+        return self.scheduler.stats.snapshot()
+
+    def stop(self):
+        self._stop.set()
+        self.wait()
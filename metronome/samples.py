@@ -0,0 +1,130 @@
+"""Click sample bank for the metronome.
+
+Sound profiles are synthesised only when first requested, instead of
+building every click pair at import time. User WAV files are decoded,
+down-mixed, resampled to the engine rate and peak-normalised once; the
+result is cached as ``.npy`` in the media cache (keyed by a content
+fingerprint), so later loads are a single file read.
+
+Buffers are mono ``float32`` in ``[-1, 1]`` at ``sample_rate``.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+import wave
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from core.media_cache import cache_dir, file_fingerprint
+from metronome.engine import ENGINE_SAMPLE_RATE, pcm_to_float
+
+logger = logging.getLogger(__name__)
+
+CLICK_DURATION_S = 0.05
+# name: (regular Hz, accent Hz, volume)
+PROFILES: Dict[str, Tuple[int, int, float]] = {
+    "classic": (440, 880, 0.5),
+    "soft": (330, 660, 0.35),
+    "wood": (1800, 2200, 0.4),
+    "clave": (1200, 1800, 0.45),
+    "metal": (3500, 5000, 0.4),
+}
+# User samples are normalised to the peak level of the classic click.
+USER_SAMPLE_PEAK = 0.5
+
+ClickPair = Tuple[np.ndarray, np.ndarray]
+
+
+def synth_click(freq: float, volume: float, sample_rate: int = ENGINE_SAMPLE_RATE) -> np.ndarray:
+    """Short sine click, as previously built for each ``WaveObject``."""
+    t = np.linspace(0, CLICK_DURATION_S, int(sample_rate * CLICK_DURATION_S), False)
+    return (volume * np.sin(2 * math.pi * freq * t)).astype(np.float32)
+
+
+def read_wav(path: str, sample_rate: int = ENGINE_SAMPLE_RATE) -> np.ndarray:
+    """Decode a PCM WAV file to mono ``float32`` at ``sample_rate``."""
+    with wave.open(str(path), "rb") as w:
+        data = w.readframes(w.getnframes())
+        return pcm_to_float(data, w.getnchannels(), w.getsampwidth(), w.getframerate(), sample_rate)
+
+
+def normalise(samples: np.ndarray, peak: float = USER_SAMPLE_PEAK) -> np.ndarray:
+    top = float(np.abs(samples).max()) if len(samples) else 0.0
+    if top <= 0.0:
+        return samples.astype(np.float32)
+    return (samples * (peak / top)).astype(np.float32)
+
+
+class SampleBank:
+    """Lazily built, cached click buffers."""
+
+    def __init__(self, sample_rate: int = ENGINE_SAMPLE_RATE, cache_directory: Optional[Path] = None):
+        self.sample_rate = sample_rate
+        self._cache_directory = cache_directory
+        self._profiles: Dict[str, ClickPair] = {}
+        self._user: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def profile(self, name: str) -> ClickPair:
+        """``(regular, accent)`` buffers of a built-in profile."""
+        with self._lock:
+            pair = self._profiles.get(name)
+            if pair is None:
+                if name not in PROFILES:
+                    raise KeyError(f"Unknown sound profile: {name}")
+                reg_freq, acc_freq, volume = PROFILES[name]
+                pair = (
+                    synth_click(reg_freq, volume, self.sample_rate),
+                    synth_click(acc_freq, volume, self.sample_rate),
+                )
+                self._profiles[name] = pair
+            return pair
+
+    def loaded_profiles(self):
+        return sorted(self._profiles)
+
+    def _disk_path(self, path: str) -> Path:
+        directory = self._cache_directory or cache_dir("metronome-samples")
+        return Path(directory) / f"{file_fingerprint(path)}_{self.sample_rate}.npy"
+
+    def user_sample(self, path: str) -> np.ndarray:
+        """Decoded, resampled, normalised buffer of a user WAV file."""
+        key = os.path.abspath(path)
+        with self._lock:
+            cached = self._user.get(key)
+        if cached is not None:
+            return cached
+
+        disk_path = self._disk_path(path)
+        samples = None
+        if disk_path.exists():
+            try:
+                samples = np.load(disk_path, allow_pickle=False)
+            except (OSError, ValueError):
+                logger.warning("Ignoring unreadable sample cache %s", disk_path)
+        if samples is None:
+            samples = normalise(read_wav(path, self.sample_rate))
+            tmp_path = disk_path.with_name(f"{disk_path.stem}.tmp{os.getpid()}.npy")
+            try:
+                np.save(tmp_path, samples, allow_pickle=False)
+                os.replace(tmp_path, disk_path)
+            except OSError:
+                logger.warning("Could not cache sample %s", path, exc_info=True)
+                if tmp_path.exists():
+                    tmp_path.unlink()
+        with self._lock:
+            self._user[key] = samples
+        return samples
+
+
+def to_int16_bytes(samples: np.ndarray) -> bytes:
+    """16-bit PCM bytes of a float buffer (for ``simpleaudio``)."""
+    return (np.clip(samples, -1.0, 1.0) * (2**15 - 1)).astype("<i2").tobytes()
+
+
+DEFAULT_BANK = SampleBank()
@@ -0,0 +1,193 @@
+"""Drift-free beat scheduling for the metronome.
+
+Every beat deadline is computed from a fixed monotonic origin
+(``time.perf_counter_ns``) rather than by sleeping for one interval after
+the previous click. Time spent playing a sound, emitting Qt signals or
+oversleeping therefore never accumulates: a late beat is late on its
+own, and the next one is still aimed at its exact position on the grid.
+
+Waiting is done in two phases: a coarse, interruptible sleep until
+shortly before the deadline, then a short spin (yielding the GIL) for
+the last ``spin_ns`` nanoseconds.
+"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+# Final stretch before a deadline that is spun rather than slept.
+DEFAULT_SPIN_NS = 2_000_000
+# Swing splits each beat pair's interval 66/34: the even beat is long.
+SWING_SPLIT = 0.66
+
+
+def beat_units(beat: int, swing: bool) -> float:
+    """Length of ``beat`` of a bar in beat intervals."""
+    if not swing:
+        return 1.0
+    return SWING_SPLIT if beat % 2 == 0 else 1.0 - SWING_SPLIT
+
+
+class JitterStats:
+    """Running statistics of beat lateness (actual wake-up minus deadline)."""
+
+    def __init__(self, window: int = 2048):
+        self.count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.max_ns = 0
+        self._recent = deque(maxlen=window)
+
+    def add(self, late_ns: int) -> None:
+        # Welford's algorithm: O(1) per beat, numerically stable.
+        self.count += 1
+        delta = late_ns - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (late_ns - self._mean)
+        self.max_ns = max(self.max_ns, late_ns)
+        self._recent.append(late_ns)
+
+    @property
+    def mean_ms(self) -> float:
+        return self._mean / 1e6
+
+    @property
+    def stdev_ms(self) -> float:
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(self._m2 / (self.count - 1)) / 1e6
+
+    @property
+    def max_ms(self) -> float:
+        return self.max_ns / 1e6
+
+    def percentile_ms(self, pct: float) -> float:
+        """Percentile over the most recent beats (``window``)."""
+        if not self._recent:
+            return 0.0
+        ordered = sorted(self._recent)
+        index = min(len(ordered) - 1, int(math.ceil(pct / 100.0 * len(ordered))) - 1)
+        return ordered[max(0, index)] / 1e6
+
+    def snapshot(self) -> dict:
+        return {
+            "beats": self.count,
+            "mean_ms": round(self.mean_ms, 3),
+            "stdev_ms": round(self.stdev_ms, 3),
+            "p99_ms": round(self.percentile_ms(99), 3),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class BeatScheduler:
+    """Absolute-deadline beat grid anchored on a monotonic clock.
+
+    Deadlines are ``origin + units * interval`` where ``units`` is the
+    number of beats (or beat fractions, for swing) since the anchor. A
+    tempo change re-anchors at the upcoming deadline, so the grid stays
+    continuous. ``clock`` and ``sleep`` are injectable for tests.
+    """
+
+    def __init__(
+        self,
+        interval_s: float,
+        clock: Callable[[], int] = time.perf_counter_ns,
+        sleep: Callable[[float], None] = time.sleep,
+        spin_ns: int = DEFAULT_SPIN_NS,
+        max_sleep_ns: Optional[int] = None,
+        lead_ns: int = 0,
+    ):
+        self._clock = clock
+        self._sleep = sleep
+        self.spin_ns = spin_ns
+        # Cap on one coarse sleep, so a grid moved by ``realign`` from
+        # another thread is picked up before the old deadline.
+        self.max_sleep_ns = max_sleep_ns
+        # Wake this much before each deadline, so output with a known
+        # latency (``metronome.calibration``) is heard on the deadline.
+        self.lead_ns = int(lead_ns)
+        self.stats = JitterStats()
+        self._lock = threading.Lock()
+        self._interval_ns = interval_s * 1e9
+        self._origin_ns = 0
+        self._units = 0.0
+        self.skipped = 0
+
+    def start(self, origin_ns: Optional[int] = None) -> None:
+        """Anchor the grid; the first deadline is the origin itself."""
+        with self._lock:
+            self._origin_ns = self._clock() if origin_ns is None else origin_ns
+            self._units = 0.0
+
+    def set_interval(self, interval_s: float) -> None:
+        """Change the beat interval from the next deadline onwards."""
+        with self._lock:
+            self._origin_ns = self._deadline_locked()
+            self._units = 0.0
+            self._interval_ns = interval_s * 1e9
+
+    def realign(self, origin_ns: int, interval_s: Optional[float] = None) -> None:
+        """Move the grid so the next deadline is ``origin_ns``."""
+        with self._lock:
+            if interval_s is not None:
+                self._interval_ns = interval_s * 1e9
+            self._origin_ns = int(origin_ns)
+            self._units = 0.0
+
+    def is_due(self) -> bool:
+        """True when the next deadline (less the lead) has been reached."""
+        return self.next_deadline_ns() - self.lead_ns <= self._clock()
+
+    def _deadline_locked(self) -> int:
+        return self._origin_ns + int(round(self._units * self._interval_ns))
+
+    def next_deadline_ns(self) -> int:
+        with self._lock:
+            return self._deadline_locked()
+
+    def advance(self, units: float = 1.0) -> None:
+        """Move the deadline forward by ``units`` beats."""
+        with self._lock:
+            self._units += units
+
+    def wait(self, stop_event: Optional[threading.Event] = None) -> Optional[int]:
+        """Block until the next deadline and return the lateness in ns.
+
+        Returns ``None`` when ``stop_event`` is set while waiting. When the
+        thread wakes more than a full beat late (e.g. after a system
+        suspend), the grid is re-anchored at "now" instead of firing a
+        burst of catch-up beats.
+        """
+        while True:
+            deadline = self.next_deadline_ns() - self.lead_ns
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                break
+            if remaining > self.spin_ns:
+                coarse_ns = remaining - self.spin_ns
+                if self.max_sleep_ns is not None:
+                    coarse_ns = min(coarse_ns, self.max_sleep_ns)
+                coarse = coarse_ns / 1e9
+                if stop_event is not None:
+                    if stop_event.wait(coarse):
+                        return None
+                else:
+                    self._sleep(coarse)
+            else:
+                # Yield the GIL while spinning so Qt keeps running.
+                self._sleep(0)
+        if stop_event is not None and stop_event.is_set():
+            return None
+
+        late = self._clock() - deadline
+        with self._lock:
+            if late > self._interval_ns:
+                self.skipped += 1
+                self._origin_ns = deadline + self.lead_ns + late
+                self._units = 0.0
+                late = 0
+        self.stats.add(late)
+        return late
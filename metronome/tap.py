@@ -1,10 +1,11 @@
 import sys
 import time
-import json
-from pathlib import Path
 from PyQt5.QtWidgets import QApplication, QWidget, QLabel
 from PyQt5.QtCore import Qt
 
+from metronome.groove_store import get_store
+from metronome.tap_tempo import TapTempoEstimator, analyse_taps
+
 GROOVE_FILE = "metronome/grooves.json"
 
 class TapGroove(QWidget):
@@ -16,6 +17,7 @@ class TapGroove(QWidget):
         self.label.setGeometry(20, 60, 360, 80)
         self.clicks = []
         self.timestamps = []
+        self.estimator = TapTempoEstimator()
         self.show()
 
     def mousePressEvent(self, event):
@@ -28,47 +30,52 @@ class TapGroove(QWidget):
         if event.key() == Qt.Key_Space and self.timestamps:
             self.clicks.pop()
             self.timestamps.pop()
+            self.estimator.undo(self.timestamps[-1] if self.timestamps else None)
             print("Undo last tap")
         elif event.key() in [Qt.Key_Return, Qt.Key_Enter]:
             self._save_groove()
 
     def _tap(self, accent):
-        now = time.time()
+        # Monotonic: wall-clock adjustments must not distort intervals.
+        now = time.monotonic()
         self.timestamps.append(now)
         self.clicks.append(accent)
-        print("Tap", "Accent" if accent else "Regular", f"at {now:.2f}s")
+        bpm = self.estimator.tap(now)
+        live = f" (~{bpm:.1f} BPM)" if bpm else ""
+        print("Tap", "Accent" if accent else "Regular", f"at {now:.2f}s{live}")
 
     def _save_groove(self):
-        if len(self.timestamps) < 2:
+        analysis = analyse_taps(self.timestamps, self.clicks)
+        if analysis is None:
             print("Not enough taps to compute tempo.")
             return
 
-        intervals = [t2 - t1 for t1, t2 in zip(self.timestamps, self.timestamps[1:])]
-        avg_interval = sum(intervals) / len(intervals)
-        bpm = 60.0 / avg_interval
-        accents = [i for i, a in enumerate(self.clicks) if a]
-
         groove = {
-            "pulses": len(self.clicks),
-            "accents": accents,
-            "swing": False
+            "pulses": analysis.pulses,
+            "accents": analysis.accents,
+            "swing": analysis.swing,
+            "bpm": analysis.bpm,
         }
 
         name = f"Tapped Groove {int(time.time())}"
-        print(f"\nSaved '{name}' with {groove['pulses']} pulses, BPM: {bpm:.1f}, Accents: {accents}")
+        print(
+            f"\nSaved '{name}' with {groove['pulses']} pulses, BPM: {analysis.bpm:.1f}, "
+            f"Accents: {analysis.accents}, Swing: {analysis.swing}"
+        )
+        if analysis.rejected:
+            print(f"Corrected {analysis.rejected} double or off-grid tap(s)")
 
-        # Save to grooves.json
+        # Save to grooves.json (locked, atomic; safe while the metronome saves too)
         try:
-            grooves = json.load(open(GROOVE_FILE)) if Path(GROOVE_FILE).exists() else {}
-            grooves[name] = groove
-            with open(GROOVE_FILE, "w") as f:
-                json.dump(grooves, f, indent=2)
+            get_store(GROOVE_FILE).save(name, groove)
             print("✔️ Groove saved to grooves.json")
         except Exception as e:
             print("❌ Failed to save:", e)
 
         self.clicks.clear()
         self.timestamps.clear()
+        if hasattr(self, "estimator"):
+            self.estimator.reset()
 
 
 def main():
@@ -0,0 +1,162 @@
+"""Tap-tempo estimation and groove inference for ``metronome/tap.py``.
+
+Taps are timestamped with a monotonic clock. The inter-onset intervals
+(IOIs) are clustered to find the grid unit: the median of the shortest
+well-populated cluster, refined over all IOIs that sit close to an
+integer multiple of it. IOIs that fit no multiple (a late or early tap)
+are left out of the estimate, and near-zero IOIs (double taps) are
+merged. Every tap is then placed on the grid, so rests and syncopation
+keep the accents on the right pulse; the tempo is the tapped span
+divided by its grid steps. A long-short pattern on a triplet
+grid is recognised as swing, and the bar length is the shortest period
+over which the tapped and accented pulses repeat.
+
+``TapTempoEstimator.tap`` keeps only a fixed window of recent IOIs for
+the live BPM read-out, so every tap costs the same however long the
+user keeps tapping.
+"""
+from __future__ import annotations
+
+import time
+from collections import deque, namedtuple
+from statistics import median
+from typing import Callable, List, Optional, Sequence
+
+# IOIs whose ratio to a neighbour exceeds this start a new cluster.
+CLUSTER_RATIO = 1.3
+# A cluster must hold this share of the IOIs to define the grid unit.
+MIN_CLUSTER_SHARE = 0.2
+# IOIs further than this (in grid units) from a whole multiple are outliers.
+GRID_TOLERANCE = 0.3
+LIVE_WINDOW = 16
+
+TapAnalysis = namedtuple("TapAnalysis", ["bpm", "pulses", "accents", "swing", "positions", "rejected"])
+
+
+def grid_unit(iois: Sequence[float]) -> Optional[float]:
+    """Robust grid unit (seconds) of a set of inter-onset intervals."""
+    values = sorted(i for i in iois if i > 0)
+    if not values:
+        return None
+    clusters: List[List[float]] = [[values[0]]]
+    for value in values[1:]:
+        if value / clusters[-1][-1] > CLUSTER_RATIO:
+            clusters.append([])
+        clusters[-1].append(value)
+    needed = max(1, min(2, len(values)), int(MIN_CLUSTER_SHARE * len(values) + 0.5))
+    base = next((c for c in clusters if len(c) >= needed), max(clusters, key=len))
+    unit = median(base)
+
+    # Least-squares refinement over every IOI that fits the grid.
+    total = steps = 0.0
+    for value in values:
+        multiple = round(value / unit)
+        if multiple >= 1 and abs(value / unit - multiple) <= GRID_TOLERANCE:
+            total += value
+            steps += multiple
+    return total / steps if steps else unit
+
+
+def _repeat_period(length: int, onsets: set, accents: set) -> int:
+    """Shortest bar length over which the tapped pattern repeats."""
+    if not accents:
+        return length
+    for period in range(1, length // 2 + 1):
+        # At least two full bars, optionally plus a closing downbeat.
+        if length % period not in (0, 1):
+            continue
+        if all(
+            ((pos in onsets) == ((pos + period) in onsets)) and ((pos in accents) == ((pos + period) in accents))
+            for pos in range(length - period)
+        ):
+            return period
+    return length
+
+
+def _swing_positions(positions: List[int]) -> Optional[List[int]]:
+    """Map a long-short (2:1) triplet-grid pattern onto swung pulses."""
+    if {pos % 3 for pos in positions} != {0, 2}:
+        return None
+    return [(pos // 3) * 2 + (1 if pos % 3 == 2 else 0) for pos in positions]
+
+
+def analyse_taps(timestamps: Sequence[float], accents: Sequence[bool]) -> Optional[TapAnalysis]:
+    """Infer tempo, pulses per bar, accents and swing from taps.
+
+    Returns ``None`` with fewer than two taps.
+    """
+    if len(timestamps) < 2:
+        return None
+    iois = [b - a for a, b in zip(timestamps, timestamps[1:])]
+    unit = grid_unit(iois)
+    if not unit:
+        return None
+
+    positions = [0]
+    accented = [bool(accents[0])]
+    rejected = 0
+    for ioi, accent in zip(iois, accents[1:]):
+        ratio = ioi / unit
+        steps = round(ratio)
+        if steps == 0:
+            # Double tap: keep one onset, accented if either tap was.
+            accented[-1] = accented[-1] or bool(accent)
+            rejected += 1
+            continue
+        if abs(ratio - steps) > GRID_TOLERANCE:
+            rejected += 1
+        positions.append(positions[-1] + steps)
+        accented.append(bool(accent))
+
+    if positions[-1] > 0:
+        # Span over grid steps: exact for steady taps, and single
+        # mistimed taps in between do not move it.
+        unit = (timestamps[-1] - timestamps[0]) / positions[-1]
+
+    swing = False
+    grid_seconds = unit
+    swung = _swing_positions(positions)
+    if swung is not None:
+        positions, swing = swung, True
+        # Two swung pulses (long + short) span one beat interval.
+        grid_seconds = unit * 3
+
+    length = positions[-1] + 1
+    onsets = set(positions)
+    accent_positions = {pos for pos, acc in zip(positions, accented) if acc}
+    pulses = _repeat_period(length, onsets, accent_positions)
+    if swing and pulses % 2:
+        pulses = length if length % 2 == 0 else length + 1
+    bar_accents = sorted({pos % pulses for pos in accent_positions})
+    return TapAnalysis(round(60.0 / grid_seconds, 1), pulses, bar_accents, swing, positions, rejected)
+
+
+class TapTempoEstimator:
+    """Live BPM read-out with constant cost per tap."""
+
+    def __init__(self, window: int = LIVE_WINDOW, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._iois: deque = deque(maxlen=window)
+        self._last: Optional[float] = None
+
+    def tap(self, now: Optional[float] = None) -> Optional[float]:
+        """Register a tap; returns the current BPM estimate once known."""
+        now = self._clock() if now is None else now
+        if self._last is not None:
+            self._iois.append(now - self._last)
+        self._last = now
+        return self.bpm()
+
+    def undo(self, previous: Optional[float]) -> None:
+        """Forget the last tap; ``previous`` is the tap before it (or ``None``)."""
+        if self._iois and previous is not None:
+            self._iois.pop()
+        self._last = previous
+
+    def bpm(self) -> Optional[float]:
+        unit = grid_unit(self._iois)
+        return round(60.0 / unit, 1) if unit else None
+
+    def reset(self) -> None:
+        self._iois.clear()
+        self._last = None
@@ -0,0 +1,200 @@
+"""Beat display for the metronome window.
+
+One custom-painted widget draws the pendulum, the row of beat LEDs and
+the accent flash. Beats are reported with the time at which they are
+heard (``perf_counter_ns`` from the scheduler or the audio engine's
+output clock), and every frame derives the LED levels and pendulum angle
+from those timestamps. A beat therefore costs one append; drawing is
+one repaint per display frame whatever the tempo or number of pulses,
+with no per-beat animation objects or style-sheet changes. The frame
+timer only runs while something is moving.
+"""
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+FRAME_INTERVAL_MS = 16
+LED_FLASH_NS = 250_000_000
+ACCENT_FLASH_NS = 150_000_000
+LED_REST_LEVEL = 0.3
+LED_ACCENT_REST_LEVEL = 0.6
+LED_COLOR = "#FF4D4D"
+ACCENT_FLASH_COLOR = "#FFE066"
+MAX_SWING_DEG = 30
+
+
+def led_level(now_ns: int, hit: Optional[Tuple[int, bool]], rest: float = LED_REST_LEVEL) -> float:
+    """LED opacity ``now_ns`` after a hit: 1.0/0.6 easing out to ``rest``."""
+    if hit is None:
+        return rest
+    when_ns, is_accent = hit
+    elapsed = now_ns - when_ns
+    if elapsed < 0 or elapsed >= LED_FLASH_NS:
+        return rest
+    eased = 1.0 - (1.0 - elapsed / LED_FLASH_NS) ** 3  # OutCubic
+    start = 1.0 if is_accent else 0.6
+    return start + (rest - start) * eased
+
+
+def pendulum_angle(now_ns: int, beats: Iterable[Tuple[int, int]]) -> float:
+    """Arm angle in degrees: at an extreme on every beat, swinging between them."""
+    beats = list(beats)
+    if not beats:
+        return 0.0
+    last_ns, count = beats[-1]
+    side = 1.0 if count % 2 else -1.0
+    if len(beats) < 2:
+        return side * MAX_SWING_DEG
+    interval = max(1, last_ns - beats[-2][0])
+    phase = min(1.0, max(0.0, (now_ns - last_ns) / interval))
+    return side * MAX_SWING_DEG * math.cos(math.pi * phase)
+
+
+class MetronomeVisual(QtWidgets.QWidget):
+    """Pendulum, beat LEDs and accent flash in a single painted widget."""
+
+    def __init__(self, parent=None, clock: Callable[[], int] = time.perf_counter_ns):
+        super().__init__(parent)
+        self._clock = clock
+        self._pulses = 0
+        self._accents = frozenset()
+        self._hits: List[Optional[Tuple[int, bool]]] = []
+        # Beats rendered ahead of time wait here until they are heard.
+        self._pending: deque = deque()
+        self._beats: deque = deque(maxlen=2)
+        self._beat_count = 0
+        self._accent_ns: Optional[int] = None
+        self.setMinimumHeight(200)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self._timer.setInterval(FRAME_INTERVAL_MS)
+        self._timer.timeout.connect(self._frame)
+
+        # Painting resources are built once, not per frame.
+        self._led_color = QtGui.QColor(LED_COLOR)
+        self._flash_color = QtGui.QColor(ACCENT_FLASH_COLOR)
+        self._body_pen = QtGui.QPen(QtGui.QColor("#2D1E19"), 2)
+        self._arm_pen = QtGui.QPen(QtGui.QColor("#B0BEC5"), 4)
+        self._accent_arm_pen = QtGui.QPen(QtGui.QColor("#FFD447"), 4)
+        self._body = QtGui.QPolygon()
+        self._body_brush = QtGui.QBrush()
+
+    @property
+    def pulses(self) -> int:
+        return self._pulses
+
+    def set_pattern(self, pulses: int, accents: Iterable[int]) -> None:
+        """Show ``pulses`` LEDs; accented pulses rest brighter."""
+        self._pulses = max(0, int(pulses))
+        self._accents = frozenset(accents)
+        self._hits = [None] * self._pulses
+        self.stop()
+
+    def beat(self, beat_index: int, is_accent: bool, when_ns: Optional[int] = None) -> None:
+        """Queue a beat heard at ``when_ns`` (default: now)."""
+        self._pending.append((self._clock() if when_ns is None else int(when_ns), beat_index, bool(is_accent)))
+        if not self._timer.isActive():
+            self._timer.start()
+            self._frame()
+
+    def stop(self) -> None:
+        self._timer.stop()
+        self._pending.clear()
+        self._beats.clear()
+        self._accent_ns = None
+        self.update()
+
+    def is_animating(self) -> bool:
+        return self._timer.isActive()
+
+    def _frame(self) -> None:
+        now = self._clock()
+        while self._pending and self._pending[0][0] <= now:
+            when_ns, beat_index, is_accent = self._pending.popleft()
+            if self._pulses:
+                self._hits[beat_index % self._pulses] = (when_ns, is_accent)
+            self._beats.append((when_ns, self._beat_count))
+            self._beat_count += 1
+            if is_accent:
+                self._accent_ns = when_ns
+        if not self._pending and self._idle(now):
+            self._timer.stop()
+        self.update()
+
+    def _idle(self, now: int) -> bool:
+        """True once the last beat has faded and the pendulum has come to rest."""
+        if not self._beats:
+            return True
+        last_ns = self._beats[-1][0]
+        settle = LED_FLASH_NS
+        if len(self._beats) == 2:
+            settle = max(settle, last_ns - self._beats[0][0])
+        return now - last_ns > settle
+
+    def resizeEvent(self, event: QtGui.QResizeEvent) -> None:
+        w, h = self.width(), self.height()
+        base_width = int(w * 0.5)
+        base_height = int(h * 0.6)
+        left = (w - base_width) // 2
+        right = left + base_width
+        top = int(h * 0.1)
+        mid = (left + right) // 2
+        self._body = QtGui.QPolygon([
+            QtCore.QPoint(mid - base_width // 4, top),
+            QtCore.QPoint(right, base_height),
+            QtCore.QPoint(left, base_height),
+        ])
+        gradient = QtGui.QLinearGradient(left, top, right, base_height)
+        gradient.setColorAt(0.0, QtGui.QColor("#5D4037"))
+        gradient.setColorAt(1.0, QtGui.QColor("#3E2723"))
+        self._body_brush = QtGui.QBrush(gradient)
+        super().resizeEvent(event)
+
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        now = self._clock()
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
+        w, h = self.width(), self.height()
+
+        if self._accent_ns is not None and 0 <= now - self._accent_ns < ACCENT_FLASH_NS:
+            self._flash_color.setAlphaF(0.6 * (1.0 - (now - self._accent_ns) / ACCENT_FLASH_NS))
+            painter.fillRect(self.rect(), self._flash_color)
+
+        painter.setBrush(self._body_brush)
+        painter.setPen(self._body_pen)
+        painter.drawPolygon(self._body)
+
+        angle = math.radians(pendulum_angle(now, self._beats))
+        top = int(h * 0.1)
+        pivot = QtCore.QPoint(w // 2, top + int(h * 0.05))
+        arm_length = int(h * 0.45)
+        end = QtCore.QPoint(
+            pivot.x() + int(math.sin(angle) * arm_length),
+            pivot.y() + int(math.cos(angle) * arm_length),
+        )
+        accent_now = self._accent_ns is not None and 0 <= now - self._accent_ns < LED_FLASH_NS
+        pen = self._accent_arm_pen if accent_now else self._arm_pen
+        painter.setPen(pen)
+        painter.drawLine(pivot, end)
+        painter.setBrush(pen.color())
+        painter.setPen(QtCore.Qt.NoPen)
+        painter.drawEllipse(end, 7, 7)
+
+        if self._pulses:
+            spacing = min(30, max(4, (w - 20) // self._pulses))
+            diameter = max(3, min(24, spacing - 6))
+            x = (w - spacing * self._pulses) // 2 + (spacing - diameter) // 2
+            y = h - diameter - 10
+            painter.setBrush(self._led_color)
+            for i, hit in enumerate(self._hits):
+                rest = LED_ACCENT_REST_LEVEL if i in self._accents else LED_REST_LEVEL
+                painter.setOpacity(led_level(now, hit, rest))
+                painter.drawEllipse(x + i * spacing, y, diameter, diameter)
+            painter.setOpacity(1.0)
+        painter.end()
@@ -0,0 +1,187 @@
+import sys
+import types
+
+from PyQt5.QtCore import Qt
+
+import ui.widgets.detail as detail_mod
+import ui.widgets.master as master_mod
+
+
+class DummyItem:
+    def __init__(self, text):
+        self._text = text
+        self._flags = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+        self._data = {}
+
+    def text(self):
+        return self._text
+
+    def flags(self):
+        return self._flags
+
+    def setFlags(self, flags):
+        self._flags = flags
+
+    def setForeground(self, brush):
+        pass
+
+    def setData(self, role, value):
+        self._data[role] = value
+
+    def data(self, role):
+        return self._data.get(role)
+
+
+class DummyMasterList:
+    def __init__(self):
+        self._items = []
+        self._current = None
+
+    def currentItem(self):
+        return self._current
+
+    def count(self):
+        return len(self._items)
+
+    def clear(self):
+        self._items.clear()
+        self._current = None
+
+    def addItem(self, item):
+        self._items.append(item)
+
+    def setCurrentItem(self, item):
+        self._current = item
+
+    def item(self, index):
+        return self._items[index]
+
+
+class DummySearchBar:
+    def __init__(self, text=""):
+        self._text = text
+
+    def text(self):
+        return self._text
+
+
+class DummyDB:
+    def __init__(self, count):
+        self.lessons = [(n, f"Lesson {n}") for n in range(1, count + 1)]
+
+    def fetch_lessons(self, query):
+        if query is None:
+            return list(self.lessons)
+        return [lesson for lesson in self.lessons if query in lesson[1]]
+
+
+class DummyApp:
+    def __init__(self):
+        self.search_bar = DummySearchBar()
+        self.master_list = DummyMasterList()
+
+
+class FakeTimer:
+    """Collects ``QTimer.singleShot`` callbacks so a test can run the event loop by hand."""
+
+    pending = []
+
+    @classmethod
+    def singleShot(cls, msec, callback):
+        cls.pending.append(callback)
+
+    @classmethod
+    def run_one(cls):
+        cls.pending.pop(0)()
+
+
+def _patch(monkeypatch):
+    FakeTimer.pending = []
+    monkeypatch.setattr(master_mod, "QListWidgetItem", DummyItem)
+    monkeypatch.setattr(master_mod, "QTimer", FakeTimer)
+
+
+def test_skeleton_rows_are_not_selectable_and_list_waits_for_the_db(monkeypatch):
+    _patch(monkeypatch)
+    app = DummyApp()
+    app.db = None
+    master_mod.show_master_skeleton(app)
+    assert app.master_list.count() == master_mod.SKELETON_ROWS
+    assert all(app.master_list.item(i).flags() == Qt.NoItemFlags for i in range(app.master_list.count()))
+
+    # A search typed before the database is open leaves the skeleton alone.
+    master_mod.update_master_list(app)
+    assert app.master_list.count() == master_mod.SKELETON_ROWS
+
+
+def test_chunked_fill_adds_lessons_from_the_event_loop(monkeypatch):
+    _patch(monkeypatch)
+    app = DummyApp()
+    app.db = DummyDB(25)
+    done = []
+
+    master_mod.update_master_list(app, chunk_size=10, on_done=lambda: done.append(True))
+    assert app.master_list.count() == 10
+    FakeTimer.run_one()
+    assert app.master_list.count() == 20 and not done
+    FakeTimer.run_one()
+    assert app.master_list.count() == 25
+    assert done == [True] and not FakeTimer.pending
+    assert app.master_list.item(24).data(Qt.UserRole) == 25
+
+
+def test_a_newer_search_cancels_a_running_fill(monkeypatch):
+    _patch(monkeypatch)
+    app = DummyApp()
+    app.db = DummyDB(25)
+    master_mod.update_master_list(app, chunk_size=10)
+
+    app.search_bar = DummySearchBar("Lesson 2")
+    master_mod.update_master_list(app)
+    matching = app.master_list.count()
+    while FakeTimer.pending:
+        FakeTimer.run_one()
+    assert app.master_list.count() == matching == 7  # 2 and 20..25
+
+
+class FakeVideoWidget:
+    def __init__(self):
+        self.visible = False
+
+    def show(self):
+        self.visible = True
+
+
+class FakeLayout:
+    def __init__(self):
+        self.inserted = []
+
+    def insertWidget(self, index, widget, stretch):
+        self.inserted.append((index, widget, stretch))
+
+
+class FakeMediaPlayer:
+    def __init__(self):
+        self.output = None
+
+    def setVideoOutput(self, widget):
+        self.output = widget
+
+
+def test_video_widget_is_created_on_first_use_only(monkeypatch):
+    fake_module = types.ModuleType("PyQt5.QtMultimediaWidgets")
+    fake_module.QVideoWidget = FakeVideoWidget
+    monkeypatch.setitem(sys.modules, "PyQt5.QtMultimediaWidgets", fake_module)
+    monkeypatch.setattr(detail_mod, "_should_use_vlc_backend", lambda: False)
+
+    app = types.SimpleNamespace(
+        video_widget=None, vlc_player=None,
+        video_layout=FakeLayout(), media_player=FakeMediaPlayer(),
+    )
+    widget = detail_mod.ensure_video_output(app)
+    assert isinstance(widget, FakeVideoWidget)
+    assert app.media_player.output is widget
+    assert app.video_layout.inserted == [(1, widget, 5)]
+
+    assert detail_mod.ensure_video_output(app) is widget
+    assert len(app.video_layout.inserted) == 1
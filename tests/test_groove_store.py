@@ -0,0 +1,73 @@
+import json
+import multiprocessing
+import os
+
+import pytest
+
+from metronome.groove_store import GrooveStore, GrooveStoreError, get_store
+
+
+def _save_many(path, prefix, count):
+    store = GrooveStore(path)
+    for i in range(count):
+        store.save(f"{prefix}{i}", {"pulses": 4, "accents": [0], "swing": False})
+
+
+def test_reads_are_cached_until_the_file_changes(tmp_path):
+    path = tmp_path / "grooves.json"
+    path.write_text(json.dumps({"a": {"pulses": 3, "accents": [0]}, "broken": {"pulses": 2}}))
+    store = GrooveStore(str(path))
+
+    for _ in range(100):
+        assert list(store.presets()) == ["a"]
+    assert store.reads == 1
+
+    # Another writer replaces the file: the next read picks it up.
+    other = GrooveStore(str(path))
+    other.save("b", {"pulses": 5, "accents": [0, 3]})
+    assert sorted(store.presets()) == ["a", "b"]
+    assert store.reads == 2
+    # The raw entry lacking "accents" is kept in the file.
+    assert "broken" in store.load()
+
+
+def test_save_and_delete_write_atomically(tmp_path):
+    path = tmp_path / "grooves.json"
+    store = GrooveStore(str(path))
+    store.save("x", {"pulses": 2, "accents": [0]})
+
+    assert json.loads(path.read_text()) == {"x": {"pulses": 2, "accents": [0]}}
+    assert store.delete("x") is True
+    assert store.delete("x") is False
+    assert json.loads(path.read_text()) == {}
+    # No temporary files are left behind.
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["grooves.json", "grooves.json.lock"]
+
+
+def test_invalid_json_raises_on_read_but_is_replaced_on_write(tmp_path):
+    path = tmp_path / "grooves.json"
+    path.write_text("groove-content")
+    store = GrooveStore(str(path))
+
+    with pytest.raises(GrooveStoreError):
+        store.presets()
+    store.save("x", {"pulses": 2, "accents": [0]})
+    assert list(store.presets()) == ["x"]
+
+
+def test_concurrent_writers_do_not_lose_grooves(tmp_path):
+    path = str(tmp_path / "grooves.json")
+    ctx = multiprocessing.get_context("spawn" if os.name == "nt" else "fork")
+    procs = [ctx.Process(target=_save_many, args=(path, prefix, 40)) for prefix in ("tap", "metro")]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join(30)
+
+    assert all(proc.exitcode == 0 for proc in procs)
+    assert len(GrooveStore(path).load()) == 80
+
+
+def test_get_store_is_shared_per_path(tmp_path):
+    path = str(tmp_path / "grooves.json")
+    assert get_store(path) is get_store(os.path.join(str(tmp_path), ".", "grooves.json"))
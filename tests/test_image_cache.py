@@ -0,0 +1,60 @@
+import os
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage
+from PyQt5.QtWidgets import QApplication
+
+from core.image_cache import RESOURCES_DIR, ImageCache, bucket_size, resource_path
+
+app = QApplication.instance() or QApplication([])
+
+
+def _cache(tmp_path, **kwargs):
+    image = QImage(400, 200, QImage.Format_RGB32)
+    image.fill(Qt.red)
+    image.save(str(tmp_path / "logo.png"))
+    return ImageCache(resource_dir=tmp_path, **kwargs)
+
+
+def test_resource_paths_do_not_depend_on_the_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = resource_path("bouzouki.png")
+    assert os.path.isabs(path) and os.path.exists(path)
+    assert RESOURCES_DIR.name == "resources"
+
+
+def test_bucket_size_rounds_down_to_the_bucket():
+    assert bucket_size(303, 16) == 288
+    assert bucket_size(5, 16) == 16
+    assert bucket_size(303, 1) == 303
+
+
+def test_nearby_sizes_share_one_scaled_pixmap_and_decode_once(tmp_path):
+    cache = _cache(tmp_path)
+    first = cache.pixmap("logo.png", 300, 300, bucket=16)
+    second = cache.pixmap("logo.png", 302, 303, bucket=16)
+    assert first.cacheKey() == second.cacheKey()
+    assert (first.width(), first.height()) == (288, 144)
+    assert cache.misses == 1 and cache.hits == 1
+
+    assert cache.pixmap("logo.png", height=30).height() == 30
+    cache.icon("logo.png")
+    assert cache.decodes == 1
+
+
+def test_scaled_variants_are_evicted_least_recently_used_first(tmp_path):
+    cache = _cache(tmp_path, maxsize=2)
+    cache.pixmap("logo.png", 100, 100)
+    cache.pixmap("logo.png", 200, 200)
+    cache.pixmap("logo.png", 100, 100)  # refresh
+    cache.pixmap("logo.png", 300, 300)  # evicts 200
+    misses = cache.misses
+    cache.pixmap("logo.png", 100, 100)
+    assert cache.misses == misses
+    cache.pixmap("logo.png", 200, 200)
+    assert cache.misses == misses + 1
+
+
+def test_missing_resource_gives_a_null_pixmap(tmp_path):
+    cache = _cache(tmp_path)
+    assert cache.pixmap("missing.png", 50, 50).isNull()
@@ -0,0 +1,167 @@
+import sqlite3
+
+import pytest
+
+from core.beat_grid import BeatGrid, LessonSync
+from core.tempo_detection import (
+    TempoEstimate,
+    ensure_tempo_columns,
+    lesson_beat_grid,
+    set_beat_offset,
+    store_detected_tempo,
+)
+
+MS = 1_000_000  # ns
+
+
+def test_beat_grid_positions_from_offset_and_tempo():
+    grid = BeatGrid(120, offset_ms=250)
+
+    assert grid.beat_ms == 500
+    assert grid.next_beat(250) == (0, 250)
+    assert grid.next_beat(251) == (1, 750)
+    # Before the first beat the grid extends backwards.
+    assert grid.next_beat(0) == (0, 250)
+    assert grid.next_beat(-300) == (-1, -250)
+    with pytest.raises(ValueError):
+        BeatGrid(0)
+
+
+def test_deadlines_are_scaled_by_playback_speed():
+    sync = LessonSync(BeatGrid(100, offset_ms=0))  # 600 ms per beat
+
+    first = sync.update(1000, 0.5, now_ns=0)
+    # Next beat at 1200 ms on the timeline: 200 ms away, 400 ms at half speed.
+    assert first.beat == 2
+    assert first.deadline_ns == 400 * MS
+    assert first.bpm == 50
+
+    # Steady playback at half speed stays aligned.
+    assert sync.update(1100, 0.5, now_ns=200 * MS) is None
+    assert sync.realignments == 1
+
+
+def test_seek_loop_back_and_speed_change_realign():
+    sync = LessonSync(BeatGrid(120, offset_ms=100))
+    sync.update(0, 1.0, now_ns=0)
+
+    # Small report jitter is tolerated.
+    assert sync.update(1010, 1.0, now_ns=1000 * MS) is None
+
+    # A-B loop jumps back from 4000 ms to 1300 ms.
+    loop = sync.update(1300, 1.0, now_ns=4000 * MS)
+    assert (loop.beat, loop.deadline_ns) == (3, 4000 * MS + 300 * MS)
+
+    # Speed slider moved to 0.8x: the audible tempo follows.
+    slower = sync.update(1400, 0.8, now_ns=4100 * MS)
+    assert slower.bpm == pytest.approx(96)
+    assert slower.deadline_ns == 4100 * MS + 250 * MS
+
+    sync.reset()
+    assert sync.update(1400, 0.8, now_ns=5000 * MS) is not None
+
+
+def test_beat_offset_is_stored_with_detected_tempo():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE lessons (file_path TEXT PRIMARY KEY, tempo INTEGER)")
+    conn.executemany(
+        "INSERT INTO lessons (file_path, tempo) VALUES (?, ?)",
+        [("/a.mp3", None), ("/b.mp3", 90), ("/c.mp3", None)],
+    )
+    ensure_tempo_columns(conn)
+    store_detected_tempo(conn, "/a.mp3", TempoEstimate(bpm=120.2, confidence=0.9, first_beat_ms=312.4))
+
+    assert lesson_beat_grid(conn, "/a.mp3") == (120, 312)
+    # A manual tempo has no offset until the user sets one.
+    assert lesson_beat_grid(conn, "/b.mp3") == (90, 0)
+    set_beat_offset(conn, "/b.mp3", 1480)
+    assert lesson_beat_grid(conn, "/b.mp3") == (90, 1480)
+    assert lesson_beat_grid(conn, "/c.mp3") is None
+    assert lesson_beat_grid(conn, "/missing.mp3") is None
+
+
+def test_tempo_schema_is_migrated_once_per_connection():
+    from types import SimpleNamespace
+
+    from ui.lesson_sync import _current_grid, _ensure_tempo_schema
+
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE lessons (file_path TEXT PRIMARY KEY, tempo INTEGER)")
+    conn.execute("INSERT INTO lessons VALUES ('/a.mp3', 100)")
+    statements = []
+    conn.set_trace_callback(statements.append)
+    app = SimpleNamespace(db=SimpleNamespace(conn=conn), current_file_path="/a.mp3")
+
+    assert _ensure_tempo_schema(app) and _ensure_tempo_schema(app)
+    for _ in range(3):
+        assert _current_grid(app).tempo_bpm == 100
+    assert sum("PRAGMA" in s for s in statements) == 1
+    assert not any(s.startswith(("ALTER", "COMMIT")) for s in statements[-3:])
+
+
+class _Signal:
+    def __init__(self):
+        self.slots = []
+
+    def connect(self, slot):
+        self.slots.append(slot)
+
+
+class _FakeMediaPlayer:
+    def __init__(self, rate):
+        self.rate = rate
+        self.positionChanged = _Signal()
+        self.stateChanged = _Signal()
+
+    def state(self):
+        from PyQt5.QtMultimedia import QMediaPlayer
+
+        return QMediaPlayer.PlayingState
+
+    def playbackRate(self):
+        return self.rate
+
+
+class _FakeMetronome:
+    def __init__(self):
+        self.synced = []
+
+    def sync_to(self, deadline_ns, beat, bpm):
+        self.synced.append((deadline_ns, beat, bpm))
+
+    def stop(self):
+        self.stopped = True
+
+
+def test_synced_tempo_follows_the_qt_rate_including_transposition():
+    from types import SimpleNamespace
+
+    from ui.lesson_sync import LessonBeatSync
+
+    # Qt backend: +2 semitones raise playbackRate by 2 ** (2 / 12).
+    rate = 1.0 * 2 ** (2 / 12)
+    app = SimpleNamespace(
+        current_speed=1.0, transpose_steps=2, vlc_player=None,
+        media_player=_FakeMediaPlayer(rate),
+    )
+    metronome = _FakeMetronome()
+    sync = LessonBeatSync(app, BeatGrid(120, offset_ms=0), metronome, clock=lambda: 0)
+
+    sync.on_position(0)
+    assert metronome.synced[-1][2] == pytest.approx(120 * rate)
+
+    # With VLC, pitch is shifted separately and the speed is the rate.
+    app.vlc_player = object()
+    sync.sync.reset()
+    sync.on_position(0)
+    assert metronome.synced[-1][2] == pytest.approx(120)
+
+
+def test_sync_actions_wait_for_the_database():
+    from types import SimpleNamespace
+
+    from ui.lesson_sync import _current_grid
+
+    # Set by init_master_detail until the deferred open finishes.
+    app = SimpleNamespace(db=None, current_file_path="/lesson.mp3")
+    assert _current_grid(app) is None
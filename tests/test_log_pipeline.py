@@ -0,0 +1,119 @@
+import json
+import logging
+import threading
+import types
+
+import pytest
+
+from core.log_pipeline import (
+    flush_logging,
+    levels_from,
+    log_context,
+    bind_log_context,
+    new_correlation_id,
+    parse_levels,
+    player_callback,
+    start_logging,
+    stop_logging,
+)
+
+
+class DictSettings:
+    def __init__(self, values):
+        self.values = values
+
+    def value(self, key, default=None):
+        return self.values.get(key, default)
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "app.log"
+    yield path
+    stop_logging()
+    logging.getLogger("ui").setLevel(logging.NOTSET)
+
+
+def _records(path):
+    flush_logging()
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_records_are_json_lines_with_correlation_ids(log_file):
+    start_logging(str(log_file), 1_000_000, 1)
+    log = logging.getLogger("ui.searchUpdateDatabase")
+    with log_context(scan_id="scan-1"):
+        log.error("scan failed for %s", "a.mp4")
+    log.error("outside")
+
+    first, second = _records(log_file)
+    assert first["msg"] == "scan failed for a.mp4"
+    assert first["level"] == "ERROR" and first["logger"] == "ui.searchUpdateDatabase"
+    assert first["scan_id"] == "scan-1"
+    assert "scan_id" not in second
+
+
+def test_exceptions_are_logged_from_other_threads_with_their_context(log_file):
+    start_logging(str(log_file), 1_000_000, 1)
+
+    def callback():
+        bind_log_context(playback_id="pb-7")
+        try:
+            raise RuntimeError("vlc event failed")
+        except RuntimeError:
+            logging.getLogger("core.vlc_player").exception("VLC callback error")
+
+    thread = threading.Thread(target=callback, name="vlc-events")
+    thread.start()
+    thread.join()
+
+    (record,) = _records(log_file)
+    assert record["thread"] == "vlc-events" and record["playback_id"] == "pb-7"
+    assert record["msg"] == "VLC callback error"
+    assert "RuntimeError: vlc event failed" in record["exc"]
+
+
+def test_player_callbacks_on_foreign_threads_carry_the_current_playback_id(log_file):
+    start_logging(str(log_file), 1_000_000, 1)
+    player = types.SimpleNamespace(playback_id=None)
+    on_event = player_callback(player, lambda event: logging.getLogger("core.vlc_player").error(event))
+
+    def libvlc_thread(event):
+        thread = threading.Thread(target=on_event, args=(event,), name="libvlc-events")
+        thread.start()
+        thread.join()
+
+    # The GUI thread's own context is not visible on libvlc's thread.
+    with log_context(playback_id="gui-only"):
+        libvlc_thread("before playback")
+    player.playback_id = "pb-1"
+    libvlc_thread("opening")
+    player.playback_id = "pb-2"
+    libvlc_thread("next lesson")
+
+    records = _records(log_file)
+    assert [r["msg"] for r in records] == ["before playback", "opening", "next lesson"]
+    assert [r.get("playback_id") for r in records] == [None, "pb-1", "pb-2"]
+    assert {r["thread"] for r in records} == {"libvlc-events"}
+
+
+def test_per_module_levels(log_file):
+    start_logging(str(log_file), 1_000_000, 1, levels=parse_levels("WARNING,ui=DEBUG"))
+    logging.getLogger("ui.widgets.detail").debug("verbose ui")
+    logging.getLogger("metronome.engine").info("hidden")
+    logging.getLogger("metronome.engine").warning("shown")
+
+    assert [r["msg"] for r in _records(log_file)] == ["verbose ui", "shown"]
+
+
+def test_level_specs_from_settings_and_cli():
+    assert parse_levels("info, ui.widgets=DEBUG, bogus=LOUD") == {"": logging.INFO, "ui.widgets": logging.DEBUG}
+    settings = DictSettings({"log_levels": "WARNING,ui=INFO"})
+    levels = levels_from(settings, ["main.py", "--log-level=ui=DEBUG"])
+    assert levels == {"": logging.WARNING, "ui": logging.DEBUG}
+    assert levels_from(None, []) == {}
+
+
+def test_correlation_ids_are_short_and_unique():
+    ids = {new_correlation_id() for _ in range(100)}
+    assert len(ids) == 100 and all(len(i) == 12 for i in ids)
@@ -1,6 +1,7 @@
 import logging
 from pathlib import Path
 
+from core.log_pipeline import flush_logging
 from main import configure_logging
 
 
@@ -15,6 +16,8 @@ def test_configure_logging_rotates_log_file(tmp_path):
     # Write enough log entries to exceed max_bytes
     for i in range(100):
         logger.error("This is a test log message number %d", i)
+    # Records are written by a background listener thread.
+    flush_logging()
 
     # Base log file should exist
     assert log_file.exists()
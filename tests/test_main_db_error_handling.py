@@ -3,6 +3,15 @@ import sqlite3
 import pytest
 
 import main as main_mod
+from core.log_pipeline import stop_logging
+
+
+@pytest.fixture(autouse=True)
+def _log_to_tmp_path(tmp_path, monkeypatch):
+    # main() starts the JSON log pipeline; keep its file out of the repo.
+    monkeypatch.setattr(main_mod, "LOG_FILE", str(tmp_path / "bouzouki_player.log"))
+    yield
+    stop_logging()
 
 
 def test_main_handles_db_error_gracefully(monkeypatch, capsys):
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from metronome.automation import TempoAutomation
+from metronome.bars import BarCache, BarLoopSource
+from metronome.engine import MixRing
+from metronome.samples import synth_click
+
+SR = 8000
+
+
+def test_curves_reach_the_target_and_hold_it():
+    linear = TempoAutomation(100, 120, bars=10)
+    assert [linear.bpm_at_bar(b) for b in (0, 1, 5, 10, 50)] == [100, 102, 110, 120, 120]
+
+    stepped = TempoAutomation(100, 120, bars=10, kind="stepped", every_bars=4)
+    assert [stepped.bpm_at_bar(b) for b in range(9)] == [100] * 4 + [108] * 4 + [116]
+
+    expo = TempoAutomation(80, 160, bars=4, kind="exponential")
+    # Equal ratios per bar: 80 * 2 ** (b / 4).
+    assert [expo.bpm_at_bar(b) for b in range(5)] == [80, 95.14, 113.14, 134.54, 160]
+
+    slower = TempoAutomation(120, 90, bars=3)
+    assert slower.bpm_at_bar(3) == 90
+    with pytest.raises(ValueError):
+        TempoAutomation(100, 120, bars=4, kind="sine")
+
+
+def test_bar_loop_applies_each_bar_tempo_at_the_bar_line():
+    regular = synth_click(440, 0.5, SR)[:40]
+    source = BarLoopSource(4, [0], False, 60, regular, regular, sound_key="t", sample_rate=SR, cache=BarCache())
+    source.set_automation(TempoAutomation(60, 120, bars=2))
+    beats, bars = [], []
+    source.on_beat = lambda beat, acc, frame: beats.append(frame)
+    source.on_bar = lambda bar, bpm: bars.append(bpm)
+    source.start_at(0)
+
+    ring = MixRing(SR * 20)
+    for start in range(0, 12 * SR, 1000):  # audio-callback sized chunks
+        source.schedule(ring, start, 1000)
+
+    # Bar 0 at 60 BPM (4 s), bar 1 at 90 BPM, then 120 BPM: every beat on
+    # an exact frame, the change landing on the bar line.
+    expected = [0, 8000, 16000, 24000]
+    expected += [32000 + round(i * SR * 60 / 90) for i in range(4)]
+    bar2 = 32000 + round(4 * SR * 60 / 90)
+    expected += [bar2 + i * 4000 for i in range(4)]
+    assert beats[:12] == expected
+    assert bars[:3] == [90, 120, 120]
+    assert np.all(np.diff(beats) > 0)
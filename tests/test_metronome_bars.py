@@ -0,0 +1,87 @@
+import time
+
+import numpy as np
+
+from metronome.bars import BarCache, BarLoopSource, beat_offsets, render_bar
+from metronome.engine import ClickSequencer, MetronomeEngine
+
+SR = 44100
+
+
+def _click(n=300, value=0.25):
+    return np.linspace(value, 0.0, n, dtype=np.float32)
+
+
+def _render_with(source, seconds, block=256):
+    engine = MetronomeEngine(sample_rate=SR, block_frames=block)
+    beats = []
+    source.on_beat = lambda beat, acc, frame: beats.append((beat, acc, frame))
+    engine.add_source(source)
+    out = np.concatenate([engine.render() for _ in range(int(seconds * SR) // block)])
+    return out, beats
+
+
+def test_looped_bar_matches_per_beat_sequencer():
+    regular, accent = _click(), _click(value=0.5)
+    for pulses, swing in ((3, False), (4, True)):
+        looped, loop_beats = _render_with(
+            BarLoopSource(pulses, [0], swing, 150, regular, accent, sound_key="t", sample_rate=SR,
+                          cache=BarCache()),
+            6,
+        )
+        reference, ref_beats = _render_with(
+            ClickSequencer(pulses, [0], swing, 150, regular, accent, sample_rate=SR), 6,
+        )
+        # These bars are a whole number of samples long, so both grids agree.
+        assert loop_beats == ref_beats
+        np.testing.assert_allclose(looped, reference, atol=1e-6)
+
+
+def test_click_tail_wraps_to_bar_start():
+    bar = render_bar(1, [0], False, 600, _click(n=5000), _click(n=5000), sample_rate=SR)
+
+    assert len(bar.audio) == 4410
+    # The last 590 samples of the click continue at the start of the bar.
+    assert bar.audio[0] == np.float32(0.25) + _click(n=5000)[4410]
+
+
+def test_swing_offsets_follow_rhythm_thread():
+    np.testing.assert_array_equal(beat_offsets(4, True, 60, SR), [0, 29106, 44100, 73206])
+    assert len(render_bar(4, [], True, 60, _click(), _click(), SR).audio) == 2 * SR
+
+
+def test_cache_reuses_rendered_bars_lru():
+    cache = BarCache(maxsize=2)
+    calls = []
+
+    def render(tag):
+        calls.append(tag)
+        return tag
+
+    assert cache.get_or_render("a", lambda: render("a")) == "a"
+    cache.get_or_render("b", lambda: render("b"))
+    cache.get_or_render("a", lambda: render("a"))  # hit, now most recent
+    cache.get_or_render("c", lambda: render("c"))  # evicts "b"
+    cache.get_or_render("b", lambda: render("b"))
+
+    assert calls == ["a", "b", "c", "b"]
+    assert cache.hits == 1
+
+
+def test_tempo_change_swaps_at_next_bar_line():
+    source = BarLoopSource(4, [0], False, 120, _click(), _click(value=0.5), sound_key="t",
+                           sample_rate=SR, cache=BarCache())
+    engine = MetronomeEngine(sample_rate=SR, block_frames=512)
+    frames = []
+    source.on_beat = lambda beat, acc, frame: frames.append(frame)
+    engine.add_source(source)
+
+    engine.render(SR // 2)  # into the first bar (bar = 2 s at 120 BPM)
+    source.set_bpm(60)
+    deadline = time.monotonic() + 2
+    while source._pending is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    engine.render(6 * SR)
+
+    # The first bar finishes at 120 BPM, then every beat is one second.
+    assert frames[:6] == [0, 22050, 44100, 66150, 88200, 88200 + 44100]
@@ -0,0 +1,64 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from metronome.benchmark import main, run_case, summarise
+
+
+def test_summarise_reports_jitter_drift_and_grid_error():
+    interval_s = 0.5
+    intended = [int(i * interval_s * 1e9) for i in range(20)]
+    # 1 ms late at first, 3 ms late at the end: 2 ms of drift.
+    actual = [t + (1_000_000 if i < 10 else 3_000_000) for i, t in enumerate(intended)]
+    report = summarise(intended, actual, interval_s, swing=False)
+    assert report["beats"] == 20
+    assert report["jitter"] == {"mean_ms": 2.0, "p99_ms": 3.0, "max_ms": 3.0}
+    assert report["drift_ms"] == pytest.approx(2.0)
+    assert report["grid_error_ms"] == 0
+
+
+def test_summarise_detects_deadlines_off_the_swing_grid():
+    interval_s = 0.5
+    intended = [0, 330_000_000, 500_000_000, 830_000_000 + 2_000_000]
+    report = summarise(intended, intended, interval_s, swing=True)
+    assert report["grid_error_ms"] == pytest.approx(2.0)
+    assert report["drift_ms"] == 0
+
+
+def test_rhythm_thread_keeps_to_the_grid_headless():
+    report = run_case(300, swing=True, duration_s=1.2)
+    assert report["beats"] >= 5
+    assert report["grid_error_ms"] < 0.001
+    assert report["skipped"] == 0
+    # Generous bound for loaded CI machines; typical p99 is well under 1 ms.
+    assert report["jitter"]["p99_ms"] < 20
+
+
+def test_script_writes_a_json_report(tmp_path):
+    out = tmp_path / "bench.json"
+    assert main(["--minutes", "0.01", "--bpm", "240", "--swing", "off", "--output", str(out)]) == 0
+    report = json.loads(out.read_text())
+    (case,) = report["cases"]
+    assert case["bpm"] == 240 and case["swing"] is False
+    assert {"jitter", "drift_ms", "grid_error_ms", "cpu_percent"} <= set(case)
+
+
+def test_rhythm_thread_pytest_benchmark(request):
+    pytest.importorskip("pytest_benchmark")
+    benchmark = request.getfixturevalue("benchmark")
+    report = benchmark.pedantic(run_case, args=(240, False, 1.0), rounds=1, iterations=1)
+    benchmark.extra_info.update(report)
+    assert report["grid_error_ms"] < 0.001
+
+
+def test_benchmark_runs_without_simpleaudio():
+    # A None entry in sys.modules makes "import simpleaudio" fail.
+    code = (
+        "import sys; sys.modules['simpleaudio'] = None\n"
+        "import metronome.benchmark\n"
+        "assert 'metronome.metronome' not in sys.modules\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,150 @@
+import numpy as np
+import pytest
+
+from metronome.calibration import (
+    MAX_OFFSET_MS,
+    NO_OFFSETS,
+    CalibrationUnavailableError,
+    LatencyOffsets,
+    load_offsets,
+    loopback_lag,
+    loopback_latency_ms,
+    output_device_name,
+    save_offsets,
+    tap_offset,
+    visual_latency_ms,
+)
+from metronome.engine import MetronomeEngine
+from metronome.scheduler import BeatScheduler
+
+MS = 1_000_000
+
+
+class DictSettings:
+    def __init__(self):
+        self.values = {}
+
+    def value(self, key, default=None):
+        return self.values.get(key, default)
+
+    def setValue(self, key, value):
+        self.values[key] = value
+
+
+def _beats(n=20, interval_ms=600, start_ms=1000):
+    return [(start_ms + i * interval_ms) * MS for i in range(n)]
+
+
+def test_tap_offset_is_the_median_lateness_and_ignores_stray_taps():
+    beats = _beats()
+    taps = [b + 42 * MS + (i % 3 - 1) * 4 * MS for i, b in enumerate(beats)]
+    taps.insert(10, beats[9] + 300 * MS)  # half a beat off: ignored
+    result = tap_offset(beats, taps)
+    assert result.offset_ms == pytest.approx(42.0)
+    assert result.taps == len(beats) - 4  # warm-up beats are not scored
+    assert result.spread_ms == pytest.approx(4.0)
+
+
+def test_tap_offset_needs_enough_taps():
+    beats = _beats()
+    assert tap_offset(beats, beats[-3:]) is None
+    assert tap_offset(beats[:1], beats[:1]) is None
+
+
+def test_visual_latency_removes_the_shared_input_delay():
+    # 30 ms input delay in both tests, audio 20 ms, visual 50 ms.
+    assert visual_latency_ms(80.0, audio_tap_ms=50.0, audio_ms=20.0) == pytest.approx(50.0)
+    assert visual_latency_ms(80.0, audio_tap_ms=50.0) == pytest.approx(80.0)
+    assert visual_latency_ms(80.0) == 80.0
+
+
+def test_loopback_lag_finds_a_delayed_noisy_click():
+    rng = np.random.default_rng(1)
+    click = rng.standard_normal(256).astype(np.float32)
+    recorded = 0.01 * rng.standard_normal(8000).astype(np.float32)
+    recorded[3210:3210 + 256] += 0.5 * click
+    assert loopback_lag(click, recorded) == 3210
+    assert loopback_lag(click, 0.01 * rng.standard_normal(8000)) is None
+
+
+class FakeSoundDevice:
+    """A loopback whose recorded delay depends on the stream latency asked for."""
+
+    HIGH_LATENCY_FACTOR = 4
+
+    def __init__(self, output_frames, input_latency_s):
+        self.output_frames = output_frames
+        self.input_latency_s = input_latency_s
+
+    def _input_latency(self, latency):
+        if latency == "low":
+            return self.input_latency_s
+        return self.input_latency_s * self.HIGH_LATENCY_FACTOR
+
+    def playrec(self, signal, samplerate, channels, dtype, device, blocking, latency="high"):
+        round_trip = self.output_frames + int(round(self._input_latency(latency) * samplerate))
+        out = np.zeros((len(signal), channels), dtype=np.float32)
+        out[round_trip:, 0] = signal[:len(signal) - round_trip]
+        return out
+
+    def query_devices(self, device=None, kind=None):
+        return {
+            "name": "USB Audio",
+            "default_low_input_latency": self._input_latency("low"),
+            "default_high_input_latency": self._input_latency("high"),
+        }
+
+
+def test_loopback_latency_subtracts_the_input_latency():
+    click = np.random.default_rng(2).standard_normal(200).astype(np.float32)
+    # 950 output frames at 10 kHz; the subtracted input latency must be the
+    # one of the stream that actually recorded.
+    sd = FakeSoundDevice(output_frames=950, input_latency_s=0.005)
+    assert loopback_latency_ms(click, 10000, sd_module=sd) == pytest.approx(95.0)
+    assert output_device_name(sd) == "USB Audio"
+
+
+def test_loopback_without_a_recording_raises():
+    class Broken(FakeSoundDevice):
+        def playrec(self, *args, **kwargs):
+            raise OSError("no input device")
+
+    with pytest.raises(CalibrationUnavailableError):
+        loopback_latency_ms(np.ones(10, dtype=np.float32), 10000, sd_module=Broken(0, 0.0))
+
+
+def test_offsets_are_stored_per_device_and_clamped():
+    settings = DictSettings()
+    save_offsets(settings, "hw:1/USB", LatencyOffsets(12.34, 900.0, -5.0))
+    assert load_offsets(settings, "hw:1/USB") == LatencyOffsets(12.3, MAX_OFFSET_MS, 0.0)
+    assert load_offsets(settings, "Built-in") == NO_OFFSETS
+    settings.values["latency/Built-in/audio_ms"] = "garbage"
+    assert load_offsets(settings, "Built-in") == NO_OFFSETS
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000 * MS
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += int(seconds * 1e9) + 100_000
+
+
+def test_scheduler_lead_wakes_before_each_deadline():
+    clock = FakeClock()
+    sched = BeatScheduler(0.5, clock=clock, sleep=clock.sleep, lead_ns=40 * MS)
+    sched.start(clock.now + 100 * MS)
+    deadline = sched.next_deadline_ns()
+    sched.wait()
+    assert deadline - 40 * MS <= clock.now < deadline - 39 * MS
+    assert sched.is_due()
+
+
+def test_engine_latency_correction_delays_beat_timestamps():
+    engine = MetronomeEngine(sample_rate=1000)
+    engine.mark_output(0, 0)
+    engine.latency_correction_ns = 25 * MS
+    assert engine.frame_time_ns(100) == 125 * MS
@@ -0,0 +1,90 @@
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication
+
+import ui.widgets.detail as detail_mod
+import ui.menu_bar as menu_mod
+
+
+def _ensure_qapp():
+    return QApplication.instance() or QApplication([])
+
+
+class StubItem:
+    def __init__(self, path):
+        self._path = path
+
+    def data(self, role):
+        if role == Qt.UserRole:
+            return self._path
+        return None
+
+
+class StubDB:
+    def get_practice_preset(self, file_path):
+        return None
+
+    def get_lesson_metadata(self, file_path):
+        return {"lesson_name": "Test", "tempo": 96, "tags": "Zeibekiko 9/8"}
+
+
+class DummyLabel:
+    def __init__(self):
+        self.last = None
+
+    def setText(self, text):
+        self.last = text
+
+
+class HostApp:
+    """App exposing an in-process metronome host like LessonPlayerApp."""
+
+    def __init__(self):
+        self.db = StubDB()
+        self.practice_status_label = DummyLabel()
+        self.shown = []
+
+    def show_metronome(self, tempo=None, groove=None):
+        self.shown.append((tempo, groove))
+
+
+def _no_popen(*args, **kwargs):
+    raise AssertionError("metronome must not be started as a subprocess")
+
+
+def test_open_metronome_for_item_uses_in_process_host(monkeypatch):
+    _ensure_qapp()
+    monkeypatch.setattr(detail_mod.subprocess, "Popen", _no_popen)
+    app = HostApp()
+
+    detail_mod.open_metronome_for_item(app, StubItem("/tmp/example.mp3"))
+
+    assert app.shown == [(96, "Zeibekiko 9/8")]
+    assert "96" in app.practice_status_label.last
+
+
+def test_open_metronome_from_menu_uses_in_process_host(monkeypatch):
+    class FakeSettings:
+        def value(self, key, default=None):
+            return {"metronome_default_tempo": "110"}.get(key, default)
+
+    monkeypatch.setattr(menu_mod, "QSettings", lambda *a, **k: FakeSettings())
+    monkeypatch.setattr(menu_mod.subprocess, "Popen", _no_popen)
+    app = HostApp()
+
+    menu_mod.open_metronome_from_menu(app)
+
+    assert app.shown == [(110, None)]
+
+
+def test_host_import_error_is_reported_not_raised(monkeypatch):
+    _ensure_qapp()
+    warnings = []
+    monkeypatch.setattr(detail_mod.QMessageBox, "warning", lambda *a, **k: warnings.append(a))
+
+    class BrokenHost(HostApp):
+        def show_metronome(self, tempo=None, groove=None):
+            raise ImportError("No module named 'simpleaudio'")
+
+    detail_mod.open_metronome_for_item(BrokenHost(), StubItem("/tmp/example.mp3"))
+
+    assert warnings and "simpleaudio" in warnings[0][2]
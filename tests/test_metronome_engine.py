@@ -0,0 +1,104 @@
+import sys
+
+import numpy as np
+import pytest
+
+from metronome import engine as engine_mod
+from metronome.engine import (
+    AudioEngineUnavailableError,
+    ClickSequencer,
+    MetronomeEngine,
+    MixRing,
+    NullSink,
+    pcm_to_float,
+)
+
+SR = 44100
+
+
+def _click(n=200, value=0.5):
+    return np.full(n, value, dtype=np.float32)
+
+
+def _onsets(signal):
+    """Frames where the signal goes from silence to sound."""
+    nonzero = signal != 0
+    return np.flatnonzero(nonzero & ~np.concatenate(([False], nonzero[:-1])))
+
+
+def test_mix_ring_wraps_and_clears_blocks():
+    ring = MixRing(capacity=8)
+    ring.read(5)
+    ring.add(6, np.ones(4, dtype=np.float32))  # wraps past the buffer end
+    ring.add(7, np.ones(1, dtype=np.float32))
+    ring.add(4, np.full(3, 2.0, dtype=np.float32))  # first frame already played
+
+    np.testing.assert_array_equal(ring.read(6), [2, 3, 2, 1, 1, 0])
+    # Slots were cleared after reading and can be reused.
+    np.testing.assert_array_equal(ring.read(8), np.zeros(8))
+
+
+def test_clicks_land_on_exact_frames_across_block_boundaries():
+    engine = MetronomeEngine(sample_rate=SR, block_frames=256)
+    seq = ClickSequencer(4, [0], False, 300, _click(value=0.25), _click(value=0.5), sample_rate=SR)
+    beats = []
+    seq.on_beat = lambda beat, acc, frame: beats.append((beat, acc, frame))
+    engine.add_source(seq)
+
+    out = NullSink(engine).pump(blocks=SR * 10 // 256)  # ~10 s at 300 BPM
+
+    expected = [int(round(n * SR * 60 / 300)) for n in range(len(beats))]
+    assert [frame for _, _, frame in beats] == expected
+    np.testing.assert_array_equal(_onsets(out), expected)
+    assert [b for b, _, _ in beats[:5]] == [0, 1, 2, 3, 0]
+    assert out[expected[0]] == 0.5 and out[expected[1]] == 0.25
+
+
+def test_bpm_change_applies_from_next_beat_and_keeps_grid():
+    engine = MetronomeEngine(sample_rate=SR, block_frames=512)
+    seq = ClickSequencer(4, [], False, 120, _click(), _click(), sample_rate=SR)
+    frames = []
+    seq.on_beat = lambda beat, acc, frame: frames.append(frame)
+    engine.add_source(seq)
+
+    engine.render(SR // 2 + 10)  # beats at 0 and 22050
+    seq.set_bpm(60)
+    for _ in range(300):
+        engine.render()
+
+    # The already-due beat keeps its place; the new interval follows it.
+    assert frames[:4] == [0, 22050, 44100, 88200]
+
+
+def test_swing_splits_beat_pairs():
+    engine = MetronomeEngine(sample_rate=SR, block_frames=256)
+    seq = ClickSequencer(4, [], True, 60, _click(), _click(), sample_rate=SR)
+    frames = []
+    seq.on_beat = lambda beat, acc, frame: frames.append(frame)
+    engine.add_source(seq)
+    engine.render(3 * SR)
+
+    assert frames[:4] == [0, round(0.66 * SR), SR, SR + round(0.66 * SR)]
+
+
+def test_output_is_clipped():
+    engine = MetronomeEngine(sample_rate=SR, block_frames=256)
+    for _ in range(3):
+        engine.add_source(ClickSequencer(1, [0], False, 60, _click(), _click(value=0.9), sample_rate=SR))
+    block = engine.render()
+    assert block.max() == 1.0
+
+
+def test_pcm_to_float_downmixes_and_resamples():
+    stereo = np.array([[16384, -16384]] * 22050, dtype="<i2").tobytes()
+    mono = pcm_to_float(stereo, 2, 2, 22050, target_rate=44100)
+
+    assert mono.dtype == np.float32
+    assert len(mono) == 44100
+    assert np.allclose(mono, 0.0)
+
+
+def test_missing_sounddevice_raises_unavailable(monkeypatch):
+    monkeypatch.setitem(sys.modules, "sounddevice", None)
+    with pytest.raises(AudioEngineUnavailableError):
+        engine_mod.open_output_stream(MetronomeEngine())
@@ -0,0 +1,76 @@
+import argparse
+import wave
+
+import numpy as np
+import pytest
+
+from metronome import export as export_mod
+from metronome.bars import beat_offsets
+from metronome.automation import TempoAutomation
+from metronome.export import (
+    ExportError, constant_tempo, export_click_track, iter_bars, iter_blocks, parse_duration,
+)
+from metronome.samples import synth_click
+
+SR = 44100
+REGULAR = synth_click(440, 0.5)
+ACCENT = synth_click(880, 0.5)
+FOUR = {"pulses": 4, "accents": [0], "swing": False}
+
+
+def test_trainer_arguments_build_the_live_tempo_automation():
+    parser = argparse.ArgumentParser()
+    export_mod.add_export_arguments(parser)
+    args = parser.parse_args(["x.wav", "--bpm", "100", "--end-bpm", "116", "--bars", "8",
+                              "--curve", "stepped", "--every", "4", "--duration", "60"])
+    ramp = export_mod.export_automation(args)
+    assert [ramp.bpm_at_bar(b) for b in range(10)] == [100] * 4 + [108] * 4 + [116] * 2
+
+    constant = export_mod.export_automation(parser.parse_args(["x.wav", "--bpm", "90", "--duration", "5"]))
+    assert constant.bpm_at_bar(0) == constant.bpm_at_bar(500) == 90
+
+
+def test_blocks_cover_the_duration_with_constant_size():
+    bars = iter_bars(FOUR, constant_tempo(120), 10.0, REGULAR, ACCENT, SR)
+    blocks = list(iter_blocks(bars, block_frames=4096))
+
+    assert sum(len(b) for b in blocks) == 10 * SR
+    assert all(len(b) == 4096 for b in blocks[:-1])
+    audio = np.concatenate(blocks)
+    # Clicks start exactly on the 120 BPM grid.
+    onsets = np.flatnonzero((np.abs(audio[1:]) > 0) & (audio[:-1] == 0)) + 1
+    assert onsets[:4].tolist() == (beat_offsets(4, False, 120, SR) + 1).tolist()
+
+
+def test_tempo_changes_at_bar_lines():
+    bars = list(iter_bars(FOUR, TempoAutomation(60, 120, bars=1), 12.0, REGULAR, ACCENT, SR))
+    # Bar 0 (4 s) is at the start tempo; from bar 1 on the ramp holds 120 BPM.
+    assert len(bars[0]) == 4 * SR
+    assert all(len(b) == 2 * SR for b in bars[1:])
+
+
+def test_wav_export_round_trip(tmp_path):
+    path = tmp_path / "click.wav"
+    frames = export_click_track(str(path), FOUR, constant_tempo(100), 3.5, REGULAR, ACCENT, SR, block_frames=1000)
+
+    assert frames == int(3.5 * SR)
+    with wave.open(str(path), "rb") as w:
+        assert (w.getnchannels(), w.getsampwidth(), w.getframerate(), w.getnframes()) == (1, 2, SR, frames)
+
+
+def test_export_errors(tmp_path, monkeypatch):
+    with pytest.raises(ExportError):
+        export_click_track(str(tmp_path / "x.mp3"), FOUR, constant_tempo(100), 1, REGULAR, ACCENT)
+    monkeypatch.setattr(export_mod.shutil, "which", lambda _name: None)
+    with pytest.raises(ExportError):
+        export_click_track(str(tmp_path / "x.flac"), FOUR, constant_tempo(100), 1, REGULAR, ACCENT)
+    assert parse_duration("1:30") == 90.0
+
+
+def test_main_renders_without_gui(tmp_path, capsys):
+    out = tmp_path / "track.wav"
+    code = export_mod.main([str(out), "--groove", "3/4", "--bpm", "90", "--duration", "0:02", "--sound", "wood"])
+
+    assert code == 0
+    assert "Wrote 2.0s of 3/4" in capsys.readouterr().out
+    assert export_mod.main([str(out), "--groove", "nope", "--bpm", "90", "--duration", "2"]) == 2
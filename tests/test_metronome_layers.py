@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from metronome.bars import BarCache
+from metronome.engine import MetronomeEngine
+from metronome.layers import Layer, LayerCycleError, LayerLoopSource, cycle_units, render_layers
+
+SR = 44100
+
+
+def _sounds(n_layers):
+    click = np.full(10, 0.1, dtype=np.float32)
+    return [(click, click * 2)] * n_layers
+
+
+def test_three_against_two_shares_the_bar():
+    cycle = render_layers([Layer(2, [0]), Layer(3, [0])], 60, _sounds(2), SR)
+
+    assert len(cycle.audio) == 2 * SR
+    main = cycle.beat_frames[cycle.layer_index == 0]
+    three = cycle.beat_frames[cycle.layer_index == 1]
+    np.testing.assert_array_equal(main, [0, 44100])
+    np.testing.assert_array_equal(three, [0, 29400, 58800])
+    # Downbeats coincide and are mixed into the same samples.
+    assert cycle.audio[0] == pytest.approx(0.4)
+
+
+def test_polymeter_cycle_realigns_after_lcm_of_bars():
+    assert cycle_units([Layer(4, [0]), Layer(9, [0], mode="pulse")]) == 36
+
+    cycle = render_layers([Layer(4, [0]), Layer(9, [0], mode="pulse")], 120, _sounds(2), SR)
+    nine = cycle.beat_frames[cycle.layer_index == 1]
+    assert len(cycle.audio) == 36 * SR // 2
+    assert len(nine) == 36
+    # Accents of the 9/8 layer fall on its own bar lines.
+    accented = nine[cycle.accents[cycle.layer_index == 1]]
+    np.testing.assert_array_equal(accented, [0, 9 * 22050, 18 * 22050, 27 * 22050])
+
+
+def test_layers_that_never_realign_are_rejected():
+    with pytest.raises(LayerCycleError):
+        cycle_units([Layer(7, [0]), Layer(11, [0], mode="pulse")])
+
+
+def test_layer_gain_is_applied():
+    cycle = render_layers([Layer(1, []), Layer(1, [], mode="bar", gain=0.5)], 60, _sounds(2), SR)
+    assert cycle.audio[0] == pytest.approx(0.15)
+
+
+def test_layer_source_reports_beats_per_layer_from_one_stream():
+    source = LayerLoopSource(
+        [Layer(2, [0]), Layer(3, [0])], 120, _sounds(2), sound_key="t", sample_rate=SR, cache=BarCache(),
+    )
+    main_beats, layer_beats = [], []
+    source.on_beat = lambda beat, acc, frame: main_beats.append((beat, frame))
+    source.on_layer_beat = lambda layer, beat, acc, frame: layer_beats.append((layer, beat, frame))
+    engine = MetronomeEngine(sample_rate=SR, block_frames=256)
+    engine.add_source(source)
+    engine.render(2 * SR)  # two bars
+
+    assert main_beats == [(0, 0), (1, 22050), (0, 44100), (1, 66150)]
+    assert [(layer, b, f) for layer, b, f in layer_beats if layer == 1] == [
+        (1, 0, 0), (1, 1, 14700), (1, 2, 29400), (1, 0, 44100), (1, 1, 58800), (1, 2, 73500),
+    ]
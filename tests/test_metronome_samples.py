@@ -0,0 +1,56 @@
+import math
+import wave
+
+import numpy as np
+import pytest
+
+from metronome import samples as samples_mod
+from metronome.samples import SampleBank, synth_click, to_int16_bytes
+
+
+def _write_wav(path, data, rate, channels=1):
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(np.asarray(data, dtype="<i2").tobytes())
+
+
+def test_profiles_are_synthesised_only_when_requested(tmp_path):
+    bank = SampleBank(cache_directory=tmp_path)
+    assert bank.loaded_profiles() == []
+
+    regular, accent = bank.profile("wood")
+    assert bank.loaded_profiles() == ["wood"]
+    assert bank.profile("wood")[0] is regular
+    with pytest.raises(KeyError):
+        bank.profile("cowbell")
+
+
+def test_synthesised_click_matches_legacy_wave_data():
+    t = np.linspace(0, 0.05, int(44100 * 0.05), False)
+    legacy = (0.5 * np.sin(2 * math.pi * 440 * t) * (2**15 - 1)).astype(np.int16)
+
+    assert to_int16_bytes(synth_click(440, 0.5)) == legacy.tobytes()
+
+
+def test_user_wav_is_resampled_normalised_and_cached_on_disk(tmp_path, monkeypatch):
+    wav_path = tmp_path / "click.wav"
+    stereo = np.repeat(np.array([8000, -8000] * 1000, dtype=np.int16), 2)
+    _write_wav(wav_path, stereo, rate=22050, channels=2)
+    cache = tmp_path / "cache"
+    cache.mkdir()
+
+    buf = SampleBank(cache_directory=cache).user_sample(str(wav_path))
+    assert buf.dtype == np.float32
+    assert len(buf) == 4000  # 2000 frames at 22.05 kHz -> 44.1 kHz
+    assert np.abs(buf).max() == pytest.approx(samples_mod.USER_SAMPLE_PEAK)
+    assert len(list(cache.glob("*.npy"))) == 1
+
+    # A fresh bank (new process) loads the decoded buffer from disk.
+    def _no_decode(*_args, **_kwargs):
+        raise AssertionError("WAV decoded again")
+
+    monkeypatch.setattr(samples_mod, "read_wav", _no_decode)
+    again = SampleBank(cache_directory=cache).user_sample(str(wav_path))
+    np.testing.assert_array_equal(again, buf)
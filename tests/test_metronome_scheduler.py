@@ -0,0 +1,126 @@
+import threading
+import time
+
+from metronome.scheduler import BeatScheduler, JitterStats
+
+
+class FakeClock:
+    """Monotonic ns clock that only moves when slept on or worked on."""
+
+    def __init__(self, oversleep_ns=0):
+        self.now = 1_000_000_000
+        self.oversleep_ns = oversleep_ns
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += int(seconds * 1e9) + self.oversleep_ns
+
+    def work(self, ms):
+        self.now += int(ms * 1e6)
+
+
+def test_click_cost_and_oversleep_do_not_accumulate_into_drift():
+    clock = FakeClock(oversleep_ns=300_000)
+    interval_s = 60.0 / 300  # 300 BPM
+    sched = BeatScheduler(interval_s, clock=clock, sleep=clock.sleep)
+    sched.start()
+    origin = clock.now
+
+    for _ in range(3000):  # ten minutes at 300 BPM
+        late = sched.wait()
+        assert 0 <= late < 1_000_000
+        clock.work(3)  # play() + tick.emit()
+        sched.advance()
+
+    # The grid is still exactly where it started: no accumulated drift.
+    assert sched.next_deadline_ns() == origin + 3000 * 200_000_000
+    assert sched.stats.count == 3000
+    assert sched.stats.max_ms < 1.0
+    assert sched.skipped == 0
+
+
+def test_tempo_change_reanchors_at_next_deadline():
+    clock = FakeClock()
+    sched = BeatScheduler(0.5, clock=clock, sleep=clock.sleep)
+    sched.start(origin_ns=0)
+    sched.advance(3)
+    assert sched.next_deadline_ns() == 1_500_000_000
+
+    sched.set_interval(0.25)
+    assert sched.next_deadline_ns() == 1_500_000_000
+    sched.advance(0.66)
+    sched.advance(0.34)
+    assert sched.next_deadline_ns() == 1_750_000_000
+
+
+def test_wakeup_more_than_a_beat_late_skips_instead_of_bursting():
+    clock = FakeClock()
+    sched = BeatScheduler(0.1, clock=clock, sleep=clock.sleep)
+    sched.start()
+    clock.work(1000)  # e.g. laptop suspended
+
+    assert sched.wait() == 0
+    assert sched.skipped == 1
+    sched.advance()
+    assert sched.next_deadline_ns() == clock.now + 100_000_000
+
+
+def test_wait_returns_none_when_stopped():
+    sched = BeatScheduler(10.0)
+    sched.start()
+    sched.advance()
+    stop = threading.Event()
+    threading.Timer(0.05, stop.set).start()
+
+    assert sched.wait(stop) is None
+
+
+def test_real_clock_stays_on_grid():
+    sched = BeatScheduler(0.02)
+    sched.start()
+    origin = sched.next_deadline_ns()
+    for _ in range(25):
+        sched.wait()
+        time.sleep(0.005)  # simulated per-beat work
+        sched.advance()
+    elapsed_ms = (time.perf_counter_ns() - origin) / 1e6
+
+    # Naive sleep-after-work would take 25 * 25 ms = 625 ms.
+    assert elapsed_ms < 25 * 20 + 5 + 20
+
+
+def test_jitter_stats_summary():
+    stats = JitterStats(window=100)
+    for late_ns in [1_000_000] * 98 + [5_000_000, 9_000_000]:
+        stats.add(late_ns)
+
+    snap = stats.snapshot()
+    assert snap["beats"] == 100
+    assert snap["max_ms"] == 9.0
+    assert snap["p99_ms"] == 5.0
+    assert 1.0 < snap["mean_ms"] < 1.2
+
+
+def test_realign_moves_the_grid_and_caps_coarse_sleeps():
+    clock = FakeClock(oversleep_ns=100_000)
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock.sleep(seconds)
+
+    sched = BeatScheduler(0.5, clock=clock, sleep=sleep, max_sleep_ns=5_000_000)
+    sched.start()
+    sched.advance()
+    assert not sched.is_due()
+
+    target = clock.now + 120_000_000
+    sched.realign(target, 0.25)
+    assert sched.next_deadline_ns() == target
+    assert 0 <= sched.wait() < 1_000_000
+    assert sched.is_due()
+    assert max(sleeps) <= 0.005
+    sched.advance()
+    assert sched.next_deadline_ns() == target + 250_000_000
@@ -0,0 +1,94 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+from metronome.engine import MetronomeEngine
+from metronome.visual import (
+    LED_ACCENT_REST_LEVEL,
+    LED_FLASH_NS,
+    LED_REST_LEVEL,
+    MAX_SWING_DEG,
+    MetronomeVisual,
+    led_level,
+    pendulum_angle,
+)
+
+MS = 1_000_000
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+class FakeClock:
+    def __init__(self, now=0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_led_level_decays_from_the_beat_timestamp():
+    assert led_level(1000 * MS, (1000 * MS, True)) == pytest.approx(1.0)
+    assert led_level(1000 * MS, (1000 * MS, False)) == pytest.approx(0.6)
+    halfway = led_level(1000 * MS + LED_FLASH_NS // 2, (1000 * MS, True))
+    assert LED_REST_LEVEL < halfway < 1.0
+    assert led_level(1000 * MS + LED_FLASH_NS, (1000 * MS, True)) == LED_REST_LEVEL
+    # Not heard yet: the LED stays at rest.
+    assert led_level(999 * MS, (1000 * MS, True)) == LED_REST_LEVEL
+    assert led_level(0, None, LED_ACCENT_REST_LEVEL) == LED_ACCENT_REST_LEVEL
+
+
+def test_pendulum_is_at_an_extreme_on_each_beat_and_crosses_the_centre_between():
+    beats = [(0, 0), (500 * MS, 1)]
+    assert pendulum_angle(500 * MS, beats) == pytest.approx(MAX_SWING_DEG)
+    assert pendulum_angle(750 * MS, beats) == pytest.approx(0.0, abs=1e-9)
+    assert pendulum_angle(1000 * MS, beats) == pytest.approx(-MAX_SWING_DEG)
+    assert pendulum_angle(0, []) == 0.0
+
+
+def test_beats_light_when_heard_and_the_frame_timer_stops_when_idle(qapp):
+    clock = FakeClock(1000 * MS)
+    visual = MetronomeVisual(clock=clock)
+    visual.set_pattern(4, [0])
+    assert visual.pulses == 4
+
+    visual.beat(0, True, 1000 * MS)
+    visual.beat(1, False, 1500 * MS)  # rendered ahead by the audio engine
+    assert visual.is_animating()
+    assert visual._hits[0] == (1000 * MS, True)
+    assert visual._hits[1] is None
+
+    clock.now = 1500 * MS
+    visual._frame()
+    assert visual._hits[1] == (1500 * MS, False)
+
+    clock.now = 1500 * MS + 2 * LED_FLASH_NS + 500 * MS
+    visual._frame()
+    assert not visual.is_animating()
+
+
+def test_beats_do_not_create_animations_or_restyle_widgets(qapp):
+    clock = FakeClock(0)
+    visual = MetronomeVisual(clock=clock)
+    visual.resize(400, 240)
+    visual.set_pattern(8, [0, 4])
+    children = len(visual.children())
+    for i in range(64):
+        clock.now = i * 100 * MS
+        visual.beat(i, i % 4 == 0, clock.now)
+        visual._frame()
+    visual.grab()  # paints without errors
+    assert len(visual.children()) == children
+    assert visual.styleSheet() == ""
+
+
+def test_engine_maps_frames_to_output_time():
+    engine = MetronomeEngine(sample_rate=1000)
+    engine.mark_output(2000, 5_000 * MS)
+    assert engine.frame_time_ns(2000) == 5_000 * MS
+    assert engine.frame_time_ns(2500) == 5_500 * MS
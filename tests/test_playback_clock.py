@@ -0,0 +1,110 @@
+from PyQt5.QtWidgets import QApplication
+
+from core.playback_clock import PlaybackClock
+from ui.main_window import LessonPlayerApp
+
+
+def _ensure_qapp():
+    return QApplication.instance() or QApplication([])
+
+
+class DummyMediaPlayer:
+    def __init__(self):
+        self.notify_intervals = []
+
+    def setNotifyInterval(self, ms):
+        self.notify_intervals.append(ms)
+
+
+def test_clock_picks_notify_interval_from_loop_and_visibility():
+    _ensure_qapp()
+    player = DummyMediaPlayer()
+    clock = PlaybackClock(player, interval_ms=100, loop_interval_ms=20, hidden_interval_ms=1000)
+    assert player.notify_intervals[-1] == 100
+
+    clock.set_window_visible(False)
+    assert player.notify_intervals[-1] == 1000
+
+    # Loops keep the fast rate even while hidden so B is not overrun
+    clock.set_looping(True)
+    assert player.notify_intervals[-1] == 20
+
+    clock.set_looping(False)
+    clock.set_window_visible(True)
+    assert player.notify_intervals[-1] == 100
+
+
+class DictSettings:
+    def __init__(self, values):
+        self.values = values
+
+    def value(self, key, default=None):
+        return self.values.get(key, default)
+
+
+def test_clock_follows_changed_interval_settings():
+    _ensure_qapp()
+    player = DummyMediaPlayer()
+    clock = PlaybackClock(player)
+
+    clock.configure(DictSettings({"position_update_interval_ms": "250"}))
+    assert player.notify_intervals[-1] == 250
+    clock.set_looping(True)
+    assert player.notify_intervals[-1] == 20
+
+    clock.configure(DictSettings({"position_update_interval_ms": 250, "loop_position_update_interval_ms": "bad"}))
+    assert player.notify_intervals[-1] == 20
+    clock.configure(DictSettings({"position_update_interval_ms": 250, "loop_position_update_interval_ms": 40}))
+    assert player.notify_intervals[-1] == 40
+
+
+def test_clock_coalesces_display_updates_to_latest_position():
+    _ensure_qapp()
+    clock = PlaybackClock(DummyMediaPlayer())
+    shown = []
+    clock.display_position.connect(shown.append)
+
+    for pos in (100, 200, 300):
+        clock.schedule_display(pos)
+    clock.flush()
+    clock.flush()
+
+    assert shown == [300]
+
+
+def test_clock_drops_display_updates_while_hidden():
+    _ensure_qapp()
+    clock = PlaybackClock(DummyMediaPlayer())
+    shown = []
+    clock.display_position.connect(shown.append)
+
+    clock.set_window_visible(False)
+    clock.schedule_display(500)
+    clock.flush()
+
+    assert shown == []
+
+
+class StubClock:
+    def __init__(self):
+        self.scheduled = []
+
+    def schedule_display(self, pos):
+        self.scheduled.append(pos)
+
+
+class StubApp:
+    def __init__(self):
+        self.progress_bar = object()
+        self.playback_clock = StubClock()
+        self.loop_enabled = False
+        self.loop_start_ms = None
+        self.loop_end_ms = None
+
+
+def test_handle_position_changed_routes_display_through_clock():
+    app = StubApp()
+
+    LessonPlayerApp.handle_position_changed(app, 1234)
+
+    assert app.playback_clock.scheduled == [1234]
@@ -0,0 +1,39 @@
+from PyQt5.QtWidgets import QApplication
+
+from core.seek_scheduler import SeekScheduler
+
+
+def _ensure_qapp():
+    return QApplication.instance() or QApplication([])
+
+
+def test_drag_seeks_are_coalesced_to_latest_position():
+    _ensure_qapp()
+    fast, precise = [], []
+    scheduler = SeekScheduler(fast.append, precise.append, cooldown_ms=1000)
+
+    # First request goes out immediately, the burst collapses into one
+    for pos in (100, 200, 300, 400):
+        scheduler.request(pos)
+    assert fast == [100]
+
+    scheduler._on_cooldown_finished()
+    assert fast == [100, 400]
+    assert precise == []
+
+
+def test_commit_drops_pending_fast_seek_and_seeks_precisely():
+    _ensure_qapp()
+    fast, precise = [], []
+    scheduler = SeekScheduler(fast.append, precise.append, cooldown_ms=1000)
+
+    scheduler.request(100)
+    scheduler.request(250)
+    scheduler.commit(260)
+
+    assert fast == [100]
+    assert precise == [260]
+
+    # Nothing left to flush once committed
+    scheduler._on_cooldown_finished()
+    assert fast == [100]
@@ -0,0 +1,135 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from core.startup_profiler import StartupProfiler, watch_first_paint
+
+ROOT = Path(__file__).resolve().parents[1]
+# Cold start to first paint on the offscreen platform; generous for CI.
+FIRST_PAINT_BUDGET_MS = 8000
+# Modules that must stay off the startup path (imported on first use).
+DEFERRED_MODULES = (
+    "core.lesson_sets",
+    "ui.settings_dialog",
+    "ui.searchUpdateDatabase",
+    "ui.tempo_detection",
+    "core.tempo_detection",
+    "ui.lesson_sync",
+    "core.peaks",
+    "numpy",
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 10.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_phases_and_marks_are_recorded_relative_to_start():
+    clock = FakeClock()
+    profiler = StartupProfiler(clock=clock)
+    clock.now += 0.5
+    with profiler.phase("theme"):
+        clock.now += 0.25
+    profiler.mark("first_paint")
+
+    report = profiler.report()
+    assert report["phases"] == [{"name": "theme", "start_ms": 500.0, "duration_ms": 250.0}]
+    assert report["marks"] == {"first_paint": 750.0}
+    assert "Startup profile" in profiler.format_report(report)
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = StartupProfiler(enabled=False)
+    profiler.install_import_hook()
+    with profiler.phase("theme"):
+        pass
+    profiler.mark("first_paint")
+    assert profiler.phases == [] and profiler.marks == {}
+    assert profiler.finish() is None
+
+
+def test_from_argv_enables_profiling_and_takes_a_report_path():
+    assert not StartupProfiler.from_argv(["main.py"]).enabled
+    profiler = StartupProfiler.from_argv(["main.py", "--profile-startup=/tmp/p.json"])
+    assert profiler.enabled and profiler.report_path == "/tmp/p.json"
+
+
+def test_import_hook_times_nested_imports(tmp_path, monkeypatch):
+    pkg = tmp_path / "profiled_pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("from . import child\n")
+    (pkg / "child.py").write_text("import time\ntime.sleep(0.02)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    profiler = StartupProfiler()
+    profiler.install_import_hook()
+    try:
+        import profiled_pkg  # noqa: F401
+    finally:
+        profiler.remove_import_hook()
+        for name in ("profiled_pkg", "profiled_pkg.child"):
+            sys.modules.pop(name, None)
+
+    child = profiler.imports["profiled_pkg.child"]
+    parent = profiler.imports["profiled_pkg"]
+    assert child["self_ms"] >= 15
+    assert parent["cumulative_ms"] >= child["cumulative_ms"]
+    assert parent["self_ms"] < child["self_ms"]
+
+
+def test_report_is_written_as_json(tmp_path, capsys):
+    path = tmp_path / "profile.json"
+    profiler = StartupProfiler(report_path=str(path))
+    with profiler.phase("qapplication"):
+        pass
+    profiler.finish()
+    report = json.loads(path.read_text())
+    assert report["phases"][0]["name"] == "qapplication"
+    assert "Phases:" in capsys.readouterr().out
+
+
+def test_first_paint_callback_runs_once():
+    app = QApplication.instance() or QApplication([])
+    widget = QWidget()
+    calls = []
+    watch_first_paint(widget, lambda: calls.append(1))
+    widget.show()
+    widget.repaint()
+    for _ in range(5):
+        app.processEvents()
+    widget.repaint()
+    app.processEvents()
+    assert calls == [1]
+    widget.close()
+
+
+def test_cold_start_reaches_first_paint_within_budget(tmp_path):
+    report_path = tmp_path / "startup.json"
+    env = dict(
+        os.environ,
+        QT_QPA_PLATFORM="offscreen",
+        BOUZOUKI_PROFILE_EXIT="1",
+        HOME=str(tmp_path),
+        XDG_CONFIG_HOME=str(tmp_path / "config"),
+        PYTHONPATH=str(ROOT),
+    )
+    result = subprocess.run(
+        [sys.executable, str(ROOT / "main.py"), f"--profile-startup={report_path}"],
+        cwd=tmp_path, env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+
+    report = json.loads(report_path.read_text())
+    assert report["marks"]["first_paint"] < FIRST_PAINT_BUDGET_MS
+    phases = {phase["name"] for phase in report["phases"]}
+    assert {"imports", "qapplication", "theme", "main_window"} <= phases
+    loaded = set(report["modules"])
+    assert not loaded & set(DEFERRED_MODULES)
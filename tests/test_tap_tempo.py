@@ -0,0 +1,66 @@
+import random
+
+from metronome import tap_tempo as tap_tempo_mod
+from metronome.tap_tempo import TapTempoEstimator, analyse_taps
+
+
+def _taps(grid_positions, unit, jitter=0.0, seed=1):
+    rng = random.Random(seed)
+    return [p * unit + rng.uniform(-jitter, jitter) for p in grid_positions]
+
+
+def test_one_late_tap_does_not_skew_tempo():
+    times = _taps(range(9), 0.6, jitter=0.01)
+    times[5] += 0.15  # a quarter of a beat late
+    result = analyse_taps(times, [i % 4 == 0 for i in range(9)])
+
+    assert abs(result.bpm - 100) < 1.5
+    assert (result.pulses, result.accents, result.swing) == (4, [0], False)
+
+
+def test_syncopated_pattern_keeps_accents_on_the_grid():
+    pattern = [0, 2, 3, 5, 6]  # rests on 1, 4 and 7 of an 8-pulse bar
+    positions = [bar * 8 + p for bar in range(2) for p in pattern] + [16]
+    accents = [p % 8 in (0, 3) for p in positions]
+    result = analyse_taps(_taps(positions, 0.25, jitter=0.01), accents)
+
+    assert abs(result.bpm - 240) < 3
+    assert result.pulses == 8
+    assert result.accents == [0, 3]
+
+
+def test_long_short_taps_are_saved_as_swing():
+    times = [0.0]
+    for i in range(8):
+        times.append(times[-1] + (0.33 if i % 2 == 0 else 0.17))
+    result = analyse_taps(times, [i % 4 == 0 for i in range(9)])
+
+    assert result.swing is True
+    assert result.bpm == 120.0
+    assert (result.pulses, result.accents) == (4, [0])
+
+
+def test_double_tap_is_merged():
+    result = analyse_taps([0.0, 0.5, 0.52, 1.0, 1.5], [True, False, True, False, False])
+
+    assert result.positions == [0, 1, 2, 3]
+    assert result.rejected == 1
+    assert result.bpm == 120.0
+    assert result.accents == [0, 1]
+    assert analyse_taps([1.0], [False]) is None
+
+
+def test_live_estimator_uses_a_fixed_window(monkeypatch):
+    calls = []
+    real = tap_tempo_mod.grid_unit
+    monkeypatch.setattr(tap_tempo_mod, "grid_unit", lambda iois: calls.append(len(iois)) or real(iois))
+    est = TapTempoEstimator(window=8)
+
+    assert est.tap(0.0) is None
+    for i in range(1, 200):
+        bpm = est.tap(i * 0.5)
+    assert bpm == 120.0
+    assert max(calls) == 8
+
+    est.undo(198 * 0.5)
+    assert abs(est.tap(199 * 0.5 + 0.02) - 120.0) < 1.0
@@ -0,0 +1,114 @@
+import json
+
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+import core.telemetry as telemetry_mod
+from core.telemetry import Telemetry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class DictSettings:
+    def __init__(self, values):
+        self.values = values
+
+    def value(self, key, default=None):
+        return self.values.get(key, default)
+
+
+def test_disabled_telemetry_records_nothing(tmp_path):
+    t = Telemetry(path=str(tmp_path / "t.ndjson"))
+    with t.timer("db.fetch_lessons"):
+        pass
+    t.record("metronome.jitter", 1.0)
+    assert t.samples() == [] and t.flush() == 0
+    assert not (tmp_path / "t.ndjson").exists()
+
+
+def test_timer_and_decorator_record_milliseconds():
+    clock = FakeClock()
+    t = Telemetry(enabled=True, clock=clock)
+
+    with t.timer("scan.walk"):
+        clock.now += 2_500_000
+
+    @t.timed("media.open")
+    def open_media(path):
+        clock.now += 40_000_000
+        return path.upper()
+
+    assert open_media("a.mp4") == "A.MP4"
+    assert open_media.__name__ == "open_media"
+    assert [(s.name, s.ms) for s in t.samples()] == [("scan.walk", 2.5), ("media.open", 40.0)]
+
+
+def test_ring_buffer_keeps_the_latest_samples_and_summarises_them():
+    t = Telemetry(capacity=100, enabled=True)
+    for i in range(1, 151):
+        t.record("seek.dispatch.fast", float(i))
+    t.record("seek.dispatch.precise", 7.0)
+
+    assert len(t.samples()) == 100
+    summary = t.summary()
+    assert summary["seek.dispatch.fast"] == {"count": 99, "p50": 101.0, "p90": 141.0, "p99": 150.0, "max": 150.0}
+    assert summary["seek.dispatch.precise"]["count"] == 1
+
+
+def test_flush_appends_only_new_samples_as_ndjson(tmp_path):
+    path = tmp_path / "t.ndjson"
+    t = Telemetry(enabled=True, path=str(path))
+    t.record("db.fetch_lessons", 1.25)
+    t.record("db.fetch_lessons", 2.5)
+    assert t.flush() == 2
+    t.record("scan.probe", 30.0)
+    assert t.flush() == 1
+    assert t.flush() == 0
+
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(r["name"], r["ms"]) for r in rows] == [
+        ("db.fetch_lessons", 1.25), ("db.fetch_lessons", 2.5), ("scan.probe", 30.0),
+    ]
+
+
+def test_log_is_rotated_when_it_grows_too_large(tmp_path, monkeypatch):
+    monkeypatch.setattr(telemetry_mod, "MAX_LOG_BYTES", 10)
+    path = tmp_path / "t.ndjson"
+    path.write_text("x" * 20)
+    t = Telemetry(enabled=True, path=str(path))
+    t.record("seek.dispatch.fast", 1.0)
+    t.flush()
+    assert (tmp_path / "t.ndjson.1").read_text() == "x" * 20
+    assert len(path.read_text().splitlines()) == 1
+
+
+@pytest.mark.parametrize("value, expected", [(True, True), ("true", True), ("false", False), (None, False)])
+def test_configure_follows_the_setting(value, expected):
+    t = Telemetry()
+    t.configure(DictSettings({"telemetry_enabled": value} if value is not None else {}))
+    assert t.enabled is expected
+
+
+def test_viewer_lists_percentiles_per_timer(tmp_path):
+    app = QApplication.instance() or QApplication([])
+    from ui.telemetry_dialog import TelemetryDialog
+
+    t = Telemetry(enabled=True, path=str(tmp_path / "t.ndjson"))
+    for ms in (1.0, 2.0, 3.0):
+        t.record("db.fetch_lessons", ms)
+    dialog = TelemetryDialog(telemetry=t)
+    assert dialog.table.rowCount() == 1
+    assert dialog.table.item(0, 0).text() == "db.fetch_lessons"
+    assert dialog.table.item(0, 1).text() == "3"
+
+    dialog._clear()
+    assert dialog.table.rowCount() == 0
+    assert len((tmp_path / "t.ndjson").read_text().splitlines()) == 3
+    dialog.close()
+    assert app is not None
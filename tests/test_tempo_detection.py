@@ -0,0 +1,125 @@
+import sqlite3
+import time
+
+import numpy as np
+import pytest
+
+from core.tempo_detection import (
+    TEMPO_SAMPLE_RATE,
+    TempoEstimate,
+    ensure_tempo_columns,
+    estimate_tempo,
+    lessons_missing_tempo,
+    store_detected_tempo,
+)
+
+
+def _click_track(bpm, seconds, offset_s=0.25, seed=0):
+    """Plucked clicks on a noise floor, like a quiet lesson recording."""
+    rng = np.random.default_rng(seed)
+    signal = rng.normal(0, 300, int(seconds * TEMPO_SAMPLE_RATE))
+    n = np.arange(400)
+    click = np.sin(2 * np.pi * 1500 * n / TEMPO_SAMPLE_RATE) * np.exp(-n / 60.0) * 12000
+    t = offset_s
+    while t < seconds - 0.1:
+        start = int(t * TEMPO_SAMPLE_RATE)
+        signal[start:start + len(click)] += click
+        t += 60.0 / bpm
+    return signal.astype(np.int16)
+
+
+def _chunks(samples, size=65536):
+    return (samples[i:i + size] for i in range(0, len(samples), size))
+
+
+@pytest.mark.parametrize("bpm", [60, 96, 120, 143, 180])
+def test_estimate_tempo_finds_click_track_tempo(bpm):
+    estimate = estimate_tempo(_chunks(_click_track(bpm, 60)))
+
+    assert estimate is not None
+    assert estimate.bpm == pytest.approx(bpm, abs=1.0)
+    assert estimate.confidence > 0.5
+
+
+def test_estimate_tempo_reports_first_beat_offset():
+    estimate = estimate_tempo(_chunks(_click_track(120, 60, offset_s=0.25)))
+
+    assert estimate.first_beat_ms == pytest.approx(250, abs=40)
+
+
+def test_estimate_tempo_returns_none_for_too_short_input():
+    assert estimate_tempo(_chunks(_click_track(120, 1))) is None
+
+
+def test_five_minute_track_costs_well_under_a_second_of_cpu():
+    samples = _click_track(100, 300)
+
+    start = time.process_time()
+    estimate_tempo(_chunks(samples))
+    elapsed = time.process_time() - start
+
+    assert elapsed < 1.0
+
+
+def test_only_lessons_without_tempo_are_filled():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE lessons (file_path TEXT PRIMARY KEY, tempo INTEGER)")
+    conn.executemany(
+        "INSERT INTO lessons (file_path, tempo) VALUES (?, ?)",
+        [("/a.mp3", None), ("/b.mp3", 90), ("/c.mp3", None)],
+    )
+    ensure_tempo_columns(conn)
+
+    assert lessons_missing_tempo(conn) == ["/a.mp3", "/c.mp3"]
+
+    estimate = TempoEstimate(bpm=119.6, confidence=0.8771, first_beat_ms=12.0)
+    assert store_detected_tempo(conn, "/a.mp3", estimate) is True
+    # A manually entered tempo is never overwritten.
+    assert store_detected_tempo(conn, "/b.mp3", estimate) is False
+
+    rows = dict(
+        ((path, (tempo, conf)) for path, tempo, conf in
+         conn.execute("SELECT file_path, tempo, tempo_confidence FROM lessons"))
+    )
+    assert rows["/a.mp3"] == (120, 0.877)
+    assert rows["/b.mp3"] == (90, None)
+    assert lessons_missing_tempo(conn) == ["/c.mp3"]
+
+
+class _Unclosable:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        pass
+
+
+def test_worker_counts_a_crashing_file_as_failed_and_continues(monkeypatch):
+    import ui.tempo_detection as worker_mod
+
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE lessons (file_path TEXT PRIMARY KEY, tempo INTEGER)")
+    conn.executemany(
+        "INSERT INTO lessons (file_path, tempo) VALUES (?, ?)",
+        [("/bad.mp3", None), ("/good.mp3", None)],
+    )
+
+    def detect(path):
+        if path == "/bad.mp3":
+            raise ValueError("corrupt header")
+        return TempoEstimate(bpm=100.0, confidence=0.9, first_beat_ms=0.0)
+
+    # The worker closes its connection when done; keep this one readable.
+    monkeypatch.setattr(worker_mod, "connect_to_db", lambda path: _Unclosable(conn))
+    monkeypatch.setattr(worker_mod, "detect_file_tempo", detect)
+
+    worker = worker_mod.TempoDetectionWorker(":memory:")
+    results = []
+    worker.finished.connect(lambda detected, failed: results.append((detected, failed)))
+    worker.run()
+
+    assert results == [(1, 1)]
+    assert lessons_missing_tempo(conn) == ["/bad.mp3"]
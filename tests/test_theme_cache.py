@@ -0,0 +1,105 @@
+import pytest
+from PyQt5.QtCore import QDir
+from PyQt5.QtGui import QColor, QFont, QFontDatabase, QPalette
+from PyQt5.QtWidgets import QApplication
+
+import core.theme_cache as theme_cache_mod
+from core.theme_cache import ICON_PREFIX, ThemeCache, capture_app_state, load_theme, theme_key
+
+app = QApplication.instance() or QApplication([])
+
+
+def _reset_app():
+    """Fresh-start state: no stylesheet, default font and palette."""
+    app.setStyleSheet("")
+    app.setFont(QFont())
+    app.setPalette(QPalette())
+    return app
+
+
+@pytest.fixture(autouse=True)
+def _restore_app():
+    yield
+    _reset_app()
+    QDir.setSearchPaths(ICON_PREFIX, [])
+
+
+class FakeCompiler:
+    def __init__(self, icon_dir):
+        self.icon_dir = icon_dir
+        self.calls = []
+
+    def __call__(self, app, theme):
+        # What qt-material's apply_stylesheet does besides the QSS.
+        self.calls.append(theme)
+        (self.icon_dir / "primary").mkdir(parents=True, exist_ok=True)
+        (self.icon_dir / "primary" / "checkbox.svg").write_text("<svg/>")
+        font_file = self.icon_dir / "Roboto-Regular.ttf"
+        font_file.write_bytes(b"not really a font")
+        QFontDatabase.addApplicationFont(str(font_file))
+        QDir.setSearchPaths(ICON_PREFIX, [str(self.icon_dir)])
+        palette = QPalette()
+        palette.setColor(QPalette.Window, QColor("#232629"))
+        palette.setColor(QPalette.Disabled, QPalette.Text, QColor("#4f5b62"))
+        app.setPalette(palette)
+        app.setFont(QFont("Roboto", 11))
+        app.setStyleSheet(f"/* {theme} */ QCheckBox::indicator {{ image: url(icon:/primary/checkbox.svg); }}")
+
+
+def test_theme_is_compiled_once_then_loaded_from_the_cache(tmp_path):
+    cache = ThemeCache(tmp_path / "themes")
+    compiler = FakeCompiler(tmp_path / "generated")
+
+    assert load_theme(_reset_app(), "dark_teal.xml", cache=cache, compile_theme=compiler) is False
+    compiled = capture_app_state(app), app.styleSheet()
+    assert load_theme(_reset_app(), "dark_teal", cache=cache, compile_theme=compiler) is True
+
+    assert compiler.calls == ["dark_teal"]
+    assert (capture_app_state(app), app.styleSheet()) == compiled
+    # Icons are served from the cache entry, not qt-material's output.
+    icons = QDir.searchPaths(ICON_PREFIX)
+    assert len(icons) == 1 and icons[0].startswith(str(tmp_path / "themes"))
+    assert (tmp_path / "themes").joinpath(icons[0], "primary", "checkbox.svg").exists()
+
+
+def test_a_tampered_stylesheet_is_compiled_again(tmp_path):
+    cache = ThemeCache(tmp_path / "themes")
+    compiler = FakeCompiler(tmp_path / "generated")
+    load_theme(_reset_app(), "light_blue", cache=cache, compile_theme=compiler)
+
+    qss = next((tmp_path / "themes").glob("light_blue-*/theme.qss"))
+    qss.write_text("QWidget { color: red; }")
+    assert load_theme(_reset_app(), "light_blue", cache=cache, compile_theme=compiler) is False
+    assert compiler.calls == ["light_blue", "light_blue"]
+    assert "light_blue" in app.styleSheet()
+
+
+def test_cached_load_registers_the_compiled_fonts_again(tmp_path, monkeypatch):
+    cache = ThemeCache(tmp_path / "themes")
+    compiler = FakeCompiler(tmp_path / "generated")
+    load_theme(_reset_app(), "dark_teal", cache=cache, compile_theme=compiler)
+
+    added = []
+    monkeypatch.setattr(theme_cache_mod.QFontDatabase, "addApplicationFont", staticmethod(added.append))
+    assert load_theme(_reset_app(), "dark_teal", cache=cache, compile_theme=compiler) is True
+    assert len(added) == 1
+    assert added[0].startswith(str(tmp_path / "themes")) and added[0].endswith("Roboto-Regular.ttf")
+
+
+def test_key_depends_on_dpi_density_and_sources():
+    base = theme_key("dark_teal", 96.0, 0, sources={"qt_material": "2.14"})
+    assert base == theme_key("dark_teal", 96.0, 0, sources={"qt_material": "2.14"})
+    assert base != theme_key("dark_teal", 144.0, 0, sources={"qt_material": "2.14"})
+    assert base != theme_key("dark_teal", 96.0, -1, sources={"qt_material": "2.14"})
+    assert base != theme_key("dark_teal", 96.0, 0, sources={"qt_material": "2.15"})
+
+
+def test_switching_theme_replaces_only_that_themes_old_entry(tmp_path):
+    cache = ThemeCache(tmp_path)
+    cache.store("dark_teal", "a" * 64, "A", [])
+    cache.store("light_blue", "b" * 64, "B", [])
+    cache.store("dark_teal", "c" * 64, "C", [])
+    names = sorted(p.name for p in tmp_path.iterdir())
+    assert names == ["dark_teal-" + "c" * 16, "light_blue-" + "b" * 16]
+    assert cache.load("dark_teal", "c" * 64)[:2] == ("C", None)
+    assert cache.load("dark_teal", "a" * 64) is None
@@ -0,0 +1,112 @@
+import sys
+import threading
+import types
+
+import pytest
+
+from core import media_cache
+from core.pcm_stream import PcmDecodeError, iter_pcm_chunks
+from core.thumbnails import (
+    SpriteSheet,
+    SpriteSheetError,
+    ThumbnailService,
+    generate_sprite_sheet,
+    write_sprite_sheet,
+)
+
+
+def _frame(value, width=4, height=2):
+    return bytes([value]) * (width * height * 3)
+
+
+def test_sprite_sheet_roundtrip_and_position_lookup(tmp_path):
+    sheet_path = tmp_path / "lesson.thumbs"
+    data = _frame(1) + _frame(2) + _frame(3)
+    # Chunks need not align with frame boundaries; trailing bytes are dropped
+    chunks = [data[:10], data[10:], b"\x09" * 5]
+
+    count = write_sprite_sheet(str(sheet_path), chunks, width=4, height=2, interval_ms=5000)
+    assert count == 3
+
+    sheet = SpriteSheet(str(sheet_path))
+    try:
+        assert (sheet.width, sheet.height, sheet.count) == (4, 2, 3)
+        assert sheet.index_for_position(0) == 0
+        assert sheet.index_for_position(7400) == 1
+        assert sheet.index_for_position(999999) == 2
+        assert sheet.frame_bytes(1) == _frame(2)
+    finally:
+        sheet.close()
+
+
+def test_sprite_sheet_rejects_foreign_files(tmp_path):
+    bogus = tmp_path / "bogus.thumbs"
+    bogus.write_bytes(b"not a sheet at all, just some bytes")
+
+    with pytest.raises(SpriteSheetError):
+        SpriteSheet(str(bogus))
+
+
+def test_file_fingerprint_follows_content_not_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("BOUZOUKI_CACHE_DIR", str(tmp_path / "cache"))
+    a = tmp_path / "a.mp4"
+    b = tmp_path / "renamed.mp4"
+    a.write_bytes(b"x" * 300_000)
+    b.write_bytes(b"x" * 300_000)
+
+    assert media_cache.file_fingerprint(str(a)) == media_cache.file_fingerprint(str(b))
+
+    b.write_bytes(b"x" * 299_999 + b"y")
+    assert media_cache.file_fingerprint(str(a)) != media_cache.file_fingerprint(str(b))
+    assert media_cache.cache_dir("thumbnails").is_dir()
+
+
+def _noisy_ffmpeg(tmp_path, stdout_bytes, exit_code=0):
+    """A stand-in for ffmpeg that fills stderr well past a pipe buffer first."""
+    script = tmp_path / "ffmpeg"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        "sys.stderr.write('warning: noisy decoder\\n' * 20000)\n"
+        "sys.stderr.flush()\n"
+        f"sys.stdout.buffer.write(b'\\x01' * {stdout_bytes})\n"
+        f"sys.exit({exit_code})\n"
+    )
+    script.chmod(0o755)
+    return str(script)
+
+
+def test_sprite_sheet_generation_survives_a_chatty_ffmpeg(tmp_path):
+    out = tmp_path / "lesson.thumbs"
+    ffmpeg = _noisy_ffmpeg(tmp_path, stdout_bytes=2 * 4 * 2 * 3)
+    assert generate_sprite_sheet("lesson.mp4", str(out), width=4, height=2, ffmpeg=ffmpeg) == 2
+
+    failing = _noisy_ffmpeg(tmp_path, stdout_bytes=0, exit_code=1)
+    with pytest.raises(SpriteSheetError, match="noisy decoder"):
+        generate_sprite_sheet("lesson.mp4", str(out), width=4, height=2, ffmpeg=failing)
+
+
+def test_pcm_stream_survives_a_chatty_ffmpeg(tmp_path):
+    ffmpeg = _noisy_ffmpeg(tmp_path, stdout_bytes=1000)
+    chunks = list(iter_pcm_chunks("lesson.mp3", 8000, chunk_frames=128, ffmpeg=ffmpeg))
+    assert sum(len(c) for c in chunks) == 500
+
+    failing = _noisy_ffmpeg(tmp_path, stdout_bytes=0, exit_code=1)
+    with pytest.raises(PcmDecodeError, match="noisy decoder"):
+        list(iter_pcm_chunks("lesson.mp3", 8000, ffmpeg=failing))
+
+
+def test_concurrent_requests_start_one_build_per_file(monkeypatch):
+    service = ThumbnailService.__new__(ThumbnailService)
+    service.ffmpeg = "ffmpeg"
+    service._in_flight = set()
+    service._in_flight_lock = threading.Lock()
+    submitted = []
+    service._executor = types.SimpleNamespace(submit=lambda fn, path: submitted.append(path))
+
+    threads = [threading.Thread(target=service.request, args=("lesson.mp4",)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert submitted == ["lesson.mp4"]
@@ -0,0 +1,107 @@
+from concurrent.futures import Future
+
+import numpy as np
+
+from core.peaks import PeakFile, PeakPyramidBuilder, PeakService, write_peaks
+
+
+def _signal(n=100_000, seed=1):
+    rng = np.random.default_rng(seed)
+    return rng.integers(-20000, 20000, size=n, dtype=np.int16)
+
+
+def test_streaming_builder_matches_single_pass_regardless_of_chunking():
+    samples = _signal()
+
+    whole = PeakPyramidBuilder(samples_per_peak=64)
+    whole.feed(samples)
+    expected = whole.finish()
+
+    chunked = PeakPyramidBuilder(samples_per_peak=64)
+    for start in range(0, len(samples), 1000):  # not a multiple of 64
+        chunked.feed(samples[start:start + 1000])
+    levels = chunked.finish()
+
+    assert len(levels) == len(expected) > 1
+    for got, want in zip(levels, expected):
+        np.testing.assert_array_equal(got, want)
+
+    # Each coarser level halves the resolution and keeps the extremes
+    assert len(levels[1]) == (len(levels[0]) + 1) // 2
+    assert levels[-1][:, 0].min() == samples.min()
+    assert levels[-1][:, 1].max() == samples.max()
+
+
+def test_peak_file_roundtrip_and_zoomed_columns(tmp_path):
+    samples = _signal()
+    builder = PeakPyramidBuilder(samples_per_peak=64)
+    builder.feed(samples)
+    levels = builder.finish()
+
+    path = tmp_path / "lesson.peaks"
+    write_peaks(str(path), levels, sample_rate=8000, samples_per_peak=64)
+
+    peaks = PeakFile(str(path))
+    try:
+        assert peaks.level_count == len(levels)
+        np.testing.assert_array_equal(peaks.level(0), levels[0])
+
+        # Whole file on a narrow view picks a coarse level ...
+        full_ms = 1000.0 * len(samples) / 8000
+        assert peaks.best_level(full_ms, 100) > 0
+        cols = peaks.columns(0, full_ms, 100)
+        assert len(cols) == 100
+        assert cols[:, 1].max() == samples.max()
+
+        # ... while a short A-B region reads the finest level
+        assert peaks.best_level(500, 400) == 0
+        region = peaks.columns(1000, 1500, 400)
+        first, last = 1000 * 8 // 64, 1500 * 8 // 64
+        assert len(region) <= 400
+        assert region[:, 1].max() == levels[0][first:last, 1].max()
+    finally:
+        peaks.close()
+
+
+class ManualExecutor:
+    """Hands out futures that the test starts and finishes by hand."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, media_path):
+        future = Future()
+        self.submitted.append((media_path, future))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def test_service_runs_only_the_latest_lesson_and_never_twice(tmp_path):
+    executor = ManualExecutor()
+    service = PeakService(executor_factory=lambda: executor)
+    ready = []
+    service.ready.connect(lambda media, path: ready.append((media, path)))
+
+    service.request("a.mp3")
+    running = executor.submitted[0][1]
+    assert running.set_running_or_notify_cancel()
+    service.request("b.mp3")
+    service.request("c.mp3")
+    service.request("c.mp3")
+
+    futures = dict(executor.submitted)
+    assert [media for media, _ in executor.submitted] == ["a.mp3", "b.mp3", "c.mp3"]
+    # The queued job for b was dropped; a already runs and cannot be.
+    assert futures["b.mp3"].cancelled() and not running.cancelled()
+
+    peaks = tmp_path / "c.peaks"
+    peaks.write_bytes(b"")
+    futures["c.mp3"].set_running_or_notify_cancel()
+    futures["c.mp3"].set_result(str(peaks))
+    assert ready == [("c.mp3", str(peaks))]
+
+    # Known files are reported without another job.
+    service.request("c.mp3")
+    assert len(executor.submitted) == 3 and ready[-1] == ("c.mp3", str(peaks))
@@ -1,10 +1,25 @@
 # ui/__init__.py
-from .main_window import LessonPlayerApp
-from .menu_bar import create_menu_bar
-from .searchUpdateDatabase import FolderScannerWindow
+# Re-exports are resolved on first access, so importing a submodule such as
+# ``ui.widgets.detail`` does not pull in the whole UI.
+import importlib
+
+_EXPORTS = {
+    "LessonPlayerApp": ".main_window",
+    "create_menu_bar": ".menu_bar",
+    "FolderScannerWindow": ".searchUpdateDatabase",
+}
 
 __all__ = [
     "LessonPlayerApp",
     "create_menu_bar",
     "FolderScannerWindow",
 ]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
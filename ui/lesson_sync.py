@@ -0,0 +1,173 @@
+import logging
+import time
+
+from PyQt5.QtCore import QObject
+from PyQt5.QtMultimedia import QMediaPlayer
+from PyQt5.QtWidgets import QMessageBox
+
+from core.beat_grid import BeatGrid, LessonSync
+from core.tempo_detection import ensure_tempo_columns, lesson_beat_grid, set_beat_offset
+
+logger = logging.getLogger(__name__)
+
+
+class LessonBeatSync(QObject):
+    """Keep the docked metronome on the beat of the playing lesson.
+
+    Beats are placed on the lesson timeline (first-beat offset plus the
+    lesson tempo) and scaled by the playback rate actually applied (see
+    ``playback_rate``). Position reports
+    from the media player re-align the metronome after seeks, A–B
+    loop-backs and speed changes; pausing silences it.
+    """
+
+    def __init__(self, app, grid: BeatGrid, metronome, clock=time.perf_counter_ns):
+        super().__init__(app if isinstance(app, QObject) else None)
+        self.app = app
+        self.metronome = metronome
+        self.sync = LessonSync(grid)
+        self._clock = clock
+        app.media_player.positionChanged.connect(self.on_position)
+        app.media_player.stateChanged.connect(self.on_state)
+
+    def set_grid(self, grid: BeatGrid) -> None:
+        self.sync = LessonSync(grid)
+        self.on_position(self.app.media_player.position())
+
+    def on_position(self, pos: int) -> None:
+        if self.app.media_player.state() != QMediaPlayer.PlayingState:
+            return
+        alignment = self.sync.update(pos, self.playback_rate(), self._clock())
+        if alignment is not None:
+            self.metronome.sync_to(alignment.deadline_ns, alignment.beat, alignment.bpm)
+
+    def playback_rate(self) -> float:
+        """Rate the lesson is heard at.
+
+        VLC applies ``current_speed`` and shifts pitch separately; the Qt
+        backend folds the transposition into ``playbackRate``.
+        """
+        if getattr(self.app, "vlc_player", None) is not None:
+            return getattr(self.app, "current_speed", 1.0)
+        rate = self.app.media_player.playbackRate()
+        # QMediaPlayer reports 0.0 until a rate has been set.
+        return rate if rate > 0 else 1.0
+
+    def on_state(self, state) -> None:
+        if state != QMediaPlayer.PlayingState:
+            self.sync.reset()
+            self.metronome.stop()
+
+    def stop(self) -> None:
+        for signal, slot in (
+            (self.app.media_player.positionChanged, self.on_position),
+            (self.app.media_player.stateChanged, self.on_state),
+        ):
+            try:
+                signal.disconnect(slot)
+            except TypeError:
+                pass
+        self.metronome.stop()
+
+
+def _ensure_tempo_schema(app) -> bool:
+    """Add the beat grid columns once per database connection."""
+    conn = app.db.conn
+    if getattr(app, "_tempo_schema_conn", None) is conn:
+        return True
+    try:
+        ensure_tempo_columns(conn)
+    except Exception as e:
+        logger.warning("Could not add the beat grid columns: %s", e)
+        return False
+    app._tempo_schema_conn = conn
+    return True
+
+
+def _current_grid(app):
+    """Beat grid of the lesson loaded in the player, or ``None``."""
+    file_path = getattr(app, "current_file_path", None)
+    if not file_path or getattr(app, "db", None) is None:
+        return None
+    try:
+        row = lesson_beat_grid(app.db.conn, file_path)
+    except Exception as e:
+        logger.warning("Could not read beat grid for %s: %s", file_path, e)
+        return None
+    if row is None:
+        return None
+    tempo, offset_ms = row
+    return BeatGrid(tempo, offset_ms)
+
+
+def start_lesson_sync(app) -> bool:
+    """Lock the metronome to the current lesson; returns False when not possible."""
+    if not getattr(app, "current_file_path", None):
+        QMessageBox.information(app, "Metronome Sync", "Play a lesson first.")
+        return False
+    if getattr(app, "db", None) is None or not _ensure_tempo_schema(app):
+        QMessageBox.information(app, "Metronome Sync", "The lesson database is not available.")
+        return False
+    grid = _current_grid(app)
+    if grid is None:
+        QMessageBox.information(
+            app,
+            "Metronome Sync",
+            "This lesson has no tempo yet.\n"
+            "Enter one in Edit Metadata or run Metronome → Detect Lesson Tempos.",
+        )
+        return False
+    try:
+        app.show_metronome()
+    except Exception as e:
+        QMessageBox.warning(app, "Metronome Error", f"Could not start metronome:\n{e}")
+        return False
+
+    stop_lesson_sync(app)
+    app.lesson_sync = LessonBeatSync(app, grid, app.metronome_dock.metronome)
+    app.lesson_sync.on_position(app.media_player.position())
+    if hasattr(app, "_set_status_message"):
+        app._set_status_message(
+            f"Metronome synced to lesson: {grid.tempo_bpm:.0f} BPM, first beat at {grid.offset_ms / 1000:.2f}s"
+        )
+    return True
+
+
+def stop_lesson_sync(app) -> None:
+    sync = getattr(app, "lesson_sync", None)
+    if sync is not None:
+        sync.stop()
+        app.lesson_sync = None
+
+
+def refresh_lesson_sync(app) -> None:
+    """Reload the beat grid after the lesson or its offset changed."""
+    sync = getattr(app, "lesson_sync", None)
+    if sync is None:
+        return
+    grid = _current_grid(app)
+    if grid is None:
+        stop_lesson_sync(app)
+        if hasattr(app, "lesson_sync_action"):
+            app.lesson_sync_action.setChecked(False)
+        return
+    sync.metronome.stop()
+    sync.set_grid(grid)
+
+
+def set_first_beat_here(app) -> None:
+    """Use the current playback position as the lesson's first beat."""
+    file_path = getattr(app, "current_file_path", None)
+    if not file_path or getattr(app, "db", None) is None or not hasattr(app, "media_player"):
+        return
+    if not _ensure_tempo_schema(app):
+        return
+    pos = app.media_player.position()
+    try:
+        set_beat_offset(app.db.conn, file_path, pos)
+    except Exception as e:
+        QMessageBox.warning(app, "Metronome Sync", f"Could not save beat offset:\n{e}")
+        return
+    if hasattr(app, "_set_status_message"):
+        app._set_status_message(f"First beat set at {pos / 1000:.2f}s")
+    refresh_lesson_sync(app)
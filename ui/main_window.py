@@ -1,12 +1,14 @@
-import os
-from PyQt5.QtCore import Qt, QTimer, QSettings
+from PyQt5.QtCore import Qt, QTimer, QSettings, QEvent
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QStatusBar, QLabel, QShortcut,
 )
 from PyQt5.QtMultimedia import QMediaPlayer
-from PyQt5.QtGui import QIcon, QKeySequence
+from PyQt5.QtGui import QKeySequence
 
+from core.image_cache import IMAGE_CACHE
+from core.startup_profiler import get_profiler
+from core.telemetry import TELEMETRY
 from ui.menu_bar import create_menu_bar
 from ui.widgets.master_detail import init_master_detail
 
@@ -30,15 +32,13 @@ class LessonPlayerApp(QMainWindow):
         self.setWindowTitle("Bouzouki Lesson Player")
         self.setGeometry(100, 100, 1200, 700)
         self.setMinimumSize(960, 540)
-        icon_path = os.path.abspath(os.path.join(
-            os.path.dirname(__file__), "..", "resources", "bouzouki.png",
-        ))
-        self.setWindowIcon(QIcon(icon_path))
+        self.setWindowIcon(IMAGE_CACHE.icon("bouzouki.png"))
 
         self._init_status_bar()
         self._init_main_ui()
         self._init_feedback_overlay()
         self._init_count_in_settings()
+        self._init_telemetry()
 
     def _init_status_bar(self):
         self.status_bar = QStatusBar()
@@ -55,7 +55,8 @@ class LessonPlayerApp(QMainWindow):
             self.status_message.setText(f"[{backend}{suffix}] {text}")
 
     def _init_main_ui(self):
-        self.setMenuBar(create_menu_bar(self))
+        with get_profiler().phase("menu_bar"):
+            self.setMenuBar(create_menu_bar(self))
 
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -75,15 +76,78 @@ class LessonPlayerApp(QMainWindow):
             layout.setContentsMargins(8, 8, 8, 8)
             layout.setSpacing(8)
 
-        master_detail_widget = init_master_detail(self)
+        # The window paints with a skeleton list; the database opens and the
+        # lessons load from the event loop.
+        master_detail_widget = init_master_detail(self, deferred=True)
         layout.addWidget(master_detail_widget)
         self._install_shortcuts()
 
+    def _init_telemetry(self):
+        TELEMETRY.configure(QSettings("bouzouki", "lessonplayer"))
+        # Always runs: telemetry can be switched on from the settings dialog.
+        self._telemetry_timer = TELEMETRY.start_flush_timer(self)
+
     def closeEvent(self, event):
+        TELEMETRY.flush()
         if self.conn:
             self.conn.close()
+        if hasattr(self, "scrub_preview"):
+            self.scrub_preview.service.shutdown()
+        if getattr(self, "waveform_view", None) is not None and self.waveform_view.service is not None:
+            self.waveform_view.service.shutdown()
+        if getattr(self, "metronome_dock", None) is not None:
+            self.metronome_dock.stop()
+        if getattr(self, "tempo_thread", None) is not None:
+            from ui.tempo_detection import stop_tempo_detection
+
+            stop_tempo_detection(self)
         event.accept()
 
+    def show_metronome(self, tempo=None, groove=None):
+        """Show the docked metronome, optionally set to a tempo/groove.
+
+        The dock is created on first use; raises ImportError when the
+        metronome's audio dependencies are missing.
+        """
+        if getattr(self, "metronome_dock", None) is None:
+            from ui.widgets.metronome_dock import MetronomeDock
+
+            self.metronome_dock = MetronomeDock(self)
+            self.addDockWidget(Qt.RightDockWidgetArea, self.metronome_dock)
+        self.metronome_dock.configure(tempo, groove)
+        self.metronome_dock.show()
+        self.metronome_dock.raise_()
+
+    # Window visibility drives the position update rate
+    def changeEvent(self, event):
+        if event.type() == QEvent.WindowStateChange:
+            self._update_clock_visibility()
+        super().changeEvent(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._update_clock_visibility()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._update_clock_visibility()
+
+    def _update_clock_visibility(self):
+        clock = getattr(self, "playback_clock", None)
+        if clock is not None:
+            clock.set_window_visible(self.isVisible() and not self.isMinimized())
+
+    def _on_loop_state_changed(self):
+        clock = getattr(self, "playback_clock", None)
+        if clock is not None:
+            clock.set_looping(self.loop_enabled)
+        waveform = getattr(self, "waveform_view", None)
+        if waveform is not None:
+            if self.loop_enabled:
+                waveform.set_loop_region(self.loop_start_ms, self.loop_end_ms)
+            else:
+                waveform.set_loop_region(None, None)
+
     # Playback Controls
     def play_video(self):
         if not hasattr(self, "media_player"):
@@ -125,6 +189,8 @@ class LessonPlayerApp(QMainWindow):
         self.loop_start_ms = self.media_player.position()
         self._set_status_message("Loop start (A) set")
         self.show_feedback("Loop A set")
+        if hasattr(self, "_on_loop_state_changed"):
+            self._on_loop_state_changed()
 
     def set_loop_end(self):
         if not hasattr(self, "media_player"):
@@ -136,6 +202,8 @@ class LessonPlayerApp(QMainWindow):
         self.loop_end_ms = current_pos
         self._set_status_message("Loop end (B) set")
         self.show_feedback("Loop B set")
+        if hasattr(self, "_on_loop_state_changed"):
+            self._on_loop_state_changed()
 
     def toggle_loop(self):
         if not hasattr(self, "media_player"):
@@ -151,11 +219,18 @@ class LessonPlayerApp(QMainWindow):
             self.loop_enabled = False
             self._set_status_message("Loop disabled")
             self.show_feedback("Loop OFF")
+        if hasattr(self, "_on_loop_state_changed"):
+            self._on_loop_state_changed()
 
     def handle_position_changed(self, pos: int):
-        # Update progress slider if present and not user-dragging
+        # Update progress slider if present and not user-dragging. With a
+        # playback clock the repaint is coalesced to the display rate.
         if hasattr(self, "progress_bar") and not getattr(self, "_progress_bar_dragging", False):
-            self.progress_bar.setValue(pos)
+            clock = getattr(self, "playback_clock", None)
+            if clock is not None:
+                clock.schedule_display(pos)
+            else:
+                self.progress_bar.setValue(pos)
 
         # Apply loop logic when enabled
         if (
@@ -1,18 +1,18 @@
 import json
 from pathlib import Path
-import shutil
-import zipfile
 import subprocess
 import sys
 
 from PyQt5.QtWidgets import QMenuBar, QMenu, QAction, QMessageBox, QApplication, QFileDialog
 from PyQt5.QtCore import QSettings
 
-from ui.searchUpdateDatabase import FolderScannerWindow
-from core.theme_manager import get_available_themes, load_theme
+from core.theme_cache import load_theme
+from core.theme_manager import get_available_themes
 from core.config import USE_VLC_BACKEND
-from core.lesson_sets import export_all_lessons, import_lessons
-from ui.settings_dialog import SettingsDialog
+
+# The scanner, settings dialog, tempo detection, lesson sync, lesson
+# import/export and backup modules are imported when their menu action is first used, to
+# keep them off the startup path (see ``main.py --profile-startup``).
 
 
 def create_menu_bar(parent):
@@ -21,14 +21,10 @@ def create_menu_bar(parent):
     # --- FILE Menu ---
     file_menu = QMenu("File", parent)
 
-    search_media_action = file_menu.addAction(
-        "Search Media", lambda: FolderScannerWindow(parent.db_path, parent).exec_()
-    )
+    search_media_action = file_menu.addAction("Search Media", lambda: open_folder_scanner(parent))
     search_media_action.setShortcut("Ctrl+F")
 
-    manage_folders_action = file_menu.addAction(
-        "Manage Scan Folders", lambda: FolderScannerWindow(parent.db_path, parent).exec_()
-    )
+    manage_folders_action = file_menu.addAction("Manage Scan Folders", lambda: open_folder_scanner(parent))
     manage_folders_action.setShortcut("Ctrl+Shift+F")
 
     # Focus search bar in the master panel (if available)
@@ -119,6 +115,23 @@ def create_menu_bar(parent):
         "Open Metronome", lambda: open_metronome_from_menu(parent)
     )
     open_metronome_action.setShortcut("Ctrl+M")
+    metronome_menu.addAction("Detect Lesson Tempos", lambda: _start_tempo_detection(parent))
+    metronome_menu.addSeparator()
+    sync_action = QAction("Sync to Lesson", parent)
+    sync_action.setCheckable(True)
+
+    def _toggle_sync(enabled: bool) -> None:
+        from ui.lesson_sync import start_lesson_sync, stop_lesson_sync
+
+        if not enabled:
+            stop_lesson_sync(parent)
+        elif not start_lesson_sync(parent):
+            sync_action.setChecked(False)
+
+    sync_action.triggered.connect(_toggle_sync)
+    metronome_menu.addAction(sync_action)
+    parent.lesson_sync_action = sync_action
+    metronome_menu.addAction("Set First Beat Here", lambda: _set_first_beat_here(parent))
 
     menu_bar.addMenu(metronome_menu)
 
@@ -138,6 +151,7 @@ def create_menu_bar(parent):
 
     # --- HELP Menu ---
     help_menu = QMenu("Help", parent)
+    help_menu.addAction("Performance Telemetry...", lambda: open_telemetry_dialog(parent))
     help_menu.addAction("About", lambda: show_about_dialog(parent))
     menu_bar.addMenu(help_menu)
 
@@ -160,10 +174,48 @@ def show_about_dialog(parent):
 
 
 def open_settings_dialog(parent):
+    from ui.settings_dialog import SettingsDialog
+
     dialog = SettingsDialog(parent)
     dialog.exec_()
 
 
+def open_telemetry_dialog(parent):
+    from ui.telemetry_dialog import TelemetryDialog
+
+    TelemetryDialog(parent=parent).exec_()
+
+
+def open_folder_scanner(parent):
+    from ui.searchUpdateDatabase import FolderScannerWindow
+
+    FolderScannerWindow(parent.db_path, parent).exec_()
+
+
+def _set_first_beat_here(parent):
+    from ui.lesson_sync import set_first_beat_here
+
+    set_first_beat_here(parent)
+
+
+def _start_tempo_detection(parent):
+    from ui.tempo_detection import start_tempo_detection
+
+    start_tempo_detection(parent)
+
+
+def _default_metronome_tempo():
+    """App-level default metronome tempo from settings, if configured."""
+    settings = QSettings("bouzouki", "lessonplayer")
+    tempo_val = settings.value("metronome_default_tempo", None)
+    if tempo_val is None:
+        return None
+    try:
+        return int(tempo_val)
+    except (TypeError, ValueError):
+        return None
+
+
 def _build_metronome_cmd_from_settings() -> list:
     """Build the CLI command used to launch the standalone metronome.
 
@@ -171,23 +223,24 @@ def _build_metronome_cmd_from_settings() -> list:
     app-level default tempo when configured.
     """
     cmd = [sys.executable or "python", "-m", "metronome.metronome"]
-    settings = QSettings("bouzouki", "lessonplayer")
-    tempo_val = settings.value("metronome_default_tempo", None)
-    if tempo_val is not None:
-        try:
-            tempo_int = int(tempo_val)
-        except (TypeError, ValueError):
-            tempo_int = None
-        if tempo_int is not None:
-            cmd.extend(["--tempo", str(tempo_int)])
+    tempo_int = _default_metronome_tempo()
+    if tempo_int is not None:
+        cmd.extend(["--tempo", str(tempo_int)])
     return cmd
 
 
 def open_metronome_from_menu(app):
-    """Launch the standalone metronome process from the menu bar."""
-    cmd = _build_metronome_cmd_from_settings()
+    """Show the docked metronome, or launch the standalone process.
+
+    The standalone process is only used when the app cannot host the
+    metronome in-process (e.g. a minimal app object).
+    """
     try:
-        subprocess.Popen(cmd)
+        host = getattr(app, "show_metronome", None)
+        if host is not None:
+            host(tempo=_default_metronome_tempo())
+        else:
+            subprocess.Popen(_build_metronome_cmd_from_settings())
     except Exception as e:
         QMessageBox.warning(
             app,
@@ -226,6 +279,8 @@ def backup_library(app):
     if not target_path:
         return
 
+    import zipfile
+
     try:
         with zipfile.ZipFile(target_path, "w", zipfile.ZIP_DEFLATED) as zf:
             if db_path.exists():
@@ -274,6 +329,9 @@ def restore_library(app):
     if confirm != QMessageBox.Yes:
         return
 
+    import shutil
+    import zipfile
+
     try:
         with zipfile.ZipFile(source_path, "r") as zf:
             # Restore DB
@@ -311,7 +369,7 @@ def restore_library(app):
 
 
 def export_lessons_from_ui(app):
-    if not hasattr(app, "db"):
+    if getattr(app, "db", None) is None:
         QMessageBox.warning(app, "Export Lessons", "No database is loaded.")
         return
 
@@ -325,6 +383,8 @@ def export_lessons_from_ui(app):
     if not target_path:
         return
 
+    from core.lesson_sets import export_all_lessons
+
     try:
         export_all_lessons(app.db, target_path)
         QMessageBox.information(
@@ -341,7 +401,7 @@ def export_lessons_from_ui(app):
 
 
 def import_lessons_from_ui(app):
-    if not hasattr(app, "db"):
+    if getattr(app, "db", None) is None:
         QMessageBox.warning(app, "Import Lessons", "No database is loaded.")
         return
 
@@ -365,6 +425,8 @@ def import_lessons_from_ui(app):
     if confirm != QMessageBox.Yes:
         return
 
+    from core.lesson_sets import import_lessons
+
     try:
         import_lessons(app.db, source_path)
         QMessageBox.information(
@@ -1,3 +1,4 @@
+import logging
 import os
 import sqlite3
 from PyQt5.QtWidgets import (
@@ -22,9 +23,13 @@ from core.database import (
     ensure_lesson_mapping_table,
     get_or_assign_lesson_number,
 )
+from core.log_pipeline import log_context, new_correlation_id
 from core.media_utils import extract_audio_metadata
+from core.telemetry import TELEMETRY
 from ui.widgets.master import update_master_list
 
+logger = logging.getLogger(__name__)
+
 
 def propagate_status_to_app(app_reference, message: str) -> None:
     """Send scan status text to the main app status bar when available."""
@@ -42,7 +47,14 @@ class FolderScannerWorker(QObject):
         self.db_path = db_path
         self.folder = folder
 
+    @TELEMETRY.timed("scan.total")
     def run(self):
+        # Records logged during the scan carry its scan_id.
+        with log_context(scan_id=new_correlation_id()):
+            logger.info("Scanning %s", self.folder)
+            self._scan()
+
+    def _scan(self):
         conn = connect_to_db(self.db_path)
         ensure_lesson_mapping_table(conn)
 
@@ -50,17 +62,18 @@ class FolderScannerWorker(QObject):
         skipped = 0
         files_to_process = []
 
-        for root, _, files in os.walk(self.folder):
-            # Always ignore any directory named "Downloads" (and its subtrees)
-            # to avoid scanning typical download locations.
-            parts = os.path.normpath(root).split(os.sep)
-            if "Downloads" in parts:
-                self.status.emit(f"Ignoring Downloads folder: {root}")
-                continue
+        with TELEMETRY.timer("scan.walk"):
+            for root, _, files in os.walk(self.folder):
+                # Always ignore any directory named "Downloads" (and its subtrees)
+                # to avoid scanning typical download locations.
+                parts = os.path.normpath(root).split(os.sep)
+                if "Downloads" in parts:
+                    self.status.emit(f"Ignoring Downloads folder: {root}")
+                    continue
 
-            for file in files:
-                if file.lower().endswith((".mp4", ".mkv", ".mp3")):
-                    files_to_process.append(os.path.join(root, file))
+                for file in files:
+                    if file.lower().endswith((".mp4", ".mkv", ".mp3")):
+                        files_to_process.append(os.path.join(root, file))
 
         total = len(files_to_process)
 
@@ -84,24 +97,27 @@ class FolderScannerWorker(QObject):
                 lesson_name = folder_name.replace("_", " ").strip()
 
             # Extract media info
-            duration, bitrate = extract_audio_metadata(file_path)
+            with TELEMETRY.timer("scan.probe"):
+                duration, bitrate = extract_audio_metadata(file_path)
 
             try:
-                insert_lesson(
-                    conn,
-                    lesson_number,
-                    lesson_name,
-                    os.path.basename(file_path),
-                    file_path,
-                    duration,
-                    bitrate,
-                )
+                with TELEMETRY.timer("scan.db_insert"):
+                    insert_lesson(
+                        conn,
+                        lesson_number,
+                        lesson_name,
+                        os.path.basename(file_path),
+                        file_path,
+                        duration,
+                        bitrate,
+                    )
                 added += 1
                 self.status.emit(f"✅ Added: {file_path}")
             except sqlite3.IntegrityError:
                 skipped += 1
                 self.status.emit(f"⏭️ Skipped (duplicate): {file_path}")
             except Exception as e:
+                logger.exception("Could not add %s", file_path)
                 self.status.emit(f"❌ Error: {file_path} -> {e}")
 
             self.progress.emit(int(i / total * 100))
@@ -13,6 +13,9 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import QSettings
 
+from core.playback_clock import DEFAULT_INTERVAL_MS, LOOP_INTERVAL_MS
+from core.telemetry import TELEMETRY
+
 
 class SettingsDialog(QDialog):
     """Application settings for paths, audio, scan folders, metronome, and telemetry."""
@@ -67,6 +70,21 @@ class SettingsDialog(QDialog):
         daw_row.addWidget(self.daw_command_edit, 1)
         layout.addLayout(daw_row)
 
+        # Playback position updates (progress slider refresh rate)
+        position_row = QHBoxLayout()
+        position_row.addWidget(QLabel("Position update interval (ms):"))
+        self.position_interval_spin = QSpinBox()
+        self.position_interval_spin.setRange(10, 1000)
+        position_row.addWidget(self.position_interval_spin)
+        layout.addLayout(position_row)
+
+        loop_position_row = QHBoxLayout()
+        loop_position_row.addWidget(QLabel("Position update interval during A-B loops (ms):"))
+        self.loop_position_interval_spin = QSpinBox()
+        self.loop_position_interval_spin.setRange(5, 500)
+        loop_position_row.addWidget(self.loop_position_interval_spin)
+        layout.addLayout(loop_position_row)
+
         # Metronome options
         metronome_row = QHBoxLayout()
         metronome_row.addWidget(QLabel("Metronome default tempo (BPM):"))
@@ -141,6 +159,20 @@ class SettingsDialog(QDialog):
             tempo = 120
         self.metronome_tempo_spin.setValue(tempo)
 
+        position_interval = self.settings.value("position_update_interval_ms", DEFAULT_INTERVAL_MS)
+        try:
+            position_interval = int(position_interval)
+        except (TypeError, ValueError):
+            position_interval = DEFAULT_INTERVAL_MS
+        self.position_interval_spin.setValue(position_interval)
+
+        loop_interval = self.settings.value("loop_position_update_interval_ms", LOOP_INTERVAL_MS)
+        try:
+            loop_interval = int(loop_interval)
+        except (TypeError, ValueError):
+            loop_interval = LOOP_INTERVAL_MS
+        self.loop_position_interval_spin.setValue(loop_interval)
+
         sound_profile = self.settings.value("metronome_sound_profile", "classic")
         if sound_profile not in ("classic", "soft", "wood", "clave", "metal"):
             sound_profile = "classic"
@@ -183,10 +215,16 @@ class SettingsDialog(QDialog):
         self.settings.setValue("audio_device_name", self.audio_device_edit.text().strip())
         self.settings.setValue("external_player_command", self.external_player_edit.text().strip())
         self.settings.setValue("daw_command", self.daw_command_edit.text().strip())
+        self.settings.setValue("position_update_interval_ms", self.position_interval_spin.value())
+        self.settings.setValue("loop_position_update_interval_ms", self.loop_position_interval_spin.value())
+        clock = getattr(self.parent(), "playback_clock", None)
+        if clock is not None:
+            clock.configure(self.settings)
         self.settings.setValue("metronome_default_tempo", self.metronome_tempo_spin.value())
         self.settings.setValue("metronome_sound_profile", self.metronome_sound_combo.currentData())
         self.settings.setValue("metronome_count_in_enabled", self.metronome_count_in_check.isChecked())
         self.settings.setValue("low_speed_eq_enabled", self.low_speed_eq_check.isChecked())
         self.settings.setValue("telemetry_enabled", self.telemetry_check.isChecked())
+        TELEMETRY.configure(self.settings)
         self.settings.setValue("compact_layout_enabled", self.compact_layout_check.isChecked())
         self.settings.setValue("language_code", self.language_combo.currentData())
@@ -0,0 +1,89 @@
+from PyQt5.QtWidgets import (
+    QDialog,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
+    QDialogButtonBox,
+)
+from PyQt5.QtCore import Qt
+
+from core.telemetry import PERCENTILES, TELEMETRY
+
+
+class TelemetryDialog(QDialog):
+    """Percentiles of the timings recorded this session."""
+
+    COLUMNS = ["Timer", "Count"] + [f"p{pct} (ms)" for pct in PERCENTILES] + ["Max (ms)"]
+
+    def __init__(self, telemetry=TELEMETRY, parent=None):
+        super().__init__(parent)
+        self.telemetry = telemetry
+        self.setWindowTitle("Performance Telemetry")
+        self.resize(640, 360)
+        self._init_ui()
+        self.refresh()
+
+    def _init_ui(self):
+        layout = QVBoxLayout(self)
+
+        self.status_label = QLabel()
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.table, 1)
+
+        button_row = QHBoxLayout()
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh)
+        button_row.addWidget(refresh_btn)
+        flush_btn = QPushButton("Save to Disk")
+        flush_btn.clicked.connect(self._flush)
+        button_row.addWidget(flush_btn)
+        clear_btn = QPushButton("Clear")
+        clear_btn.clicked.connect(self._clear)
+        button_row.addWidget(clear_btn)
+        button_row.addStretch(1)
+        layout.addLayout(button_row)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def refresh(self):
+        summary = self.telemetry.summary()
+        self.table.setRowCount(len(summary))
+        for row, (name, stats) in enumerate(summary.items()):
+            values = [name, str(stats["count"])]
+            values += [f"{stats[f'p{pct}']:.2f}" for pct in PERCENTILES]
+            values.append(f"{stats['max']:.2f}")
+            for col, text in enumerate(values):
+                item = QTableWidgetItem(text)
+                if col:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, col, item)
+
+        if not self.telemetry.enabled:
+            self.status_label.setText(
+                "Telemetry is off. Enable local usage telemetry in Settings to record timings."
+            )
+        else:
+            self.status_label.setText(f"Samples are saved to {self.telemetry.log_path()}")
+
+    def _flush(self):
+        self.telemetry.flush()
+        self.refresh()
+
+    def _clear(self):
+        # Keep samples that have not been written yet.
+        self.telemetry.flush()
+        self.telemetry.clear()
+        self.refresh()
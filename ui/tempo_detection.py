@@ -0,0 +1,119 @@
+import logging
+
+from PyQt5.QtCore import QThread, pyqtSignal, QObject
+from PyQt5.QtWidgets import QMessageBox
+
+from core.database import connect_to_db
+from core.pcm_stream import PcmDecodeError
+from core.tempo_detection import (
+    detect_file_tempo,
+    ensure_tempo_columns,
+    lessons_missing_tempo,
+    store_detected_tempo,
+)
+from ui.widgets.master import update_master_list
+
+logger = logging.getLogger(__name__)
+
+
+class TempoDetectionWorker(QObject):
+    """Estimate and store tempos for every lesson that has none yet."""
+
+    progress = pyqtSignal(int)
+    status = pyqtSignal(str)
+    finished = pyqtSignal(int, int)
+
+    def __init__(self, db_path):
+        super().__init__()
+        self.db_path = db_path
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        conn = connect_to_db(self.db_path)
+        detected = 0
+        failed = 0
+        try:
+            ensure_tempo_columns(conn)
+            files = lessons_missing_tempo(conn)
+            total = len(files)
+            if total == 0:
+                self.status.emit("All lessons already have a tempo.")
+                self.progress.emit(100)
+                return
+
+            for i, file_path in enumerate(files, 1):
+                if self._cancelled:
+                    self.status.emit("Tempo detection cancelled.")
+                    break
+                # An exception escaping this slot would abort the app:
+                # a file that cannot be analysed or stored counts as failed.
+                try:
+                    estimate = detect_file_tempo(file_path)
+                    if estimate is None:
+                        failed += 1
+                        self.status.emit(f"⏭️ No tempo found: {file_path}")
+                    elif store_detected_tempo(conn, file_path, estimate):
+                        detected += 1
+                        self.status.emit(
+                            f"✅ {round(estimate.bpm)} BPM "
+                            f"({estimate.confidence:.0%} confidence): {file_path}"
+                        )
+                except PcmDecodeError as e:
+                    failed += 1
+                    logger.warning("Tempo detection failed for %s: %s", file_path, e)
+                    self.status.emit(f"⏭️ No tempo found: {file_path}")
+                except Exception as e:
+                    failed += 1
+                    logger.exception("Tempo detection failed for %s", file_path)
+                    self.status.emit(f"❌ Error: {file_path} -> {e}")
+                self.progress.emit(int(i / total * 100))
+        finally:
+            conn.close()
+            self.finished.emit(detected, failed)
+
+
+def start_tempo_detection(app):
+    """Run tempo detection for the library on a lowest-priority thread."""
+    running = getattr(app, "tempo_thread", None)
+    if running is not None and running.isRunning():
+        QMessageBox.information(app, "Tempo Detection", "Tempo detection is already running.")
+        return
+
+    worker = TempoDetectionWorker(app.db_path)
+    thread = QThread()
+    worker.moveToThread(thread)
+
+    thread.started.connect(worker.run)
+    if hasattr(app, "_set_status_message"):
+        worker.status.connect(app._set_status_message)
+    worker.finished.connect(lambda detected, failed: _detection_complete(app, detected, failed))
+    worker.finished.connect(thread.quit)
+    worker.finished.connect(worker.deleteLater)
+    thread.finished.connect(thread.deleteLater)
+
+    app.tempo_worker = worker
+    app.tempo_thread = thread
+    thread.start(QThread.LowestPriority)
+
+
+def stop_tempo_detection(app, timeout_ms=2000):
+    """Ask a running detection job to stop after the current file."""
+    worker = getattr(app, "tempo_worker", None)
+    thread = getattr(app, "tempo_thread", None)
+    if worker is not None:
+        worker.cancel()
+    if thread is not None and thread.isRunning():
+        thread.quit()
+        thread.wait(timeout_ms)
+
+
+def _detection_complete(app, detected, failed):
+    app.tempo_worker = None
+    app.tempo_thread = None
+    summary = f"Tempo detection finished. Detected: {detected}, Not found: {failed}"
+    if hasattr(app, "_set_status_message"):
+        app._set_status_message(summary)
+    update_master_list(app)
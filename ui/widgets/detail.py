@@ -18,16 +18,21 @@ from PyQt5.QtWidgets import (
     QSizePolicy,
     QFileDialog,
 )
-from PyQt5.QtGui import QPixmap
 from PyQt5.QtCore import QUrl, Qt, QTimer, QSettings
 from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
-from PyQt5.QtMultimediaWidgets import QVideoWidget
 
-from core.vlc_player import VlcMediaPlayer, VlcUnavailableError
+from core.image_cache import IMAGE_CACHE
+from core.log_pipeline import bind_log_context, new_correlation_id
+from core.telemetry import TELEMETRY
 from ui.widgets.player_controls import init_player_controls
 
 logger = logging.getLogger(__name__)
 
+# Rescale the placeholder logo once resizing pauses for this long.
+PLACEHOLDER_RESIZE_DEBOUNCE_MS = 60
+# Placeholder sizes are rounded down to this many pixels (see ImageCache).
+PLACEHOLDER_SIZE_BUCKET = 16
+
 
 def _should_use_vlc_backend() -> bool:
     settings = QSettings("bouzouki", "lessonplayer")
@@ -52,60 +57,51 @@ def create_detail_panel(app):
     video_layout.setContentsMargins(6, 6, 6, 4)
     video_layout.setSpacing(6)
 
-    app.video_widget = QVideoWidget()
     app.media_player = QMediaPlayer()
-
-    # Optional VLC backend for audio/video (pitch-preserving time-stretch)
+    # The video widget and the optional VLC engine are created on first
+    # playback (``ensure_video_output``), off the startup path.
+    app.video_widget = None
     app.vlc_player = None
-    if _should_use_vlc_backend():
-        try:
-            app.vlc_player = VlcMediaPlayer()
-            app.media_player.setVolume(0)
-
-            def _attach_vlc_video():
-                try:
-                    window_id = int(app.video_widget.winId())
-                    app.vlc_player.set_video_output(window_id)
-                    logger.info("VLC backend enabled for audio/video playback")
-                except Exception:
-                    logger.exception("Failed to attach VLC video output; falling back to Qt video")
-                    app.vlc_player = None
-                    app.media_player.setVolume(70)
-                    app.media_player.setVideoOutput(app.video_widget)
-
-            # Delay attachment until the widget has a valid native handle
-            QTimer.singleShot(0, _attach_vlc_video)
-        except VlcUnavailableError:
-            app.vlc_player = None
-            logger.warning("VLC backend requested but unavailable; falling back to QMediaPlayer")
-            QTimer.singleShot(100, lambda: app.media_player.setVideoOutput(app.video_widget))
-    else:
-        QTimer.singleShot(100, lambda: app.media_player.setVideoOutput(app.video_widget))
+    app.video_layout = video_layout
 
     app.placeholder_label = QLabel()
     app.placeholder_label.setAlignment(Qt.AlignCenter)
     app.placeholder_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
     def resize_placeholder():
-        target_height = int(video_container.height() * 0.45)
-        target_width = video_container.width()
-        scaled_pixmap = QPixmap("resources/bouzouki.png").scaled(
-            target_width,
-            target_height,
-            Qt.KeepAspectRatio,
-            Qt.SmoothTransformation,
-        )
-        app.placeholder_label.setPixmap(scaled_pixmap)
-
+        if not app.placeholder_label.isVisible():
+            return
+        app.placeholder_label.setPixmap(IMAGE_CACHE.pixmap(
+            "bouzouki.png",
+            video_container.width(),
+            int(video_container.height() * 0.45),
+            bucket=PLACEHOLDER_SIZE_BUCKET,
+        ))
+
+    # Live resizes (window or splitter drags) only restart the timer; the
+    # label keeps its current pixmap until the size settles.
+    placeholder_timer = QTimer(video_container)
+    placeholder_timer.setSingleShot(True)
+    placeholder_timer.setInterval(PLACEHOLDER_RESIZE_DEBOUNCE_MS)
+    placeholder_timer.timeout.connect(resize_placeholder)
     QTimer.singleShot(0, resize_placeholder)
-    video_container.resizeEvent = lambda event: resize_placeholder()
+    video_container.resizeEvent = lambda event: placeholder_timer.start()
 
     video_layout.addWidget(app.placeholder_label)
-    video_layout.addWidget(app.video_widget)
 
     controls = init_player_controls(app)
     video_layout.addLayout(controls)
 
+    # Waveform overview under the transport controls. Its peak service
+    # (numpy, worker process) is loaded with the first lesson.
+    from ui.widgets.waveform import WaveformView
+
+    app.waveform_view = WaveformView()
+    app.waveform_view.seek_callback = lambda pos: app.seek_scheduler.commit(pos)
+    app.playback_clock.display_position.connect(app.waveform_view.set_position)
+    app.media_player.durationChanged.connect(app.waveform_view.set_duration)
+    video_layout.addWidget(app.waveform_view)
+
     # Practice preset / metronome status label just below the controls.
     app.practice_status_label = QLabel("")
     app.practice_status_label.setAlignment(Qt.AlignLeft)
@@ -114,9 +110,9 @@ def create_detail_panel(app):
 
     # Make the video area consume most of the vertical space, keeping
     # controls and status compact at the bottom.
-    video_layout.setStretch(0, 5)  # placeholder/video region
-    video_layout.setStretch(1, 5)
-    video_layout.setStretch(2, 0)  # controls
+    video_layout.setStretch(0, 5)  # placeholder (the video widget is inserted after it)
+    video_layout.setStretch(1, 0)  # controls
+    video_layout.setStretch(2, 0)  # waveform
     video_layout.setStretch(3, 0)  # status label
 
     splitter.addWidget(video_container)
@@ -127,6 +123,7 @@ def create_detail_panel(app):
     app.video_list.customContextMenuRequested.connect(lambda pos: show_context_menu(app, pos))
 
     def on_video_selected(item):
+        ensure_video_output(app)
         app.placeholder_label.hide()
         app.video_widget.show()
         apply_practice_preset(app, item)
@@ -143,7 +140,6 @@ def create_detail_panel(app):
         int(splitter.height() * 0.3),
     ]))
 
-    app.video_widget.hide()
     app.placeholder_label.show()
 
     def keyPressEvent(event):
@@ -167,6 +163,44 @@ def create_detail_panel(app):
     return widget
 
 
+def ensure_video_output(app):
+    """Create the video widget, and the VLC engine if enabled, on first use."""
+    if getattr(app, "video_widget", None) is not None:
+        return app.video_widget
+
+    from PyQt5.QtMultimediaWidgets import QVideoWidget
+
+    app.video_widget = QVideoWidget()
+    app.video_layout.insertWidget(1, app.video_widget, 5)
+
+    # Optional VLC backend for audio/video (pitch-preserving time-stretch)
+    app.vlc_player = None
+    if _should_use_vlc_backend():
+        # python-vlc loads libvlc; only pay for it when the backend is on.
+        from core.vlc_player import VlcMediaPlayer, VlcUnavailableError
+
+        try:
+            app.vlc_player = VlcMediaPlayer()
+            app.media_player.setVolume(0)
+            # winId() creates the native handle VLC renders into.
+            window_id = int(app.video_widget.winId())
+            app.vlc_player.set_video_output(window_id)
+            logger.info("VLC backend enabled for audio/video playback")
+        except VlcUnavailableError:
+            app.vlc_player = None
+            logger.warning("VLC backend requested but unavailable; falling back to QMediaPlayer")
+        except Exception:
+            logger.exception("Failed to attach VLC video output; falling back to Qt video")
+            app.vlc_player = None
+            app.media_player.setVolume(70)
+    if app.vlc_player is None:
+        app.media_player.setVideoOutput(app.video_widget)
+    elif hasattr(app, "apply_transposition"):
+        # Speed and pitch may have been chosen before VLC existed.
+        app.apply_transposition()
+    return app.video_widget
+
+
 def extract_lesson_number_from_item(item):
     try:
         value = item.data(Qt.UserRole)
@@ -211,7 +245,7 @@ def update_detail_view(app, item):
 
 def apply_practice_preset(app, item):
     """Apply any saved practice preset for this media item to the player state."""
-    if not hasattr(app, "db"):
+    if getattr(app, "db", None) is None:
         return
     file_path = item.data(Qt.UserRole)
     if not file_path:
@@ -259,6 +293,7 @@ def apply_practice_preset(app, item):
         app._set_status_message(status_text)
 
 
+@TELEMETRY.timed("media.open")
 def play_selected_video(app, item):
     file_path = item.data(Qt.UserRole)
     if not file_path:
@@ -268,7 +303,25 @@ def play_selected_video(app, item):
         QMessageBox.warning(app, "Error", f"File not found:\n{file_path}")
         return
 
+    app.current_file_path = file_path
+    # Later records from the GUI thread carry this playback session's id;
+    # the player keeps it for callbacks on libvlc's threads.
+    playback_id = new_correlation_id()
+    bind_log_context(playback_id=playback_id)
+    logger.info("Opening %s", file_path)
+    if hasattr(app, "video_layout"):
+        ensure_video_output(app)
+    if getattr(app, "vlc_player", None) is not None:
+        app.vlc_player.playback_id = playback_id
     app.media_player.setMedia(QMediaContent(QUrl.fromLocalFile(file_path)))
+    if getattr(app, "lesson_sync", None) is not None:
+        from ui.lesson_sync import refresh_lesson_sync
+
+        refresh_lesson_sync(app)
+    if hasattr(app, "scrub_preview"):
+        app.scrub_preview.set_media(file_path)
+    if hasattr(app, "waveform_view"):
+        app.waveform_view.set_media(file_path)
 
     if getattr(app, "vlc_player", None):
         app.vlc_player.set_media(file_path)
@@ -302,7 +355,7 @@ def open_file_in_explorer(app, item):
 def open_metronome_for_item(app, item):
     """Launch the metronome app pre-configured for this lesson if possible."""
     file_path = item.data(Qt.UserRole)
-    if not file_path or not hasattr(app, "db"):
+    if not file_path or getattr(app, "db", None) is None:
         return
 
     tempo_arg = None
@@ -343,7 +396,12 @@ def open_metronome_for_item(app, item):
         cmd.extend(["--groove", groove_arg])
 
     try:
-        subprocess.Popen(cmd)
+        host = getattr(app, "show_metronome", None)
+        if host is not None:
+            # In-process dock: no new interpreter, instant after first use.
+            host(tempo=int(tempo_arg) if tempo_arg is not None else None, groove=groove_arg)
+        else:
+            subprocess.Popen(cmd)
         label = "Metronome"
         if tempo_arg is not None:
             label += f" {tempo_arg} BPM"
@@ -492,7 +550,7 @@ def delete_file(app, item):
 def edit_metadata(app, item):
     """Basic metadata editor for a lesson entry (title, tempo, tags)."""
     file_path = item.data(Qt.UserRole)
-    if not file_path or not hasattr(app, "db"):
+    if not file_path or getattr(app, "db", None) is None:
         return
 
     row = app.db.get_lesson_metadata(file_path)
@@ -600,7 +658,7 @@ def relink_file(app, item):
 
 def save_practice_preset(app, item):
     """Persist the current practice configuration for this media item."""
-    if not hasattr(app, "db"):
+    if getattr(app, "db", None) is None:
         return
     file_path = item.data(Qt.UserRole)
     if not file_path:
@@ -651,7 +709,7 @@ def save_practice_preset(app, item):
 
 def reset_practice_preset(app, item):
     """Clear any saved practice preset for this media item."""
-    if not hasattr(app, "db"):
+    if getattr(app, "db", None) is None:
         return
     file_path = item.data(Qt.UserRole)
     if not file_path:
@@ -9,11 +9,17 @@ from PyQt5.QtWidgets import (
     QPushButton,
     QMessageBox,
 )
-from PyQt5.QtGui import QPixmap, QIcon, QCursor
-from PyQt5.QtCore import Qt
-import os
+from PyQt5.QtGui import QCursor, QColor
+from PyQt5.QtCore import Qt, QTimer
+from core.image_cache import IMAGE_CACHE
+from core.telemetry import TELEMETRY
 from ui.widgets.detail import update_detail_view
 
+# Placeholder rows shown while the lesson database opens.
+SKELETON_ROWS = 12
+# Lessons added per event-loop turn when the list is filled progressively.
+MASTER_LIST_CHUNK = 200
+
 
 def create_master_panel(app):
     widget = QWidget()
@@ -24,16 +30,14 @@ def create_master_panel(app):
 
     # Clickable logo
     logo_label = QLabel()
-    icon_path = os.path.join(os.path.dirname(__file__), "..", "..", "resources", "bouzouki.png")
-    pixmap = QPixmap(icon_path).scaledToHeight(30, Qt.SmoothTransformation)
-    logo_label.setPixmap(pixmap)
+    logo_label.setPixmap(IMAGE_CACHE.pixmap("bouzouki.png", height=30))
     logo_label.setCursor(QCursor(Qt.PointingHandCursor))
     logo_label.setToolTip("About Bouzouki Lesson Player")
     logo_label.mousePressEvent = lambda event: show_about_dialog(app)
     top_row.addWidget(logo_label)
 
     # Search bar with icon (search + clear)
-    search_icon = QIcon(os.path.join(os.path.dirname(__file__), "..", "..", "resources", "search.png"))
+    search_icon = IMAGE_CACHE.icon("search.png")
     app.search_bar = QLineEdit()
     app.search_bar.setPlaceholderText("Search lessons or videos...")
     app.search_bar.setClearButtonEnabled(True)
@@ -54,9 +58,8 @@ def create_master_panel(app):
     top_row.addWidget(search_icon_label)
 
     # Voice search button (placeholder)
-    voice_icon_path = os.path.join(os.path.dirname(__file__), "..", "..", "resources", "microphone.png")
     voice_btn = QPushButton()
-    voice_btn.setIcon(QIcon(voice_icon_path))
+    voice_btn.setIcon(IMAGE_CACHE.icon("microphone.png"))
     voice_btn.setFixedSize(30, 30)
     voice_btn.setCursor(QCursor(Qt.PointingHandCursor))
     voice_btn.setToolTip("Voice search (coming soon)")
@@ -81,9 +84,30 @@ def format_lesson_label(lesson_number, lesson_name):
     return f"{lesson_number}: {lesson_name}" if lesson_number else lesson_name
 
 
-def update_master_list(app):
+def show_master_skeleton(app, message="Loading lessons…"):
+    """Fill the master list with disabled placeholder rows."""
+    app.master_list.clear()
+    for row in range(SKELETON_ROWS):
+        item = QListWidgetItem(message if row == 0 else "▬" * (8 + (row * 5) % 11))
+        item.setFlags(Qt.NoItemFlags)
+        if row:
+            item.setForeground(QColor(128, 128, 128, 90))
+        app.master_list.addItem(item)
+
+
+def update_master_list(app, chunk_size=None, on_done=None):
+    """Show the lessons matching the search bar.
+
+    With ``chunk_size`` the rows are added ``chunk_size`` at a time from the
+    event loop, so a large library does not block the window; a newer call
+    cancels a fill that is still running.
+    """
+    if getattr(app, "db", None) is None:
+        # The database is still opening (deferred start-up).
+        return
     search_query = app.search_bar.text().strip()
-    lessons = app.db.fetch_lessons(search_query or None)
+    with TELEMETRY.timer("db.fetch_lessons"):
+        lessons = app.db.fetch_lessons(search_query or None)
 
     # Preserve current selection by lesson_number if possible
     selected_number = None
@@ -91,6 +115,8 @@ def update_master_list(app):
     if current_item is not None:
         selected_number = current_item.data(Qt.UserRole)
 
+    generation = getattr(app, "_master_list_generation", 0) + 1
+    app._master_list_generation = generation
     app.master_list.clear()
 
     if not lessons:
@@ -100,8 +126,30 @@ def update_master_list(app):
         placeholder = QListWidgetItem(placeholder_text)
         placeholder.setFlags(placeholder.flags() & ~Qt.ItemIsSelectable & ~Qt.ItemIsEnabled)
         app.master_list.addItem(placeholder)
+        if on_done is not None:
+            on_done()
+        return
+
+    if chunk_size is None:
+        _add_lesson_items(app, lessons, selected_number)
+        if on_done is not None:
+            on_done()
         return
 
+    def _add_chunk(start):
+        if app._master_list_generation != generation:
+            return  # superseded by a newer search
+        _add_lesson_items(app, lessons[start:start + chunk_size], selected_number)
+        if start + chunk_size < len(lessons):
+            QTimer.singleShot(0, lambda: _add_chunk(start + chunk_size))
+        elif on_done is not None:
+            on_done()
+
+    _add_chunk(0)
+
+
+@TELEMETRY.timed("ui.master_list_fill")
+def _add_lesson_items(app, lessons, selected_number):
     for lesson_number, lesson_name in lessons:
         label = format_lesson_label(lesson_number, lesson_name)
         item = QListWidgetItem(label)
@@ -1,30 +1,74 @@
+import logging
+
 from core.database_manager import DatabaseManager
-from PyQt5.QtWidgets import QSplitter
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QSplitter, QMessageBox
+from PyQt5.QtCore import Qt, QTimer
 
 from core.database import connect_to_db
-from ui.widgets.master import create_master_panel, update_master_list
+from core.startup_profiler import get_profiler
+from ui.widgets.master import (
+    MASTER_LIST_CHUNK,
+    create_master_panel,
+    show_master_skeleton,
+    update_master_list,
+)
 from ui.widgets.detail import create_detail_panel
 
+logger = logging.getLogger(__name__)
+
+
+def init_master_detail(app, deferred=False):
+    """Build the lesson list and detail panels.
 
-def init_master_detail(app):
+    By default the database is opened and the list filled before this
+    returns. With ``deferred=True`` (used by the main window) the list
+    shows a skeleton, and the database opens and the list fills in
+    chunks from the event loop once the window is up.
+    """
+    profiler = get_profiler()
+    # Actions that need the database check for None until it is open
+    # (or for good, if opening it failed).
+    app.db = None
     splitter = QSplitter(Qt.Horizontal)
     splitter.setHandleWidth(4)
 
     # Left Panel
-    master_panel = create_master_panel(app)
+    with profiler.phase("master_panel"):
+        master_panel = create_master_panel(app)
     splitter.addWidget(master_panel)
 
     # Right Panel (creates and assigns app.right_panel_layout inside)
-    detail_panel = create_detail_panel(app)
+    with profiler.phase("detail_panel"):
+        detail_panel = create_detail_panel(app)
     splitter.addWidget(detail_panel)
 
     # Bias layout so the detail view gets more space on wide screens
     splitter.setStretchFactor(0, 1)
     splitter.setStretchFactor(1, 2)
 
+    if deferred:
+        show_master_skeleton(app)
+        QTimer.singleShot(0, lambda: open_database(app))
+        return splitter
+
     # Connect to DB and populate UI
-    app.db = DatabaseManager(app.db_path)
-    update_master_list(app)
+    with profiler.phase("db_open"):
+        app.db = DatabaseManager(app.db_path)
+    with profiler.phase("lesson_list"):
+        update_master_list(app)
 
     return splitter
+
+
+def open_database(app):
+    """Open the lesson database and fill the list progressively."""
+    profiler = get_profiler()
+    try:
+        with profiler.phase("db_open"):
+            app.db = DatabaseManager(app.db_path)
+    except Exception as e:
+        logger.exception("Could not open lesson database %s", app.db_path)
+        show_master_skeleton(app, "Lesson database unavailable")
+        QMessageBox.warning(app, "Database Error", f"Could not open the lesson database:\n{e}")
+        return
+    update_master_list(app, chunk_size=MASTER_LIST_CHUNK, on_done=lambda: profiler.mark("lesson_list_filled"))
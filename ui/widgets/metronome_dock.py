@@ -0,0 +1,35 @@
+# ui/widgets/metronome_dock.py
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QDockWidget
+
+
+class MetronomeDock(QDockWidget):
+    """Dockable, in-process host for the metronome UI.
+
+    The metronome module (and its audio dependencies) is imported on
+    first use only, so the player starts as fast as before; after that,
+    showing the metronome is instant. The standalone
+    ``python -m metronome.metronome`` entry point is unchanged.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__("Metronome", parent)
+        self.setObjectName("metronomeDock")
+        self.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea)
+        # Raises ImportError when numpy/simpleaudio are missing.
+        from metronome.metronome import MetronomeUI
+
+        self.metronome = MetronomeUI()
+        self.setWidget(self.metronome)
+
+    def configure(self, tempo=None, groove=None):
+        self.metronome.configure(tempo, groove)
+
+    def stop(self):
+        self.metronome.stop()
+
+    def closeEvent(self, event):
+        # Closing the dock silences the metronome like closing its window.
+        self.stop()
+        super().closeEvent(event)
@@ -1,46 +1,93 @@
 # ui/widgets/player_controls.py
 
-from PyQt5.QtWidgets import QHBoxLayout, QPushButton, QLabel, QSlider, QVBoxLayout
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication, QHBoxLayout, QPushButton, QLabel, QSlider, QVBoxLayout
+from PyQt5.QtCore import Qt, QSettings
 
 from core.media_utils import HALF_TONE_UP_FACTOR
+from core.seek_scheduler import SeekScheduler
+from ui.widgets.scrub_preview import ScrubPreview
+from core.playback_clock import PlaybackClock
+
+
+def _create_playback_clock(app):
+    clock = PlaybackClock(app.media_player, parent=app.progress_bar)
+    clock.configure(QSettings("bouzouki", "lessonplayer"))
+    screen = QApplication.primaryScreen() if QApplication.instance() else None
+    if screen is not None:
+        clock.set_refresh_rate(screen.refreshRate())
+    clock.display_position.connect(lambda pos: update_position_display(app, pos))
+    return clock
 
 
 def init_player_controls(app):
     layout = QVBoxLayout()
 
     # Progress Slider
+    progress_row = QHBoxLayout()
     app.progress_bar = QSlider(Qt.Horizontal)
     app.progress_bar.setMinimum(0)
-    def _on_slider_moved(pos: int):
+    app.position_label = QLabel(format_position_label(0, 0))
+    app.position_label.setObjectName("positionLabel")
+
+    def _fast_seek(pos: int):
+        # While dragging only the engine whose picture is visible is
+        # seeked. With VLC active the Qt player is muted and hidden, so
+        # it catches up with the precise seek on release.
+        vlc_obj = getattr(app, "vlc_player", None)
+        if vlc_obj is not None and hasattr(vlc_obj, "set_position_ms"):
+            vlc_obj.set_position_ms(pos)
+        elif hasattr(app, "media_player"):
+            app.media_player.setPosition(pos)
+
+    def _precise_seek(pos: int):
         # Always update the Qt media player position so existing loop
         # and positionChanged logic continue to work.
         if hasattr(app, "media_player"):
             app.media_player.setPosition(pos)
         # When VLC backend is active, also seek the VLC player so the
         # visible video follows the slider.
-        if hasattr(app, "vlc_player") and getattr(app, "vlc_player", None):
-            vlc_obj = app.vlc_player
-            if hasattr(vlc_obj, "set_position_ms"):
-                vlc_obj.set_position_ms(pos)
+        vlc_obj = getattr(app, "vlc_player", None)
+        if vlc_obj is not None and hasattr(vlc_obj, "set_position_ms"):
+            vlc_obj.set_position_ms(pos)
+
+    app.seek_scheduler = SeekScheduler(_fast_seek, _precise_seek, parent=app.progress_bar)
+    app.progress_bar.sliderMoved.connect(app.seek_scheduler.request)
+    app.progress_bar.sliderMoved.connect(
+        lambda pos: app.position_label.setText(format_position_label(pos, app.progress_bar.maximum()))
+    )
 
-    app.progress_bar.sliderMoved.connect(_on_slider_moved)
     def _start_slider_drag():
         setattr(app, "_progress_bar_dragging", True)
 
     def _end_slider_drag():
         setattr(app, "_progress_bar_dragging", False)
+        pos = app.progress_bar.value()
+        app.seek_scheduler.commit(pos)
         if hasattr(app, "handle_position_changed") and hasattr(app, "media_player"):
-            app.handle_position_changed(app.media_player.position())
+            app.handle_position_changed(pos)
+            app.playback_clock.flush()
 
     app.progress_bar.sliderPressed.connect(_start_slider_drag)
     app.progress_bar.sliderReleased.connect(_end_slider_drag)
+
+    # Position updates run through a clock that adapts the notify rate
+    # and repaints the slider/label at most once per display frame.
+    app.playback_clock = _create_playback_clock(app)
     if hasattr(app, "handle_position_changed"):
         app.media_player.positionChanged.connect(app.handle_position_changed)
     else:
-        app.media_player.positionChanged.connect(lambda pos: app.progress_bar.setValue(pos))
-    app.media_player.durationChanged.connect(lambda dur: app.progress_bar.setMaximum(dur))
-    layout.addWidget(app.progress_bar)
+        app.media_player.positionChanged.connect(app.playback_clock.schedule_display)
+
+    def _on_duration_changed(dur: int):
+        app.progress_bar.setMaximum(dur)
+        app.position_label.setText(format_position_label(app.progress_bar.value(), dur))
+
+    app.media_player.durationChanged.connect(_on_duration_changed)
+    # Thumbnail strip preview while hovering or dragging the slider
+    app.scrub_preview = ScrubPreview(app.progress_bar)
+    progress_row.addWidget(app.progress_bar, 1)
+    progress_row.addWidget(app.position_label)
+    layout.addLayout(progress_row)
 
     # Controls
     controls = QHBoxLayout()
@@ -140,6 +187,24 @@ def init_player_controls(app):
     return layout
 
 
+def format_position_label(pos_ms, duration_ms):
+    """Format elapsed/total time as ``m:ss / m:ss``."""
+    def _fmt(ms):
+        total_seconds = max(0, int(ms or 0)) // 1000
+        return f"{total_seconds // 60}:{total_seconds % 60:02d}"
+
+    return f"{_fmt(pos_ms)} / {_fmt(duration_ms)}"
+
+
+def update_position_display(app, pos):
+    """Paint a (coalesced) playback position into the slider and label."""
+    if getattr(app, "_progress_bar_dragging", False):
+        return
+    app.progress_bar.setValue(pos)
+    if hasattr(app, "position_label"):
+        app.position_label.setText(format_position_label(pos, app.progress_bar.maximum()))
+
+
 def update_speed_display(app, value):
     app.current_speed = value / 100.0
     # Delegate to app-level implementation when available to keep
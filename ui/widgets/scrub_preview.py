@@ -0,0 +1,106 @@
+# ui/widgets/scrub_preview.py
+
+from PyQt5.QtWidgets import QLabel, QStyle, QStyleOptionSlider
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtCore import Qt, QObject, QEvent, QPoint
+
+from core.thumbnails import SpriteSheet, SpriteSheetError, ThumbnailService
+
+
+class ScrubPreview(QObject):
+    """Thumbnail popup shown while hovering or dragging the progress slider.
+
+    Frames come from a memory-mapped sprite sheet built in the background
+    by ``ThumbnailService``; nothing is decoded on the GUI thread.
+    """
+
+    def __init__(self, slider, service=None):
+        super().__init__(slider)
+        self.slider = slider
+        self.service = service or ThumbnailService(self)
+        self.service.ready.connect(self._on_sheet_ready)
+        self._media_path = None
+        self._sheet = None
+        self._shown_index = None
+
+        self.popup = QLabel(slider, Qt.ToolTip | Qt.FramelessWindowHint)
+        self.popup.setObjectName("scrubPreview")
+        self.popup.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.popup.hide()
+
+        slider.setMouseTracking(True)
+        slider.installEventFilter(self)
+        slider.sliderMoved.connect(self._on_slider_moved)
+        slider.sliderReleased.connect(self.popup.hide)
+
+    def set_media(self, media_path):
+        """Switch to a new media file and request its sprite sheet."""
+        self._close_sheet()
+        self._media_path = media_path
+        if media_path:
+            self.service.request(media_path)
+
+    def _on_sheet_ready(self, media_path, sheet_path):
+        if media_path != self._media_path:
+            return
+        self._close_sheet()
+        try:
+            self._sheet = SpriteSheet(sheet_path)
+        except (OSError, SpriteSheetError):
+            self._sheet = None
+
+    def _close_sheet(self):
+        if self._sheet is not None:
+            self._sheet.close()
+        self._sheet = None
+        self._shown_index = None
+        self.popup.hide()
+
+    def eventFilter(self, obj, event):
+        if obj is self.slider:
+            etype = event.type()
+            if etype == QEvent.MouseMove and not self.slider.isSliderDown():
+                self._show_at(self._position_for_x(event.pos().x()), event.pos().x())
+            elif etype in (QEvent.Leave, QEvent.Hide) and not self.slider.isSliderDown():
+                self.popup.hide()
+        return False
+
+    def _on_slider_moved(self, pos):
+        self._show_at(pos, self._x_for_position(pos))
+
+    def _groove_span(self):
+        opt = QStyleOptionSlider()
+        self.slider.initStyleOption(opt)
+        style = self.slider.style()
+        groove = style.subControlRect(QStyle.CC_Slider, opt, QStyle.SC_SliderGroove, self.slider)
+        handle = style.subControlRect(QStyle.CC_Slider, opt, QStyle.SC_SliderHandle, self.slider)
+        return groove.x(), groove.right() - handle.width() + 1, handle.width() // 2
+
+    def _position_for_x(self, x):
+        start, span_end, half_handle = self._groove_span()
+        return QStyle.sliderValueFromPosition(
+            self.slider.minimum(), self.slider.maximum(), x - start - half_handle, max(1, span_end - start),
+        )
+
+    def _x_for_position(self, pos):
+        start, span_end, half_handle = self._groove_span()
+        return start + half_handle + QStyle.sliderPositionFromValue(
+            self.slider.minimum(), self.slider.maximum(), pos, max(1, span_end - start),
+        )
+
+    def _show_at(self, pos_ms, x):
+        sheet = self._sheet
+        if sheet is None or sheet.count == 0:
+            return
+        index = sheet.index_for_position(pos_ms)
+        if index != self._shown_index:
+            # QImage wraps the buffer without copying; keep it alive until
+            # the pixmap has been created.
+            data = sheet.frame_bytes(index)
+            image = QImage(data, sheet.width, sheet.height, sheet.width * 3, QImage.Format_RGB888)
+            self.popup.setPixmap(QPixmap.fromImage(image))
+            self.popup.adjustSize()
+            self._shown_index = index
+        anchor = self.slider.mapToGlobal(QPoint(int(x), 0))
+        self.popup.move(anchor.x() - self.popup.width() // 2, anchor.y() - self.popup.height() - 6)
+        self.popup.show()
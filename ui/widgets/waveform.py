@@ -0,0 +1,139 @@
+# ui/widgets/waveform.py
+
+from PyQt5.QtWidgets import QWidget, QSizePolicy
+from PyQt5.QtGui import QPainter, QColor, QPen
+from PyQt5.QtCore import Qt, QLineF
+
+# ``core.peaks`` (numpy, a process pool) is imported when the first lesson
+# is shown, not with the widget.
+
+
+class WaveformView(QWidget):
+    """Waveform overview with playhead and A–B markers.
+
+    Shows the whole lesson, or zooms into the A–B region while a loop is
+    active. Peaks come from the memory-mapped pyramid built by
+    ``PeakService``, which is created on the first ``set_media``.
+    """
+
+    LOOP_MARGIN_RATIO = 0.1
+
+    def __init__(self, parent=None, service=None):
+        super().__init__(parent)
+        self.setObjectName("waveformView")
+        self.setMinimumHeight(48)
+        self.setMaximumHeight(72)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.service = None
+        if service is not None:
+            self._attach_service(service)
+        self.seek_callback = None
+        self._media_path = None
+        self._peaks = None
+        self._duration_ms = 0
+        self._position_ms = 0
+        self._loop = None
+        self._view = (0, 0)
+
+    def _attach_service(self, service):
+        self.service = service
+        service.ready.connect(self._on_peaks_ready)
+
+    # Data sources
+    def set_media(self, media_path):
+        self._close_peaks()
+        self._media_path = media_path
+        self._position_ms = 0
+        if media_path:
+            if self.service is None:
+                from core.peaks import PeakService
+
+                self._attach_service(PeakService(self))
+            self.service.request(media_path)
+        self.update()
+
+    def _on_peaks_ready(self, media_path, peaks_path):
+        if media_path != self._media_path:
+            return
+        from core.peaks import PeakFile, PeakFileError
+
+        self._close_peaks()
+        try:
+            self._peaks = PeakFile(peaks_path)
+        except (OSError, PeakFileError):
+            self._peaks = None
+        self.update()
+
+    def _close_peaks(self):
+        if self._peaks is not None:
+            self._peaks.close()
+        self._peaks = None
+
+    def set_duration(self, duration_ms):
+        self._duration_ms = max(0, int(duration_ms))
+        self._update_view()
+
+    def set_position(self, pos_ms):
+        self._position_ms = int(pos_ms)
+        self.update()
+
+    def set_loop_region(self, start_ms, end_ms):
+        """Zoom into ``[start_ms, end_ms]``; pass ``None`` to show everything."""
+        if start_ms is None or end_ms is None or end_ms <= start_ms:
+            self._loop = None
+        else:
+            self._loop = (int(start_ms), int(end_ms))
+        self._update_view()
+
+    def _update_view(self):
+        if self._loop is not None:
+            start, end = self._loop
+            margin = (end - start) * self.LOOP_MARGIN_RATIO
+            self._view = (max(0, start - margin), min(self._duration_ms or end, end + margin))
+        else:
+            self._view = (0, self._duration_ms)
+        self.update()
+
+    # Mapping and interaction
+    def _x_for_ms(self, ms):
+        start, end = self._view
+        if end <= start:
+            return 0
+        return (ms - start) / (end - start) * self.width()
+
+    def mousePressEvent(self, event):
+        start, end = self._view
+        if event.button() == Qt.LeftButton and end > start and self.seek_callback:
+            pos = start + (end - start) * event.pos().x() / max(1, self.width())
+            self.seek_callback(int(pos))
+        super().mousePressEvent(event)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.palette().base())
+        start, end = self._view
+        height = self.height()
+        mid = height / 2.0
+
+        if self._peaks is not None and end > start:
+            cols = self._peaks.columns(start, end, self.width())
+            if len(cols):
+                scale = (height / 2.0 - 1) / 32768.0
+                step = self.width() / float(len(cols))
+                lines = [
+                    QLineF(i * step, mid - int(hi) * scale, i * step, mid - int(lo) * scale)
+                    for i, (lo, hi) in enumerate(cols.tolist())
+                ]
+                painter.setPen(QPen(self.palette().highlight().color(), max(1.0, step)))
+                painter.drawLines(lines)
+
+        if self._loop is not None:
+            painter.setPen(QPen(QColor("#FFC04D"), 1))
+            for marker in self._loop:
+                x = self._x_for_ms(marker)
+                painter.drawLine(QLineF(x, 0, x, height))
+
+        if end > start:
+            painter.setPen(QPen(self.palette().text().color(), 1))
+            x = self._x_for_ms(self._position_ms)
+            painter.drawLine(QLineF(x, 0, x, height))